@@ -0,0 +1,110 @@
+"""
+Microbenchmark: per-client audio buffering, np.concatenate vs. AudioRingBuffer.
+
+Simulates N clients whose buffers are already at steady state (full `max_buffer_s`), then pushes
+frames of `frame_ms` into each one and reads the transcription window after every
+`read_every` frames, the way ServeClientBase.add_frames/get_audio_chunk_for_processing do.
+
+Usage:
+    python benchmarks/bench_audio_buffer.py --clients 10 50 100 --max_buffer_s 45
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from whisper_live.audio_buffer import AudioRingBuffer  # noqa: E402
+
+RATE = 16000
+
+
+class ConcatBuffer:
+    """The previous ServeClientBase buffering: grow with np.concatenate, drop a block when full."""
+
+    def __init__(self, max_buffer_s, discard_buffer_s):
+        self.max_buffer_s = max_buffer_s
+        self.discard_buffer_s = discard_buffer_s
+        self.frames_np = None
+        self.frames_offset = 0.0
+        self.timestamp_offset = 0.0
+
+    def add_frames(self, frame_np):
+        if self.frames_np is not None and self.frames_np.shape[0] > self.max_buffer_s * RATE:
+            self.frames_offset += self.discard_buffer_s
+            self.frames_np = self.frames_np[int(self.discard_buffer_s * RATE):]
+            if self.timestamp_offset < self.frames_offset:
+                self.timestamp_offset = self.frames_offset
+        if self.frames_np is None:
+            self.frames_np = frame_np.copy()
+        else:
+            self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
+
+    def get_chunk(self, window_s):
+        self.timestamp_offset = max(self.frames_offset, self.frames_offset + self.frames_np.shape[0] / RATE - window_s)
+        samples_take = max(0, (self.timestamp_offset - self.frames_offset) * RATE)
+        return self.frames_np[int(samples_take):].copy()
+
+
+class RingBuffer:
+    def __init__(self, max_buffer_s):
+        self.buffer = AudioRingBuffer(int(max_buffer_s * RATE))
+
+    def add_frames(self, frame_np):
+        self.buffer.append(frame_np)
+
+    def get_chunk(self, window_s):
+        return self.buffer.view(self.buffer.end_index - int(window_s * RATE))
+
+
+def run(buffers, frames, read_every, window_s):
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        for buf in buffers:
+            buf.add_frames(frame)
+            if i % read_every == 0:
+                buf.get_chunk(window_s)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--max_buffer_s", type=float, default=45)
+    parser.add_argument("--discard_buffer_s", type=float, default=30)
+    parser.add_argument("--frame_ms", type=float, default=100)
+    parser.add_argument("--audio_s", type=float, default=10, help="Seconds of audio pushed per client.")
+    parser.add_argument("--read_every", type=int, default=5, help="Read the transcription window every N frames.")
+    parser.add_argument("--window_s", type=float, default=10)
+    args = parser.parse_args()
+
+    frame_len = int(RATE * args.frame_ms / 1000)
+    n_frames = int(args.audio_s * 1000 / args.frame_ms)
+    rng = np.random.default_rng(0)
+    frames = [rng.standard_normal(frame_len).astype(np.float32) for _ in range(n_frames)]
+    prefill = rng.standard_normal(int((args.max_buffer_s - 1) * RATE)).astype(np.float32)
+
+    print(f"{'clients':>8} {'concat (s)':>12} {'ring (s)':>10} {'speedup':>8} {'concat %rt':>11} {'ring %rt':>9}")
+    for n_clients in args.clients:
+        results = {}
+        for name, factory in (
+            ("concat", lambda: ConcatBuffer(args.max_buffer_s, args.discard_buffer_s)),
+            ("ring", lambda: RingBuffer(args.max_buffer_s)),
+        ):
+            buffers = [factory() for _ in range(n_clients)]
+            for buf in buffers:
+                buf.add_frames(prefill)
+            results[name] = run(buffers, frames, args.read_every, args.window_s)
+
+        # share of one core needed to keep up with real time for all clients
+        concat_rt = 100 * results["concat"] / args.audio_s
+        ring_rt = 100 * results["ring"] / args.audio_s
+        print(f"{n_clients:>8} {results['concat']:>12.3f} {results['ring']:>10.3f} "
+              f"{results['concat'] / results['ring']:>7.1f}x {concat_rt:>10.1f}% {ring_rt:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Microbenchmark: TensorRT backend log-mel features, padded 30 second STFT vs. LogMelFrontend.
+
+Computes the features of `--batch` windows of each `--window_s` length on the CPU, the way
+ServeClientTensorRT does before every decode: with the previous implementation (pad every window
+to 30 seconds, a fresh Hann window per call, one STFT per window), with LogMelFrontend one window
+per call, and with LogMelFrontend in one stacked call for the whole batch.
+
+The mel filterbank is faster_whisper's, which equals the one shipped with the TensorRT engines.
+
+Usage:
+    python benchmarks/bench_mel_frontend.py --window_s 1 2 5 10 30 --batch 1 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from faster_whisper.feature_extractor import FeatureExtractor  # noqa: E402
+
+from whisper_live.tensorrt_utils import HOP_LENGTH, N_FFT, N_SAMPLES, LogMelFrontend, pad_or_trim  # noqa: E402
+
+RATE = 16000
+
+
+def padded_log_mel(audio, filters):
+    """The previous WhisperTRTLLM.log_mel_spectrogram."""
+    audio = torch.from_numpy(pad_or_trim(audio, N_SAMPLES).astype(np.float32))
+    window = torch.hann_window(N_FFT).to(audio.device)
+    stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=window, return_complex=True)
+    magnitudes = stft[..., :-1].abs() ** 2
+    log_spec = torch.clamp(filters @ magnitudes, min=1e-10).log10()
+    log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--window_s", type=float, nargs="+", default=[1, 2, 5, 10, 30])
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads.")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    filters = torch.from_numpy(FeatureExtractor().mel_filters.astype(np.float32))
+    frontend = LogMelFrontend(filters.shape[0], filters=filters)
+    rng = np.random.default_rng(0)
+
+    print(f"{'window':>7} {'batch':>6} {'padded (ms)':>12} {'frontend (ms)':>14} {'stacked (ms)':>13} "
+          f"{'speedup':>8} {'max diff':>9}")
+    for window_s in args.window_s:
+        for batch in args.batch:
+            audios = [(0.1 * rng.standard_normal(int(window_s * RATE))).astype(np.float32) for _ in range(batch)]
+            padded = timed(lambda: [padded_log_mel(a, filters) for a in audios], args.repeat)
+            single = timed(lambda: [frontend([a]) for a in audios], args.repeat)
+            stacked = timed(lambda: frontend(audios), args.repeat)
+            features, _ = frontend(audios)
+            diff = max((f - padded_log_mel(a, filters)).abs().max().item() for f, a in zip(features, audios))
+            print(f"{window_s:>6.1f}s {batch:>6} {padded * 1000:>12.2f} {single * 1000:>14.2f} "
+                  f"{stacked * 1000:>13.2f} {padded / min(single, stacked):>7.1f}x {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""
+Load and latency benchmark: replays audio files through N concurrent bot connections.
+
+Starts a TranscriptionServer in this process, with an in-memory stand-in for Redis so the
+transcription stream publisher and session checkpoints run as in production, then connects one
+simulated bot per stream. Each bot sends the handshake a Vexa bot sends and streams its file as
+float32 frames of 4096 samples, like TranscriptionClient, at real-time pace or `--speed` times
+faster (0 sends as fast as possible).
+
+Reported per stream:
+
+* first token: time from the first audio frame to the first non-empty text;
+* partial to final: time from the first partial of a segment to its completed version;
+* final lag: time from sending the last sample of a segment to receiving it completed;
+* RTF: seconds the server spent transcribing the stream per second of audio;
+* WER against `<name>.txt` next to the audio file (or in `--references`), if present.
+
+CPU (in cores) and peak RSS are measured for the whole process, which is mostly the server.
+Thresholds (`--max_wer`, `--max_first_token_s`, `--max_rtf`) make the run exit with status 1,
+so it can gate CI.
+
+Usage:
+    python benchmarks/bench_replay.py --audio assets --clients 1 4 8 --model tiny.en --speed 2
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import resource
+import socket
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+import websocket
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from whisper_live.server import TranscriptionCollectorClient, TranscriptionServer  # noqa: E402
+from whisper_live.transcriber import decode_audio  # noqa: E402
+
+RATE = 16000
+CHUNK = 4096                    # samples per frame, as TranscriptionClient
+END_OF_AUDIO = b"END_OF_AUDIO"
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg")
+
+
+class LocalRedis:
+    """In-memory stand-in for the Redis commands the server uses."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.streams = {}
+        self.values = {}
+
+    def ping(self):
+        return True
+
+    def xadd(self, stream_key, fields, maxlen=None, approximate=True):
+        with self.lock:
+            stream = self.streams.setdefault(stream_key, [])
+            stream.append(fields)
+            return f"{len(stream)}-0"
+
+    def get(self, key):
+        with self.lock:
+            return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            self.values[key] = value
+        return True
+
+    def delete(self, key):
+        with self.lock:
+            return int(self.values.pop(key, None) is not None)
+
+    def pipeline(self, transaction=True):
+        return LocalPipeline(self)
+
+    def close(self):
+        pass
+
+
+class LocalPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.commands.append((command, args, kwargs))
+
+    def execute(self, raise_on_error=True):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+class LocalCollectorClient(TranscriptionCollectorClient):
+    """TranscriptionCollectorClient connected to a LocalRedis instead of a Redis server."""
+
+    def __init__(self):
+        self.local_redis = LocalRedis()
+        super().__init__(redis_stream_url="redis://local-stand-in")
+
+    def _connection_worker(self):
+        with self.connection_lock:
+            self.redis_client = self.local_redis
+            self.is_connected = True
+        while not self.stop_requested:
+            time.sleep(0.1)
+
+
+class ResourceMonitor:
+    """Samples the CPU time and resident memory of this process."""
+
+    def __init__(self, interval_s=0.5):
+        self.interval_s = interval_s
+        self.peak_rss_mb = 0.0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    @staticmethod
+    def cpu_s():
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+
+    @staticmethod
+    def rss_mb():
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+        except OSError:
+            # peak instead of current RSS, in KB on Linux and bytes on macOS
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss / 2 ** 20 if sys.platform == "darwin" else maxrss / 2 ** 10
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.cpu_started = self.cpu_s()
+        self.thread.start()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval_s):
+            self.peak_rss_mb = max(self.peak_rss_mb, self.rss_mb())
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.peak_rss_mb = max(self.peak_rss_mb, self.rss_mb())
+        return {
+            "cpu_cores": round((self.cpu_s() - self.cpu_started) / (time.perf_counter() - self.started), 3),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+
+
+class Stream:
+    """One simulated bot connection replaying an audio file."""
+
+    def __init__(self, index, path, audio, args, port):
+        self.index = index
+        self.path = path
+        self.audio = audio
+        self.args = args
+        self.port = port
+        self.uid = f"bench-{index}-{uuid.uuid4().hex[:8]}"
+        self.ready = threading.Event()
+        self.error = None
+        self.segments = {}              # id -> latest segment
+        self.partial_seen_at = {}       # id -> time its first non-empty partial arrived
+        self.partial_to_final_s = []
+        self.final_lag_s = []
+        self.first_token_s = None
+        self.started_at = None
+        self.last_message_at = time.perf_counter()
+
+    def sent_at(self, audio_time):
+        # when the sample at `audio_time` was sent
+        return self.started_at + audio_time / self.args.speed if self.args.speed > 0 else None
+
+    def on_message(self, message):
+        now = time.perf_counter()
+        self.last_message_at = now
+        if message.get("message") == "SERVER_READY":
+            self.ready.set()
+        elif message.get("status") in ("ERROR", "WAIT", "REDIRECT"):
+            self.error = f"{message['status']}: {message.get('message')}"
+            self.ready.set()
+        for segment in message.get("segments", []):
+            segment_id = segment["id"]
+            if segment.get("text", "").strip() and self.first_token_s is None and self.started_at is not None:
+                self.first_token_s = now - self.started_at
+            previous = self.segments.get(segment_id)
+            self.segments[segment_id] = segment
+            if not segment.get("completed"):
+                if segment.get("text", "").strip():
+                    self.partial_seen_at.setdefault(segment_id, now)
+                continue
+            if previous is not None and previous.get("completed"):
+                continue
+            if segment_id in self.partial_seen_at:
+                self.partial_to_final_s.append(now - self.partial_seen_at[segment_id])
+            sent_at = self.sent_at(float(segment["end"]))
+            if sent_at is not None:
+                self.final_lag_s.append(max(0.0, now - sent_at))
+
+    def receive(self, ws):
+        while True:
+            try:
+                data = ws.recv()
+            except Exception:
+                return
+            if not data:
+                return
+            try:
+                self.on_message(json.loads(data))
+            except (ValueError, KeyError):
+                continue
+
+    def run(self, server):
+        try:
+            ws = websocket.create_connection(f"ws://127.0.0.1:{self.port}", timeout=self.args.connect_timeout_s)
+        except Exception as e:
+            self.error = f"connection failed: {e}"
+            return
+        ws.settimeout(None)
+        receiver = threading.Thread(target=self.receive, args=(ws,), daemon=True)
+        receiver.start()
+        ws.send(json.dumps({
+            "uid": self.uid,
+            "language": self.args.language,
+            "task": "transcribe",
+            "model": self.args.model,
+            "use_vad": False,
+            "platform": "benchmark",
+            "meeting_url": f"bench://{self.index}",
+            "token": "benchmark-token",
+            "meeting_id": f"bench-{self.index}",
+            "delta_updates": True,
+        }))
+        if not self.ready.wait(self.args.connect_timeout_s) and self.error is None:
+            self.error = "no SERVER_READY"
+        if self.error is not None:
+            ws.close()
+            return
+
+        self.started_at = time.perf_counter()
+        for offset in range(0, len(self.audio), CHUNK):
+            if self.args.speed > 0:
+                delay = self.started_at + offset / RATE / self.args.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            ws.send_binary(self.audio[offset:offset + CHUNK].tobytes())
+
+        # let the server finish the tail, then end the session like a bot leaving the meeting
+        deadline = time.perf_counter() + self.args.drain_s
+        while time.perf_counter() < deadline and time.perf_counter() - self.last_message_at < self.args.idle_s:
+            time.sleep(0.1)
+        self.server_stats = self.find_server_stats(server)
+        try:
+            ws.send(END_OF_AUDIO, websocket.ABNF.OPCODE_BINARY)
+            ws.close()
+        except Exception:
+            pass
+        receiver.join(5)
+
+    def find_server_stats(self, server):
+        clients = list(server.client_manager.clients.values()) if server.client_manager else []
+        for client in clients:
+            if client.client_uid == self.uid:
+                return client.get_activity_stats()
+        return None
+
+    def transcript(self):
+        return " ".join(self.segments[i]["text"].strip() for i in sorted(self.segments)
+                        if self.segments[i].get("text", "").strip())
+
+    def result(self, wer):
+        audio_s = len(self.audio) / RATE
+        stats = getattr(self, "server_stats", None)
+        return {
+            "uid": self.uid,
+            "file": os.path.basename(self.path),
+            "audio_s": round(audio_s, 2),
+            "error": self.error,
+            "first_token_s": round(self.first_token_s, 3) if self.first_token_s is not None else None,
+            "partial_to_final_s": summarize(self.partial_to_final_s),
+            "final_lag_s": summarize(self.final_lag_s),
+            "rtf": round(stats["busy_s"] / audio_s, 4) if stats else None,
+            "passes": stats["passes"] if stats else None,
+            "wer": round(wer, 4) if wer is not None else None,
+            "transcript": self.transcript(),
+        }
+
+
+def summarize(values):
+    if not values:
+        return None
+    return {"mean": round(float(np.mean(values)), 3), "p95": round(float(np.percentile(values, 95)), 3)}
+
+
+def make_normalizer():
+    try:
+        from whisper.normalizers import EnglishTextNormalizer
+        return EnglishTextNormalizer()
+    except ImportError:
+        return lambda text: re.sub(r"[^\w\s']", " ", text.lower())
+
+
+def word_error_rate(reference, hypothesis, normalizer):
+    try:
+        import jiwer
+    except ImportError:
+        return None
+    reference, hypothesis = normalizer(reference), normalizer(hypothesis)
+    if not reference.strip():
+        return None
+    return jiwer.wer(reference, hypothesis)
+
+
+def find_audio(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(f for f in glob.glob(os.path.join(path, "*")) if f.lower().endswith(AUDIO_EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+
+def find_reference(path, references_dir):
+    name = os.path.splitext(os.path.basename(path))[0] + ".txt"
+    for candidate in (os.path.join(references_dir, name) if references_dir else None,
+                      os.path.join(os.path.dirname(path), name)):
+        if candidate and os.path.exists(candidate):
+            with open(candidate) as f:
+                return f.read()
+    return None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, port):
+    server_options = {"min_audio_s": 1.0}
+    for option in args.server_option:
+        key, _, value = option.partition("=")
+        try:
+            server_options[key] = json.loads(value)
+        except ValueError:
+            server_options[key] = value
+
+    server = TranscriptionServer()
+    server.collector_client = LocalCollectorClient()
+    thread = threading.Thread(target=server.run, daemon=True, args=("127.0.0.1",), kwargs=dict(
+        port=port,
+        backend=args.backend,
+        faster_whisper_custom_model_path=args.model_path,
+        whisper_tensorrt_path=args.trt_model_path,
+        single_model=not args.no_single_model,
+        server_options=server_options,
+    ))
+    thread.start()
+    deadline = time.perf_counter() + args.startup_timeout_s
+    while not server.is_healthy:
+        if time.perf_counter() > deadline or not thread.is_alive():
+            raise RuntimeError("server did not start")
+        time.sleep(0.1)
+    return server
+
+
+def run_round(server, port, n_clients, files, audio, args, normalizer):
+    streams = [Stream(i, files[i % len(files)], audio[files[i % len(files)]], args, port) for i in range(n_clients)]
+    monitor = ResourceMonitor()
+    monitor.start()
+    threads = [threading.Thread(target=stream.run, args=(server,)) for stream in streams]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    usage = monitor.stop()
+
+    results = []
+    for stream in streams:
+        reference = find_reference(stream.path, args.references)
+        wer = word_error_rate(reference, stream.transcript(), normalizer) if reference else None
+        results.append(stream.result(wer))
+    return {"clients": n_clients, "speed": args.speed, **usage, "streams": results}
+
+
+def print_round(report):
+    print(f"\n{report['clients']} clients at {report['speed']}x: "
+          f"{report['cpu_cores']} cores, peak RSS {report['peak_rss_mb']} MB")
+    print(f"{'stream':<28} {'audio s':>8} {'first s':>8} {'p2f mean':>9} {'lag p95':>8} {'rtf':>7} {'wer':>7}")
+    for r in report["streams"]:
+        cells = [r["audio_s"], r["first_token_s"], (r["partial_to_final_s"] or {}).get("mean"),
+                 (r["final_lag_s"] or {}).get("p95"), r["rtf"], r["wer"]]
+        text = " ".join(f"{'-' if c is None else c:>{w}}" for c, w in zip(cells, (8, 8, 9, 8, 7, 7)))
+        print(f"{r['file'][:28]:<28} {text}" + (f"  {r['error']}" if r["error"] else ""))
+
+
+def check_thresholds(reports, args):
+    failures = []
+    for report in reports:
+        for r in report["streams"]:
+            label = f"{report['clients']} clients, {r['uid']}"
+            if r["error"]:
+                failures.append(f"{label}: {r['error']}")
+            if args.max_wer is not None and r["wer"] is not None and r["wer"] > args.max_wer:
+                failures.append(f"{label}: WER {r['wer']} > {args.max_wer}")
+            if args.max_first_token_s is not None and (r["first_token_s"] or float("inf")) > args.max_first_token_s:
+                failures.append(f"{label}: first token {r['first_token_s']}s > {args.max_first_token_s}s")
+            if args.max_rtf is not None and r["rtf"] is not None and r["rtf"] > args.max_rtf:
+                failures.append(f"{label}: RTF {r['rtf']} > {args.max_rtf}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--audio", type=str, nargs="+", default=["assets"],
+                        help="Audio files or directories of audio files to replay.")
+    parser.add_argument("--references", type=str, default=None,
+                        help="Directory of <name>.txt reference transcripts, defaults to next to the audio.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay pace, 1 is real time, 0 as fast as possible.")
+    parser.add_argument("--backend", type=str, default="faster_whisper", choices=["faster_whisper", "tensorrt"])
+    parser.add_argument("--model", type=str, default="tiny.en", help="Model the bots ask for.")
+    parser.add_argument("--model_path", type=str, default=None, help="Custom faster_whisper model served to all bots.")
+    parser.add_argument("--trt_model_path", type=str, default=None)
+    parser.add_argument("--no_single_model", action="store_true")
+    parser.add_argument("--language", type=str, default="en")
+    parser.add_argument("--server_option", type=str, action="append", default=[],
+                        help="Server option as key=value, the value parsed as JSON if possible, e.g. batch_inference=true.")
+    parser.add_argument("--idle_s", type=float, default=3.0,
+                        help="Ends a stream once the server sent nothing for this long after the audio.")
+    parser.add_argument("--drain_s", type=float, default=30.0, help="Maximum wait for the server after the audio.")
+    parser.add_argument("--connect_timeout_s", type=float, default=300.0)
+    parser.add_argument("--startup_timeout_s", type=float, default=600.0)
+    parser.add_argument("--log_level", type=str, default="WARNING", help="Log level of the server, INFO logs every message.")
+    parser.add_argument("--output", type=str, default=None, help="Writes the report as JSON.")
+    parser.add_argument("--max_wer", type=float, default=None)
+    parser.add_argument("--max_first_token_s", type=float, default=None)
+    parser.add_argument("--max_rtf", type=float, default=None)
+    args = parser.parse_args()
+    for name in ("", "transcription"):
+        logging.getLogger(name).setLevel(args.log_level)
+
+    files = find_audio(args.audio)
+    if not files:
+        parser.error(f"no audio files in {args.audio}")
+    audio = {path: decode_audio(path, sampling_rate=RATE).astype(np.float32) for path in files}
+
+    port = free_port()
+    server = start_server(args, port)
+    normalizer = make_normalizer()
+    reports = []
+    for n_clients in args.clients:
+        report = run_round(server, port, n_clients, files, audio, args, normalizer)
+        print_round(report)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    failures = check_thresholds(reports, args)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Microbenchmark: streaming Silero VAD, one inference per client vs. BatchedVADService.
+
+Simulates N clients that each receive `frame_ms` of audio at a time and classify it, the way
+ServeClientBase.skip_silence does before every transcription pass. The per-client mode runs one
+single-chunk ONNX inference per client and chunk; the batched mode submits every client's chunks
+to a shared BatchedVADService from one thread per client.
+
+Usage:
+    python benchmarks/bench_vad.py --clients 1 10 50 100 --audio_s 10
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from whisper_live.vad import BatchedVADService, StreamingVoiceActivityDetector  # noqa: E402
+
+RATE = 16000
+
+
+def run_separate(streams, frame_len):
+    detectors = [StreamingVoiceActivityDetector() for _ in streams]
+    start = time.perf_counter()
+    for end in range(frame_len, len(streams[0]) + 1, frame_len):
+        for vad, audio in zip(detectors, streams):
+            vad.accept(audio[vad.position:end], vad.position)
+    return time.perf_counter() - start, len(streams) * (len(streams[0]) // 512)
+
+
+def run_batched(streams, frame_len, max_wait_s):
+    service = BatchedVADService(max_batch_size=len(streams), max_wait_s=max_wait_s)
+    detectors = [StreamingVoiceActivityDetector(service=service) for _ in streams]
+    barrier = threading.Barrier(len(streams))
+
+    def feed(vad, audio):
+        for end in range(frame_len, len(audio) + 1, frame_len):
+            # clients receive their frames at about the same time
+            barrier.wait()
+            vad.accept(audio[vad.position:end], vad.position)
+
+    threads = [threading.Thread(target=feed, args=(vad, audio)) for vad, audio in zip(detectors, streams)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    service.stop()
+    return elapsed, service.inferences_run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--frame_ms", type=float, default=256, help="Audio received per client between passes.")
+    parser.add_argument("--audio_s", type=float, default=10, help="Seconds of audio classified per client.")
+    parser.add_argument("--max_wait_ms", type=float, default=5)
+    args = parser.parse_args()
+
+    frame_len = int(RATE * args.frame_ms / 1000)
+    rng = np.random.default_rng(0)
+    StreamingVoiceActivityDetector.shared_model()
+
+    print(f"{'clients':>8} {'separate (s)':>13} {'batched (s)':>12} {'speedup':>8} "
+          f"{'runs':>6} {'batched runs':>13} {'separate %rt':>13} {'batched %rt':>12}")
+    for n_clients in args.clients:
+        streams = [(0.1 * rng.standard_normal(int(args.audio_s * RATE))).astype(np.float32)
+                   for _ in range(n_clients)]
+        separate, separate_runs = run_separate(streams, frame_len)
+        batched, batched_runs = run_batched(streams, frame_len, args.max_wait_ms / 1000)
+        # share of one core needed to keep up with real time for all clients
+        print(f"{n_clients:>8} {separate:>13.3f} {batched:>12.3f} {separate / batched:>7.1f}x "
+              f"{separate_runs:>6} {batched_runs:>13} {100 * separate / args.audio_s:>12.1f}% "
+              f"{100 * batched / args.audio_s:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,8 @@ if __name__ == "__main__":
     
     # Audio buffer settings
     parser.add_argument('--max_buffer_s', type=float, default=settings.MAX_BUFFER_S)
-    parser.add_argument('--discard_buffer_s', type=float, default=settings.DISCARD_BUFFER_S)
+    parser.add_argument('--discard_buffer_s', type=float, default=settings.DISCARD_BUFFER_S,
+                        help="Deprecated, ignored: the ring buffer drops old audio continuously.")
 
     # Forced audio clipping settings
     parser.add_argument('--clip_if_no_segment_s', type=float, default=settings.CLIP_IF_NO_SEGMENT_S)
@@ -47,11 +48,117 @@ if __name__ == "__main__":
     # VAD settings
     parser.add_argument('--vad_onset', type=float, default=settings.VAD_ONSET)
     parser.add_argument('--vad_no_speech_thresh', type=float, default=settings.VAD_NO_SPEECH_THRESH)
+    parser.add_argument('--vad_mode', type=str, default=settings.VAD_MODE, choices=["off", "streaming"],
+                        help="'streaming' skips transcription passes over windows without speech.")
+    parser.add_argument('--vad_hangover_s', type=float, default=settings.VAD_HANGOVER_S)
+    parser.add_argument('--vad_preroll_s', type=float, default=settings.VAD_PREROLL_S)
+    parser.add_argument('--no_vad_batching', action='store_true', default=not settings.VAD_BATCHING,
+                        help="Run the streaming VAD of every client separately instead of in shared batches.")
+    parser.add_argument('--vad_max_batch_size', type=int, default=settings.VAD_MAX_BATCH_SIZE)
+    parser.add_argument('--vad_max_wait_ms', type=float, default=settings.VAD_MAX_WAIT_MS)
 
     # Transcription output management
     parser.add_argument('--same_output_threshold', type=int, default=settings.SAME_OUTPUT_THRESHOLD)
     parser.add_argument('--show_prev_out_thresh_s', type=float, default=settings.SHOW_PREV_OUT_THRESH_S)
     parser.add_argument('--add_pause_thresh_s', type=float, default=settings.ADD_PAUSE_THRESH_S)
+    parser.add_argument('--finalize_after_s', type=float, default=settings.FINALIZE_AFTER_S,
+                        help="Complete the last partial once a client sent no audio for this many seconds, 0 to disable.")
+
+    # Streaming mode settings
+    parser.add_argument('--streaming_mode', type=str, default=settings.STREAMING_MODE,
+                        choices=["update_segments", "local_agreement"])
+    parser.add_argument('--local_agreement_n', type=int, default=settings.LOCAL_AGREEMENT_N)
+    parser.add_argument('--final_model', type=str, default=settings.FINAL_MODEL,
+                        help="faster_whisper model decoding every completed segment again, the client's model then only gives partials.")
+    parser.add_argument('--no_feature_cache', action='store_true', default=not settings.FEATURE_CACHE,
+                        help="Recompute the log-mel features of the whole window on every pass.")
+
+    # Language detection settings
+    parser.add_argument('--no_language_cache', action='store_true', default=not settings.LANGUAGE_CACHE,
+                        help="Detect the language of every session from scratch.")
+    parser.add_argument('--language_cache_min_prob', type=float, default=settings.LANGUAGE_CACHE_MIN_PROB)
+    parser.add_argument('--language_recheck_s', type=float, default=settings.LANGUAGE_RECHECK_S)
+
+    # Model pool settings
+    parser.add_argument('--model_pool_size', type=int, default=settings.MODEL_POOL_SIZE,
+                        help="Number of concurrent decodes on the shared faster_whisper model.")
+    parser.add_argument('--model_replicas', action='store_true', default=settings.MODEL_REPLICAS,
+                        help="Load model_pool_size independent model replicas instead of one model with that many workers.")
+    parser.add_argument('--cpu_threads', type=int, default=settings.CPU_THREADS,
+                        help="CPU threads per decode, 0 for the ctranslate2 default.")
+    parser.add_argument('--device_index', type=int, nargs='+', default=settings.DEVICE_INDEX,
+                        help="Device IDs to place the model(s) on.")
+
+    # Model registry settings
+    parser.add_argument('--model_memory_budget_mb', type=float, default=settings.MODEL_MEMORY_BUDGET_MB,
+                        help="Unload unused models, least recently used first, above this total size. 0 for no limit.")
+
+    # Startup warmup settings
+    parser.add_argument('--no_warmup', action='store_true', default=not settings.WARMUP,
+                        help="Load models on the first connection instead of at startup.")
+    parser.add_argument('--preload_models', type=str, nargs='*', default=settings.PRELOAD_MODELS,
+                        help="faster_whisper models to load and warm up at startup.")
+    parser.add_argument('--warmup_audio', type=str, default=settings.WARMUP_AUDIO)
+    parser.add_argument('--warmup_steps', type=int, default=settings.WARMUP_STEPS)
+
+    # CPU compute type settings
+    parser.add_argument('--cpu_compute_type', type=str, default=settings.CPU_COMPUTE_TYPE,
+                        help="faster_whisper compute type on CPU, 'auto' to benchmark the supported ones at startup.")
+    parser.add_argument('--compute_type_probe_audio', type=str, default=settings.COMPUTE_TYPE_PROBE_AUDIO)
+    parser.add_argument('--compute_type_probe_reference', type=str, default=settings.COMPUTE_TYPE_PROBE_REFERENCE)
+    parser.add_argument('--compute_type_wer_tolerance', type=float, default=settings.COMPUTE_TYPE_WER_TOLERANCE)
+    parser.add_argument('--compute_type_cache', type=str, default=settings.COMPUTE_TYPE_CACHE)
+
+    # Batched inference settings
+    parser.add_argument('--batch_inference', action='store_true', default=settings.BATCH_INFERENCE,
+                        help="Decode the audio of all clients in shared batches. Requires single model mode.")
+    parser.add_argument('--max_batch_size', type=int, default=settings.MAX_BATCH_SIZE)
+    parser.add_argument('--max_batch_wait_ms', type=float, default=settings.MAX_BATCH_WAIT_MS)
+
+    # Front-end settings
+    parser.add_argument('--async_mode', action='store_true', default=settings.ASYNC_MODE,
+                        help="Serve all connections from one asyncio event loop instead of two threads per connection.")
+    parser.add_argument('--inference_workers', type=int, default=settings.INFERENCE_WORKERS,
+                        help="Number of threads running transcription passes in async mode.")
+    parser.add_argument('--transcription_workers', type=int, default=settings.TRANSCRIPTION_WORKERS,
+                        help="Run the transcription passes of all connections on this many shared threads. "
+                             "0 starts one transcription thread per connection.")
+    parser.add_argument('--worker_backlog_weight', type=float, default=settings.WORKER_BACKLOG_WEIGHT,
+                        help="Seconds of waiting one second of untranscribed audio is worth when picking the next client.")
+
+    # Admission control settings
+    parser.add_argument('--admission_mode', type=str, default=settings.ADMISSION_MODE, choices=["static", "capacity"],
+                        help="Refuse clients above max_clients only, or also when the node would fall behind real time.")
+    parser.add_argument('--max_clients', type=int, default=settings.MAX_CLIENTS,
+                        help="Maximum number of connections, 0 to take it from the first client's handshake.")
+    parser.add_argument('--admission_max_load', type=float, default=settings.ADMISSION_MAX_LOAD)
+    parser.add_argument('--admission_max_backlog_s', type=float, default=settings.ADMISSION_MAX_BACKLOG_S)
+    parser.add_argument('--admission_window_s', type=float, default=settings.ADMISSION_WINDOW_S)
+    parser.add_argument('--redirect_url', type=str, default=settings.REDIRECT_URL,
+                        help="Endpoint refused clients are redirected to instead of being told to wait.")
+
+    # Session checkpoint settings
+    parser.add_argument('--no_session_checkpoint', action='store_true', default=not settings.SESSION_CHECKPOINT,
+                        help="Do not checkpoint sessions to Redis for reconnecting clients to resume.")
+    parser.add_argument('--checkpoint_interval_s', type=float, default=settings.CHECKPOINT_INTERVAL_S)
+    parser.add_argument('--checkpoint_ttl_s', type=float, default=settings.CHECKPOINT_TTL_S)
+    parser.add_argument('--checkpoint_max_audio_s', type=float, default=settings.CHECKPOINT_MAX_AUDIO_S)
+    parser.add_argument('--checkpoint_max_segments', type=int, default=settings.CHECKPOINT_MAX_SEGMENTS)
+
+    # Transcription log settings
+    parser.add_argument('--no_transcription_log', action='store_true', default=not settings.TRANSCRIPTION_LOG,
+                        help="Do not write the JSON lines transcription log.")
+    parser.add_argument('--transcription_log_dir', type=str, default=settings.TRANSCRIPTION_LOG_DIR)
+    parser.add_argument('--transcription_log_rotation', type=str, default=settings.TRANSCRIPTION_LOG_ROTATION,
+                        choices=["size", "time"])
+    parser.add_argument('--transcription_log_max_mb', type=float, default=settings.TRANSCRIPTION_LOG_MAX_MB)
+    parser.add_argument('--transcription_log_when', type=str, default=settings.TRANSCRIPTION_LOG_WHEN)
+    parser.add_argument('--transcription_log_backups', type=int, default=settings.TRANSCRIPTION_LOG_BACKUPS)
+    parser.add_argument('--transcription_log_partial_every', type=int, default=settings.TRANSCRIPTION_LOG_PARTIAL_EVERY,
+                        help="Log every n-th incomplete segment, 0 for none.")
+    parser.add_argument('--transcription_log_completed_only', action='store_true',
+                        default=settings.TRANSCRIPTION_LOG_COMPLETED_ONLY)
+    parser.add_argument('--transcription_log_queue_size', type=int, default=settings.TRANSCRIPTION_LOG_QUEUE_SIZE)
 
     args = parser.parse_args()
 
@@ -80,8 +187,63 @@ if __name__ == "__main__":
             "min_audio_s": args.min_audio_s,
             "vad_onset": args.vad_onset,
             "vad_no_speech_thresh": args.vad_no_speech_thresh,
+            "vad_mode": args.vad_mode,
+            "vad_hangover_s": args.vad_hangover_s,
+            "vad_preroll_s": args.vad_preroll_s,
+            "vad_batching": not args.no_vad_batching,
+            "vad_max_batch_size": args.vad_max_batch_size,
+            "vad_max_wait_ms": args.vad_max_wait_ms,
             "same_output_threshold": args.same_output_threshold,
             "show_prev_out_thresh_s": args.show_prev_out_thresh_s,
             "add_pause_thresh_s": args.add_pause_thresh_s,
+            "finalize_after_s": args.finalize_after_s,
+            "streaming_mode": args.streaming_mode,
+            "local_agreement_n": args.local_agreement_n,
+            "final_model": args.final_model,
+            "feature_cache": not args.no_feature_cache,
+            "language_cache": not args.no_language_cache,
+            "language_cache_min_prob": args.language_cache_min_prob,
+            "language_recheck_s": args.language_recheck_s,
+            "model_pool_size": args.model_pool_size,
+            "model_replicas": args.model_replicas,
+            "cpu_threads": args.cpu_threads,
+            "device_index": args.device_index,
+            "model_memory_budget_mb": args.model_memory_budget_mb,
+            "warmup": not args.no_warmup,
+            "preload_models": args.preload_models,
+            "warmup_audio": args.warmup_audio,
+            "warmup_steps": args.warmup_steps,
+            "cpu_compute_type": args.cpu_compute_type,
+            "compute_type_probe_audio": args.compute_type_probe_audio,
+            "compute_type_probe_reference": args.compute_type_probe_reference,
+            "compute_type_wer_tolerance": args.compute_type_wer_tolerance,
+            "compute_type_cache": args.compute_type_cache,
+            "batch_inference": args.batch_inference,
+            "max_batch_size": args.max_batch_size,
+            "max_batch_wait_ms": args.max_batch_wait_ms,
+            "async_mode": args.async_mode,
+            "inference_workers": args.inference_workers,
+            "transcription_workers": args.transcription_workers,
+            "worker_backlog_weight": args.worker_backlog_weight,
+            "admission_mode": args.admission_mode,
+            "max_clients": args.max_clients,
+            "admission_max_load": args.admission_max_load,
+            "admission_max_backlog_s": args.admission_max_backlog_s,
+            "admission_window_s": args.admission_window_s,
+            "redirect_url": args.redirect_url,
+            "session_checkpoint": not args.no_session_checkpoint,
+            "checkpoint_interval_s": args.checkpoint_interval_s,
+            "checkpoint_ttl_s": args.checkpoint_ttl_s,
+            "checkpoint_max_audio_s": args.checkpoint_max_audio_s,
+            "checkpoint_max_segments": args.checkpoint_max_segments,
+            "transcription_log": not args.no_transcription_log,
+            "transcription_log_dir": args.transcription_log_dir,
+            "transcription_log_rotation": args.transcription_log_rotation,
+            "transcription_log_max_mb": args.transcription_log_max_mb,
+            "transcription_log_when": args.transcription_log_when,
+            "transcription_log_backups": args.transcription_log_backups,
+            "transcription_log_partial_every": args.transcription_log_partial_every,
+            "transcription_log_completed_only": args.transcription_log_completed_only,
+            "transcription_log_queue_size": args.transcription_log_queue_size,
         }
     )
@@ -0,0 +1,104 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+from whisper_live.admission import AdmissionController
+from whisper_live.server import ClientManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def fake_client(received_s, processed_s):
+    return SimpleNamespace(RATE=16000, processed_end_index=int(processed_s * 16000),
+                           audio_buffer=SimpleNamespace(end_index=int(received_s * 16000)))
+
+
+class TestAdmissionController(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = AdmissionController(max_load=0.8, max_backlog_s=2.0, window_s=60, clock=self.clock)
+
+    def record_passes(self, n_clients, seconds, inference_per_audio_s):
+        # every client runs a pass on each second of new audio
+        for _ in range(seconds):
+            self.clock.now += 1
+            for _ in range(n_clients):
+                self.controller.record_pass(inference_per_audio_s, 1.0)
+
+    def test_admits_without_measurements(self):
+        self.assertTrue(self.controller.decide(0, 0.0).admit)
+        decision = self.controller.decide(3, 0.0)
+        self.assertTrue(decision.admit)
+        self.assertIsNone(decision.projected_load)
+
+    def test_projects_the_real_time_factor_to_one_more_client(self):
+        self.record_passes(3, 10, 0.15)
+        self.assertAlmostEqual(self.controller.real_time_factor(), 0.15)
+        # 4 clients x 0.15 = 0.6 of one slot
+        self.assertTrue(self.controller.decide(3, 0.0).admit)
+        # 6 clients x 0.15 = 0.9 of one slot
+        decision = self.controller.decide(5, 0.0)
+        self.assertFalse(decision.admit)
+        self.assertAlmostEqual(decision.projected_load, 0.9)
+        # the same load spread over two parallel slots fits
+        self.assertTrue(self.controller.decide(5, 0.0, slots=2).admit)
+        self.assertEqual(self.controller.stats()["refused"], 1)
+
+    def test_refuses_while_clients_are_behind(self):
+        decision = self.controller.decide(2, 5.0)
+        self.assertFalse(decision.admit)
+        self.assertAlmostEqual(decision.backlog_s, 2.5)
+
+    def test_measurements_expire_after_the_window(self):
+        self.record_passes(3, 10, 0.5)
+        self.assertFalse(self.controller.decide(3, 0.0).admit)
+        self.clock.now += 61
+        self.assertIsNone(self.controller.real_time_factor())
+        self.assertTrue(self.controller.decide(3, 0.0).admit)
+
+
+class TestClientManagerAdmission(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = AdmissionController(max_backlog_s=2.0, clock=self.clock)
+
+    def test_refused_client_is_told_to_wait(self):
+        manager = ClientManager(max_clients=1)
+        manager.add_client(FakeWebSocket(), fake_client(10, 10))
+        websocket = FakeWebSocket()
+        self.assertTrue(manager.is_server_full(websocket, {"uid": "new"}))
+        self.assertEqual(websocket.sent[0]["status"], "WAIT")
+
+    def test_refused_client_is_redirected(self):
+        manager = ClientManager(max_clients=float("inf"), admission=self.controller,
+                                redirect_url="ws://node-2:9090")
+        manager.add_client(FakeWebSocket(), fake_client(10, 7))
+        websocket = FakeWebSocket()
+        self.assertTrue(manager.is_server_full(websocket, {"uid": "new"}))
+        self.assertEqual(websocket.sent[0]["status"], "REDIRECT")
+        self.assertEqual(websocket.sent[0]["message"], "ws://node-2:9090")
+
+    def test_client_is_admitted_while_the_node_keeps_up(self):
+        manager = ClientManager(max_clients=float("inf"), admission=self.controller, inference_slots=lambda: 2)
+        manager.add_client(FakeWebSocket(), fake_client(10, 9))
+        websocket = FakeWebSocket()
+        self.assertFalse(manager.is_server_full(websocket, {"uid": "new"}))
+        self.assertEqual(websocket.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
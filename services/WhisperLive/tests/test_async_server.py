@@ -0,0 +1,251 @@
+import asyncio
+import json
+import socket
+import threading
+import unittest
+
+import numpy as np
+from websockets.asyncio.client import connect
+
+from whisper_live.async_server import AsyncTranscriptionFrontend, AsyncWebSocketAdapter
+from whisper_live.server import BackendType, ClientManager, ServeClientBase, TranscriptionServer
+
+
+class EchoClient(ServeClientBase):
+    """Reports the duration of every chunk instead of transcribing it."""
+
+    def process_next_chunk(self):
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        self.websocket.send(json.dumps({"uid": self.client_uid, "duration": round(duration, 3),
+                                        "thread": threading.current_thread().name}))
+        with self.lock:
+            self.timestamp_offset += duration
+
+
+class RecordingClient(EchoClient):
+    """Records its passes, idle calls and last checkpoint; a pass waits for `release`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def process_next_chunk(self):
+        self.release.wait(5)
+        super().process_next_chunk()
+        self.calls.append("pass")
+
+    def on_idle(self):
+        self.calls.append("idle")
+
+    def save_checkpoint(self, force=False):
+        if force:
+            self.calls.append("checkpoint")
+
+
+class EchoServer(TranscriptionServer):
+    def initialize_client(self, websocket, options, *args):
+        client = EchoClient(websocket, client_uid=options["uid"], platform=options["platform"],
+                            meeting_url=options["meeting_url"], token=options["token"],
+                            meeting_id=options["meeting_id"], server_options=self.server_options)
+        self.client_manager.add_client(websocket, client)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestAsyncTranscriptionFrontend(unittest.TestCase):
+    def setUp(self):
+        self.server = EchoServer()
+        self.server.backend = BackendType.FASTER_WHISPER
+        self.server.server_options = {"transcription_thread": False, "min_audio_s": 0.5}
+        self.frontend = AsyncTranscriptionFrontend(self.server, max_workers=2)
+
+    def handshake(self, uid):
+        return json.dumps({"uid": uid, "platform": "test", "meeting_url": "url",
+                           "token": "token", "meeting_id": "1", "max_clients": 10})
+
+    async def run_clients(self, port, n_clients):
+        async def client(i):
+            async with connect(f"ws://127.0.0.1:{port}") as ws:
+                await ws.send(self.handshake(f"client-{i}"))
+                ready = json.loads(await ws.recv())
+                self.assertEqual(ready["status"], "SERVER_READY")
+                await ws.send(np.zeros(8000, dtype=np.float32).tobytes())
+                result = json.loads(await asyncio.wait_for(ws.recv(), 5))
+                await ws.send(b"END_OF_AUDIO")
+                return result
+
+        return await asyncio.gather(*(client(i) for i in range(n_clients)))
+
+    def test_transcription_passes_run_on_inference_workers(self):
+        port = free_port()
+
+        async def main():
+            server_task = asyncio.create_task(self.frontend.serve("127.0.0.1", port))
+            while not self.server.is_healthy:
+                await asyncio.sleep(0.01)
+            try:
+                return await self.run_clients(port, 5)
+            finally:
+                server_task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await server_task
+
+        results = asyncio.run(main())
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertEqual(result["duration"], 0.5)
+            self.assertTrue(result["thread"].startswith("inference"))
+        self.assertEqual(self.server.client_manager.clients, {})
+
+
+class TestAsyncClientScheduling(unittest.TestCase):
+    def setUp(self):
+        self.server = EchoServer()
+        self.server.client_manager = ClientManager(max_clients=10)
+        self.frontend = AsyncTranscriptionFrontend(self.server, max_workers=2)
+
+    def tearDown(self):
+        self.frontend.executor.shutdown(wait=True)
+
+    def connect(self):
+        self.frontend.loop = asyncio.get_running_loop()
+        adapter = AsyncWebSocketAdapter(FakeAsyncWebSocket(), self.frontend.loop)
+        client = RecordingClient(adapter, client_uid="uid", platform="test", meeting_url="url",
+                                 token="token", meeting_id="1",
+                                 server_options={"transcription_thread": False, "min_audio_s": 0.5})
+        self.server.client_manager.add_client(adapter, client)
+        return adapter, client
+
+    def test_idle_client_gets_on_idle(self):
+        async def main():
+            adapter, client = self.connect()
+            self.frontend.tick()
+            self.assertEqual(self.frontend.busy, {})
+            self.frontend.last_active[client] -= client.WAKEUP_TIMEOUT_S
+            self.frontend.tick()
+            await self.frontend.busy[client]
+            client.add_frames(np.zeros(16000, dtype=np.float32))
+            self.frontend.tick()
+            await self.frontend.busy[client]
+            return client.calls
+
+        self.assertEqual(asyncio.run(main()), ["idle", "pass"])
+
+    def test_last_checkpoint_waits_for_the_running_pass(self):
+        async def main():
+            adapter, client = self.connect()
+            client.release.clear()
+            client.add_frames(np.zeros(16000, dtype=np.float32))
+            self.frontend.schedule(client)
+            self.server.cleanup(adapter)
+            finishing = asyncio.ensure_future(self.frontend.finish(client))
+            await asyncio.sleep(0.05)
+            self.assertEqual(client.calls, [])
+            client.release.set()
+            await asyncio.wait_for(finishing, 5)
+            return client.calls
+
+        self.assertEqual(asyncio.run(main()), ["pass", "checkpoint"])
+        self.assertEqual(self.frontend.busy, {})
+        self.assertEqual(self.frontend.last_active, {})
+
+
+class FakeAsyncWebSocket:
+    remote_address = ("127.0.0.1", 50000)
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestAsyncWebSocketAdapter(unittest.TestCase):
+    def drain(self, fill, max_queue=4):
+        """Queues messages with `fill` before the writer runs, as for a client that is not reading."""
+        websocket = FakeAsyncWebSocket()
+
+        async def main():
+            adapter = AsyncWebSocketAdapter(websocket, asyncio.get_running_loop(), max_queue=max_queue)
+            fill(adapter)
+            adapter.close()
+            await asyncio.sleep(0)
+            await asyncio.wait_for(adapter.writer(), 5)
+            return adapter
+
+        return asyncio.run(main()), websocket
+
+    def test_only_superseding_messages_are_coalesced(self):
+        def fill(adapter):
+            adapter.send("SERVER_READY")
+            adapter.send_superseding("window-1", "transcript")
+            adapter.send_superseding("window-2", "transcript")
+            adapter.send("language")
+            adapter.send_superseding("window-3", "transcript")
+
+        adapter, websocket = self.drain(fill)
+        self.assertEqual(websocket.sent, ["SERVER_READY", "language", "window-3"])
+        self.assertEqual(adapter.coalesced, 2)
+        self.assertTrue(websocket.closed)
+
+    def test_overflow_closes_the_connection_instead_of_dropping(self):
+        def fill(adapter):
+            for i in range(6):
+                adapter.send(f"control-{i}")
+
+        adapter, websocket = self.drain(fill)
+        self.assertEqual(websocket.sent, [])
+        self.assertTrue(websocket.closed)
+        self.assertTrue(adapter.closed)
+
+    def test_delta_updates_are_never_dropped(self):
+        def segment(start, text, completed=False):
+            return {"start": f"{start:.3f}", "end": f"{start + 1:.3f}", "text": text, "completed": completed}
+
+        def fill(adapter):
+            client = ServeClientBase(adapter, client_uid="uid", platform="test", meeting_url="url",
+                                     token="token", meeting_id="1", delta_updates=True,
+                                     server_options={"transcription_thread": False})
+            for text in ["he", "hello", "hello wor"]:
+                client.send_transcription_to_client(client.prepare_segments(segment(0, text)))
+            client.transcript.append(segment(0, "hello world", completed=True))
+            client.send_transcription_to_client(client.prepare_segments(segment(1, "how")))
+            for text in ["how are", "how are you"]:
+                client.send_transcription_to_client(client.prepare_segments(segment(1, text)))
+
+        adapter, websocket = self.drain(fill, max_queue=16)
+        messages = [json.loads(m) for m in websocket.sent]
+        self.assertEqual(messages[0]["status"], "SERVER_READY")
+        updates = [[(s["id"], s["revision"], s["text"]) for s in m["segments"]] for m in messages[1:]]
+        self.assertEqual(updates, [
+            [(0, 2, "hello wor")],
+            [(0, 3, "hello world"), (1, 0, "how")],
+            [(1, 2, "how are you")],
+        ])
+
+        def overflow(adapter):
+            client = ServeClientBase(adapter, client_uid="uid", platform="test", meeting_url="url",
+                                     token="token", meeting_id="1", delta_updates=True,
+                                     server_options={"transcription_thread": False})
+            for i in range(8):
+                client.transcript.append(segment(i, f"segment {i}", completed=True))
+                client.send_transcription_to_client(client.prepare_segments())
+
+        adapter, websocket = self.drain(overflow, max_queue=4)
+        # a completed segment is either delivered or the client is disconnected, never skipped
+        self.assertEqual(websocket.sent, [])
+        self.assertTrue(websocket.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from whisper_live.audio_buffer import AudioRingBuffer
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = AudioRingBuffer(capacity=10)
+
+    def test_append_and_view(self):
+        self.buffer.append(np.arange(4, dtype=np.float32))
+        self.assertEqual(self.buffer.start_index, 0)
+        self.assertEqual(self.buffer.end_index, 4)
+        np.testing.assert_array_equal(self.buffer.view(), np.arange(4))
+        np.testing.assert_array_equal(self.buffer.view(1, 3), [1, 2])
+
+    def test_wraparound_keeps_latest_samples(self):
+        for i in range(5):
+            self.buffer.append(np.arange(i * 4, i * 4 + 4, dtype=np.float32))
+        self.assertEqual(self.buffer.end_index, 20)
+        self.assertEqual(self.buffer.start_index, 10)
+        self.assertEqual(len(self.buffer), 10)
+        np.testing.assert_array_equal(self.buffer.view(), np.arange(10, 20))
+        np.testing.assert_array_equal(self.buffer.view(15), np.arange(15, 20))
+
+    def test_view_is_not_a_copy(self):
+        self.buffer.append(np.arange(8, dtype=np.float32))
+        self.buffer.append(np.arange(8, 16, dtype=np.float32))
+        window = self.buffer.view(8)
+        self.assertTrue(np.shares_memory(window, self.buffer._data))
+        np.testing.assert_array_equal(window, np.arange(8, 16))
+
+    def test_view_clamps_to_retained_audio(self):
+        self.buffer.append(np.arange(25, dtype=np.float32))
+        np.testing.assert_array_equal(self.buffer.view(0), np.arange(15, 25))
+        self.assertEqual(self.buffer.view(30).shape[0], 0)
+
+    def test_frame_longer_than_capacity(self):
+        self.buffer.append(np.arange(3, dtype=np.float32))
+        self.buffer.append(np.arange(100, 125, dtype=np.float32))
+        self.assertEqual(self.buffer.end_index, 28)
+        np.testing.assert_array_equal(self.buffer.view(), np.arange(115, 125))
+
+    def test_append_int16_with_scale(self):
+        pcm = np.array([0, 16384, -32768], dtype=np.int16)
+        self.buffer.append(pcm, scale=1.0 / 32768)
+        np.testing.assert_allclose(self.buffer.view(), [0.0, 0.5, -1.0])
+
+    def test_reset(self):
+        self.buffer.append(np.ones(6, dtype=np.float32))
+        self.buffer.reset(start_index=100)
+        self.assertEqual(self.buffer.end_index, 100)
+        self.assertEqual(self.buffer.view().shape[0], 0)
+        self.buffer.append(np.arange(3, dtype=np.float32))
+        np.testing.assert_array_equal(self.buffer.view(100), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
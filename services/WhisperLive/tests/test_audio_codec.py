@@ -0,0 +1,80 @@
+import json
+import unittest
+from unittest import mock
+
+import av
+import numpy as np
+
+from whisper_live.audio_codec import Int16Decoder, OpusDecoder, create_audio_decoder
+from whisper_live.server import ClientManager, ServeClientBase, TranscriptionServer
+
+
+def sine(n_samples, amplitude=0.3, rate=16000):
+    return (amplitude * np.sin(2 * np.pi * 440 * np.arange(n_samples) / rate)).astype(np.float32)
+
+
+def opus_packets(audio, rate=16000, frame_samples=320):
+    encoder = av.CodecContext.create("libopus" if "libopus" in av.codecs_available else "opus", "w")
+    encoder.sample_rate = rate
+    encoder.layout = "mono"
+    encoder.format = "s16"
+    encoder.open()
+    pcm = (audio * 32767).astype(np.int16)
+    packets = []
+    for i in range(0, len(pcm), frame_samples):
+        frame = av.AudioFrame.from_ndarray(pcm[None, i:i + frame_samples], format="s16", layout="mono")
+        frame.sample_rate = rate
+        packets += [bytes(p) for p in encoder.encode(frame)]
+    return packets
+
+
+class TestAudioDecoders(unittest.TestCase):
+    def test_float32_is_the_default(self):
+        audio = sine(1600)
+        np.testing.assert_array_equal(create_audio_decoder().decode(audio.tobytes()), audio)
+
+    def test_int16_is_decoded_without_conversion(self):
+        pcm = (sine(1600) * 32767).astype(np.int16)
+        decoded = Int16Decoder().decode(pcm.tobytes())
+        self.assertEqual(decoded.dtype, np.int16)
+        np.testing.assert_array_equal(decoded, pcm)
+
+    def test_opus_is_decoded_to_16khz_float(self):
+        audio = sine(16000)
+        decoder = OpusDecoder()
+        decoded = np.concatenate([decoder.decode(p) for p in opus_packets(audio)])
+        self.assertEqual(decoded.dtype, np.float32)
+        self.assertAlmostEqual(len(decoded), 16000, delta=320)
+        # lossy, but the tone survives: compare energies after the codec's start-up
+        self.assertAlmostEqual(np.sqrt(np.mean(decoded[4000:12000] ** 2)),
+                               np.sqrt(np.mean(audio[4000:12000] ** 2)), delta=0.03)
+
+    def test_unknown_encoding_is_rejected(self):
+        with self.assertRaises(ValueError):
+            create_audio_decoder("mp3")
+
+
+class TestAudioEncodingOption(unittest.TestCase):
+    def setUp(self):
+        self.server = TranscriptionServer()
+        self.server.client_manager = ClientManager()
+        self.websocket = mock.Mock()
+
+    def test_int16_frames_are_scaled_into_the_buffer(self):
+        client = ServeClientBase(self.websocket, client_uid="int16-client", audio_encoding="int16")
+        self.server.client_manager.add_client(self.websocket, client)
+        audio = sine(1600)
+        frame = self.server.parse_websocket_message(self.websocket, (audio * 32768).astype(np.int16).tobytes())
+        client.add_frames(frame)
+        np.testing.assert_allclose(client.audio_buffer.view(), audio, atol=1 / 32768)
+        self.server.client_manager.remove_client(self.websocket)
+
+    def test_handshake_with_unsupported_encoding_is_refused(self):
+        options = json.dumps({"uid": "c", "platform": "p", "meeting_url": "u", "token": "t",
+                              "meeting_id": "m", "audio_encoding": "mp3"})
+        self.assertFalse(self.server.setup_new_connection(self.websocket, options, None, None, False))
+        self.assertEqual(json.loads(self.websocket.send.call_args[0][0])["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import threading
+import time
+import unittest
+
+import torch
+
+from whisper_live.batching import BatchScheduler, TensorRTBatchScheduler
+
+
+class RecordingScheduler(BatchScheduler):
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        self.fail = False
+        super().__init__(*args, **kwargs)
+
+    def process_batch(self, payloads):
+        self.batches.append(list(payloads))
+        if self.fail:
+            raise ValueError("inference failed")
+        return [p * 10 for p in payloads]
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_full_batch_is_dispatched_without_waiting(self):
+        self.scheduler = RecordingScheduler(max_batch_size=3, max_wait_s=10)
+        start = time.monotonic()
+        futures = [self.scheduler.submit(i) for i in range(3)]
+        self.assertEqual([f.result(timeout=1) for f in futures], [0, 10, 20])
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.scheduler.batches, [[0, 1, 2]])
+
+    def test_partial_batch_is_dispatched_after_max_wait(self):
+        self.scheduler = RecordingScheduler(max_batch_size=8, max_wait_s=0.05)
+        futures = [self.scheduler.submit(i) for i in range(2)]
+        self.assertEqual([f.result(timeout=1) for f in futures], [0, 10])
+        self.assertEqual(self.scheduler.batches, [[0, 1]])
+
+    def test_run_reports_the_wait_until_the_batch_starts(self):
+        self.scheduler = RecordingScheduler(max_batch_size=8, max_wait_s=0.05)
+        process_batch = self.scheduler.process_batch
+
+        def slow_batch(payloads):
+            time.sleep(0.2)
+            return process_batch(payloads)
+
+        self.scheduler.process_batch = slow_batch
+        waits = []
+        self.assertEqual(self.scheduler.run(1, on_wait=waits.append), 10)
+        # the batch-fill wait counts, the inference itself does not
+        self.assertGreaterEqual(waits[0], 0.04)
+        self.assertLess(waits[0], 0.2)
+
+    def test_requests_are_grouped_by_key(self):
+        self.scheduler = RecordingScheduler(max_batch_size=2, max_wait_s=0.05)
+        futures = [
+            self.scheduler.submit(1, key="transcribe"),
+            self.scheduler.submit(2, key="translate"),
+            self.scheduler.submit(3, key="transcribe"),
+        ]
+        self.assertEqual([f.result(timeout=1) for f in futures], [10, 20, 30])
+        self.assertIn([1, 3], self.scheduler.batches)
+        self.assertIn([2], self.scheduler.batches)
+
+    def test_concurrent_clients_share_batches(self):
+        self.scheduler = RecordingScheduler(max_batch_size=4, max_wait_s=0.2)
+        results = {}
+
+        def client(i):
+            results[i] = self.scheduler.run(i, timeout=2)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, {i: i * 10 for i in range(8)})
+        self.assertLess(len(self.scheduler.batches), 8)
+        self.assertTrue(all(len(b) <= 4 for b in self.scheduler.batches))
+
+    def test_failure_is_raised_in_every_caller(self):
+        self.scheduler = RecordingScheduler(max_batch_size=2, max_wait_s=0.05)
+        self.scheduler.fail = True
+        futures = [self.scheduler.submit(i) for i in range(2)]
+        for f in futures:
+            with self.assertRaises(ValueError):
+                f.result(timeout=1)
+
+    def test_submit_after_stop_raises(self):
+        self.scheduler = RecordingScheduler()
+        self.scheduler.stop()
+        with self.assertRaises(RuntimeError):
+            self.scheduler.submit(1)
+
+
+EN_PROMPT = "<|startoftranscript|><|en|><|transcribe|><|notimestamps|>"
+DE_PROMPT = "<|startoftranscript|><|de|><|translate|><|notimestamps|>"
+
+
+class FakeTensorRTEngine:
+    """Stands in for WhisperTRTLLM: one token per special token, echoes the first mel value."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode_prompt(self, text_prefix):
+        return list(range(text_prefix.count("<|")))
+
+    def process_batch(self, mel, mel_input_lengths, text_prefix, num_beams=1):
+        self.calls.append((mel, mel_input_lengths, list(text_prefix)))
+        return [f"{prefix} window {m[0, 0].item():.0f}<|endoftext|>" for prefix, m in zip(text_prefix, mel)]
+
+
+class TestTensorRTBatchScheduler(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeTensorRTEngine()
+        self.scheduler = TensorRTBatchScheduler(self.engine, max_batch_size=3, max_wait_s=0.5, dtype="float32")
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def transcribe_concurrently(self, requests):
+        results = {}
+
+        def client(i, mel, prompt):
+            results[i] = self.scheduler.transcribe(mel, prompt)
+
+        threads = [threading.Thread(target=client, args=(i, mel, prompt)) for i, (mel, prompt) in enumerate(requests)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return [results[i] for i in range(len(requests))]
+
+    def test_windows_of_all_clients_are_decoded_in_one_call(self):
+        mels = [torch.full((80, n), float(i + 1)) for i, n in enumerate([3000, 1200, 3500])]
+        prompts = [EN_PROMPT, DE_PROMPT, EN_PROMPT]
+        results = self.transcribe_concurrently(list(zip(mels, prompts)))
+        # special tokens are stripped and every client gets its own window back
+        self.assertEqual(results, ["window 1", "window 2", "window 3"])
+        self.assertEqual(len(self.engine.calls), 1)
+        mel, lengths, text_prefix = self.engine.calls[0]
+        self.assertEqual(tuple(mel.shape), (3, 80, 3000))
+        self.assertEqual(lengths.tolist(), [3000] * 3)
+        self.assertEqual(sorted(text_prefix), sorted(prompts))
+        # the short window is padded with zeros, the long one trimmed
+        short = text_prefix.index(DE_PROMPT)
+        self.assertEqual(mel[short, 0, 1199].item(), 2.0)
+        self.assertEqual(mel[short, 0, 1200].item(), 0.0)
+
+    def test_prompts_of_different_lengths_are_not_mixed(self):
+        mels = [torch.ones(80, 3000), torch.ones(80, 3000)]
+        self.transcribe_concurrently([(mels[0], EN_PROMPT), (mels[1], "<|startoftranscript|><|en|>")])
+        self.assertEqual(len(self.engine.calls), 2)
+        self.assertEqual(self.scheduler.prompt_length(EN_PROMPT), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
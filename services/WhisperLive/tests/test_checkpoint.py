@@ -0,0 +1,175 @@
+import json
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.checkpoint import SessionCheckpointStore
+from whisper_live.server import ServeClientBase, TranscriptionCollectorClient
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value, ex))
+
+    def delete(self, key):
+        self.commands.append(("delete", key, None, None))
+
+    def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("connection reset")
+        for command, key, value, ex in self.commands:
+            if command == "set":
+                self.redis.data[key] = value
+                self.redis.ttls[key] = ex
+            else:
+                self.redis.data.pop(key, None)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.fail = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+class FakeWebSocket:
+    def send(self, message):
+        pass
+
+
+class RecordingPublisher:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, stream_key, fields, session=None, droppable=False):
+        self.events.append(json.loads(fields["payload"])["type"])
+        return True
+
+
+def collector_client():
+    """A collector of a fresh instance that records what it would publish."""
+    with mock.patch.object(TranscriptionCollectorClient, "connect"):
+        collector = TranscriptionCollectorClient("redis://unused")
+    collector.publisher.stop()
+    collector.publisher = RecordingPublisher()
+    return collector
+
+
+class TestSessionCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.store = SessionCheckpointStore(lambda: self.redis, ttl_s=60)
+
+    def test_writes_the_newest_snapshot_with_a_ttl(self):
+        self.store.submit("uid-1", {"n": 1})
+        self.store.submit("uid-1", {"n": 2})
+        # pending snapshots are visible before they are written
+        self.assertEqual(self.store.load("uid-1"), {"n": 2})
+        self.store.start()
+        self.store.stop()
+        self.assertEqual(json.loads(self.redis.data["whisperlive:checkpoint:uid-1"]), {"n": 2})
+        self.assertEqual(self.redis.ttls["whisperlive:checkpoint:uid-1"], 60)
+        self.assertEqual(self.store.stats()["saved"], 1)
+
+    def test_failed_writes_are_retried(self):
+        self.redis.fail = True
+        self.assertFalse(self.store.flush(self.redis, {"uid-1": {"n": 1}}, set()))
+        self.redis.fail = False
+        self.store.submit("uid-1", {"n": 1})
+        self.store.start()
+        self.store.stop()
+        self.assertIn("whisperlive:checkpoint:uid-1", self.redis.data)
+
+    def test_ended_sessions_are_deleted(self):
+        self.redis.data["whisperlive:checkpoint:uid-1"] = json.dumps({"n": 1})
+        self.store.submit("uid-1", {"n": 2})
+        self.store.delete("uid-1")
+        self.store.start()
+        self.store.stop()
+        self.assertNotIn("whisperlive:checkpoint:uid-1", self.redis.data)
+
+    def test_audio_round_trip(self):
+        audio = np.sin(np.linspace(0, 100, 16000)).astype(np.float32) * 0.5
+        decoded = SessionCheckpointStore.decode_audio(SessionCheckpointStore.encode_audio(audio))
+        np.testing.assert_allclose(decoded, audio, atol=1e-4)
+
+
+class TestSessionResume(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.store = SessionCheckpointStore(lambda: self.redis, max_audio_s=2.0, max_segments=10)
+        ServeClientBase.CHECKPOINT_STORE = self.store
+        self.options = {"transcription_thread": False, "max_buffer_s": 30}
+
+    def tearDown(self):
+        ServeClientBase.CHECKPOINT_STORE = None
+
+    def test_resumed_session_continues_transcript_and_audio(self):
+        client = ServeClientBase(FakeWebSocket(), language=None, client_uid="uid-1", delta_updates=True,
+                                 server_options=self.options)
+        audio = np.random.default_rng(0).uniform(-0.5, 0.5, 16000 * 10).astype(np.float32)
+        client.add_frames(audio)
+        for i in range(30):
+            client.transcript.append({"start": f"{i}.000", "end": f"{i + 0.2:.3f}", "text": f"s{i}",
+                                      "completed": True})
+        client.prepare_segments({"start": "9.000", "end": "9.500", "text": "partial", "completed": False})
+        client.timestamp_offset = 9.0
+        client.language = "de"
+        client.save_checkpoint(force=True)
+        self.store.start()
+        self.store.stop()
+
+        resumed = ServeClientBase(FakeWebSocket(), language=None, client_uid="uid-1", delta_updates=True,
+                                  server_options=self.options)
+        self.assertEqual(resumed.language, "de")
+        self.assertEqual(resumed.timestamp_offset, 9.0)
+        # the audio after the offset is back on its original timeline
+        self.assertEqual(resumed.audio_buffer.end_index, 16000 * 10)
+        self.assertEqual(resumed.audio_buffer.start_index, 16000 * 9)
+        np.testing.assert_allclose(resumed.audio_buffer.view(), audio[16000 * 9:], atol=1e-4)
+        # segment ids continue, and the partial is revised rather than sent again as revision 0
+        resumed.transcript.append({"start": "9.000", "end": "9.600", "text": "done", "completed": True})
+        self.assertEqual([(u["id"], u["revision"]) for u in resumed.prepare_segments()], [(30, 1)])
+
+    def test_resumed_session_does_not_start_again(self):
+        meeting = dict(client_uid="uid-4", platform="google_meet", meeting_url="https://meet", token="token",
+                       meeting_id="m-1", server_options=self.options)
+        first = collector_client()
+        client = ServeClientBase(FakeWebSocket(), collector_client_ref=first, **meeting)
+        client.add_frames(np.zeros(16000, dtype=np.float32))
+        client.save_checkpoint(force=True)
+        self.assertEqual(first.publisher.events, ["session_start"])
+
+        # the session resumes on another instance
+        second = collector_client()
+        resumed = ServeClientBase(FakeWebSocket(), collector_client_ref=second, **meeting)
+        self.assertIsNotNone(resumed.checkpoint)
+        resumed.send_transcription_to_client([{"start": "0.000", "end": "1.000", "text": "hi", "completed": True}])
+        self.assertEqual(second.publisher.events, ["transcription"])
+
+    def test_sessions_without_checkpoint_start_fresh(self):
+        client = ServeClientBase(FakeWebSocket(), client_uid="uid-2", server_options=self.options)
+        self.assertIsNone(client.checkpoint)
+        self.assertEqual(client.audio_buffer.end_index, 0)
+
+    def test_ended_session_is_not_checkpointed(self):
+        client = ServeClientBase(FakeWebSocket(), client_uid="uid-3", server_options=self.options)
+        client.add_frames(np.zeros(16000, dtype=np.float32))
+        client.end_session()
+        client.save_checkpoint(force=True)
+        self.assertIsNone(self.store.load("uid-3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -79,6 +79,23 @@ class TestClientCallbacks(BaseTestCase):
         self.assertEqual(len(self.client.transcript), 3)
         self.assertEqual(self.client.transcript[1]['text'], "Test transcript 2")
 
+    def test_on_message_with_delta_updates(self):
+        self.client.delta_updates = True
+        self.client.on_message(self.mock_ws_app, json.dumps(
+            {"uid": self.client.uid, "message": "SERVER_READY", "backend": "faster_whisper"}))
+
+        for segments in (
+            [{"id": 0, "revision": 0, "start": 0, "end": 1, "text": "Test", "completed": False}],
+            [{"id": 0, "revision": 1, "start": 0, "end": 1, "text": "Test transcript", "completed": True},
+             {"id": 1, "revision": 0, "start": 1, "end": 2, "text": "Test", "completed": False}],
+            [{"id": 1, "revision": 1, "start": 1, "end": 2, "text": "", "completed": False}],
+        ):
+            self.client.on_message(self.mock_ws_app, json.dumps({"uid": self.client.uid, "segments": segments}))
+
+        self.assertEqual(list(self.client.segments_by_id), [0])
+        self.assertEqual(len(self.client.transcript), 1)
+        self.assertEqual(self.client.transcript[0]['text'], "Test transcript")
+
     def test_on_close(self):
         close_status_code = 1000
         close_msg = "Normal closure"
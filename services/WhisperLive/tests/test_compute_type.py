@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from whisper_live.compute_type import (ComputeTypeCache, probe_compute_types, select_compute_type,
+                                       word_error_rate)
+
+REFERENCE = "And so my fellow Americans, ask not what your country can do for you."
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeModels:
+    """Models whose transcription takes `seconds` on the fake clock and returns `text`."""
+
+    def __init__(self, clock, timings):
+        self.clock = clock
+        self.timings = timings
+        self.loaded = []
+
+    def load(self, compute_type):
+        if self.timings[compute_type] is None:
+            raise ValueError(f"{compute_type} is not supported by this model")
+        self.loaded.append(compute_type)
+        return compute_type
+
+    def transcribe(self, compute_type, audio):
+        seconds, text = self.timings[compute_type]
+        self.clock.now += seconds
+        return text
+
+
+class TestWordErrorRate(unittest.TestCase):
+    def test_ignores_case_and_punctuation(self):
+        self.assertEqual(word_error_rate(REFERENCE, REFERENCE.upper().replace(",", "")), 0.0)
+
+    def test_counts_substitutions_insertions_and_deletions(self):
+        self.assertAlmostEqual(word_error_rate("a b c d", "a x c d e"), 2 / 4)
+        self.assertAlmostEqual(word_error_rate("a b c d", "a d"), 2 / 4)
+
+
+class TestProbeComputeTypes(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.audio = np.zeros(16000 * 4, dtype=np.float32)
+
+    def probe(self, timings, **kwargs):
+        models = FakeModels(self.clock, timings)
+        result = probe_compute_types(models.load, models.transcribe, self.audio, REFERENCE,
+                                     clock=self.clock, **kwargs)
+        return result, models
+
+    def test_picks_the_fastest_compute_type_within_the_tolerance(self):
+        result, _ = self.probe({
+            "int8": (0.5, REFERENCE),
+            "int8_float32": (0.7, REFERENCE),
+            "float32": (1.2, REFERENCE),
+        })
+        self.assertEqual(result["compute_type"], "int8")
+        self.assertEqual(result["results"][0]["rtf"], 0.125)
+
+    def test_skips_a_faster_compute_type_that_loses_accuracy(self):
+        degraded = REFERENCE.replace("fellow", "yellow").replace("country", "county")
+        result, _ = self.probe({
+            "int8": (0.5, degraded),
+            "int8_float32": (0.7, REFERENCE),
+            "float32": (1.2, REFERENCE),
+        }, wer_tolerance=0.05)
+        self.assertEqual(result["compute_type"], "int8_float32")
+        self.assertGreater(result["results"][0]["wer"], 0.05)
+
+    def test_unsupported_and_failing_compute_types_are_skipped(self):
+        result, models = self.probe({
+            "int8": (0.5, REFERENCE),
+            "int8_float32": None,
+            "float32": (1.2, REFERENCE),
+        }, supported={"int8_float32", "float32"})
+        self.assertEqual(result["compute_type"], "float32")
+        self.assertEqual(models.loaded, ["float32"])
+        self.assertEqual([r["supported"] for r in result["results"]], [False, True, True])
+        self.assertIn("error", result["results"][1])
+
+    def test_returns_none_when_nothing_can_run(self):
+        result, _ = self.probe({"int8": None, "int8_float32": None, "float32": None})
+        self.assertIsNone(result)
+
+
+class TestSelectComputeType(unittest.TestCase):
+    def test_result_is_cached_for_later_restarts(self):
+        clock = FakeClock()
+        models = FakeModels(clock, {"int8": (0.5, REFERENCE), "int8_float32": (0.7, REFERENCE),
+                                    "float32": (1.2, REFERENCE)})
+        audio = np.zeros(16000, dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ComputeTypeCache(os.path.join(tmp, "cache", "compute_types.json"))
+            first = select_compute_type("small.en", models.load, models.transcribe, audio, REFERENCE, cache=cache)
+            self.assertFalse(first["cached"])
+            self.assertEqual(first["model"], "small.en")
+
+            # a restart reads the choice back without loading any model
+            loaded = len(models.loaded)
+            second = select_compute_type("small.en", models.load, models.transcribe, audio, REFERENCE,
+                                         cache=ComputeTypeCache(cache.path))
+            self.assertTrue(second["cached"])
+            self.assertEqual(second["compute_type"], first["compute_type"])
+            self.assertEqual(len(models.loaded), loaded)
+
+    def test_unreadable_cache_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "compute_types.json")
+            with open(path, "w") as f:
+                f.write("{not json")
+            self.assertEqual(ComputeTypeCache(path).load(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_live.features import FeatureCache
+from whisper_live.tensorrt_utils import load_audio
+
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.extractor = FeatureExtractor()
+        self.cache = FeatureCache(self.extractor)
+        self.audio = load_audio("assets/jfk.flac")
+
+    def test_growing_window_matches_the_extractor(self):
+        previous = 0
+        for end in (16000, 19333, 40000, 80000, len(self.audio)):
+            features = self.cache.features(self.audio[:end], 0)
+            expected = self.extractor(self.audio[:end])
+            self.assertEqual(features.shape, expected.shape)
+            np.testing.assert_allclose(features, expected, atol=1e-5)
+            # the frames before the previous window's padded tail came from the cache
+            self.assertGreaterEqual(self.cache.reused, previous // 160 - 2)
+            previous = end
+
+    def test_moving_window_drops_old_frames_and_reuses_the_overlap(self):
+        self.cache.features(self.audio[:80000], 0)
+        start = 32000
+        features = self.cache.features(self.audio[start:], start)
+        expected = self.extractor(self.audio[start:])
+        self.assertEqual(self.cache.first_index, start)
+        self.assertEqual(self.cache.reused, (80000 - 200 - start) // 160 + 1)
+        # only the first two frames differ: they see the real audio before the window start
+        np.testing.assert_allclose(features[:, 2:], expected[:, 2:], atol=1e-5)
+
+    def test_start_off_the_frame_grid_recomputes(self):
+        self.cache.features(self.audio[:80000], 0)
+        features = self.cache.features(self.audio[32001:], 32001)
+        self.assertEqual(self.cache.reused, 0)
+        np.testing.assert_allclose(features, self.extractor(self.audio[32001:]), atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
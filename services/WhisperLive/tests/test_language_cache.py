@@ -0,0 +1,57 @@
+import unittest
+
+from whisper_live.language_cache import LanguageCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLanguageCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LanguageCache(min_probability=0.8, recheck_s=60, max_entries=4, clock=self.clock)
+        self.meeting = LanguageCache.meeting_key("google_meet", "abc-defg-hij")
+
+    def test_session_and_meeting_share_a_detection(self):
+        self.assertIsNone(self.cache.get("uid-1", self.meeting))
+        self.cache.put("uid-1", self.meeting, "de", 0.95)
+        # the session reconnecting, and another session of the meeting
+        self.assertEqual(self.cache.get("uid-1").language, "de")
+        self.assertEqual(self.cache.get("uid-2", self.meeting).language, "de")
+        self.assertIsNone(self.cache.get("uid-3", LanguageCache.meeting_key("zoom", "abc-defg-hij")))
+        self.assertEqual(self.cache.stats(), {"entries": 2, "hits": 2, "misses": 2})
+
+    def test_session_entry_wins_over_meeting_entry(self):
+        self.cache.put("uid-1", self.meeting, "de", 0.95)
+        self.cache.put("uid-2", self.meeting, "fr", 0.9)
+        self.assertEqual(self.cache.get("uid-1", self.meeting).language, "de")
+        self.assertEqual(self.cache.get("uid-3", self.meeting).language, "fr")
+
+    def test_uncertain_detections_are_not_cached(self):
+        self.assertIsNone(self.cache.put("uid-1", self.meeting, "de", 0.6))
+        self.assertIsNone(self.cache.get("uid-1", self.meeting))
+
+    def test_old_entries_need_a_recheck(self):
+        entry = self.cache.put("uid-1", None, "de", 0.95)
+        self.clock.now = 59
+        self.assertFalse(self.cache.needs_recheck(entry))
+        self.clock.now = 60
+        self.assertTrue(self.cache.needs_recheck(entry))
+        self.assertFalse(LanguageCache(recheck_s=0).needs_recheck(entry))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for i in range(4):
+            self.cache.put(f"uid-{i}", None, "en", 0.9)
+        self.cache.get("uid-0")
+        self.cache.put("uid-4", None, "en", 0.9)
+        self.assertIsNotNone(self.cache.get("uid-0"))
+        self.assertIsNone(self.cache.get("uid-1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+from prometheus_client import REGISTRY
+
+from whisper_live import metrics
+from whisper_live.server import ClientManager, ServeClientBase
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsClient(ServeClientBase):
+    BACKEND = "test"
+
+
+class TestMetrics(unittest.TestCase):
+    def test_observe_inference_records_realtime_factor(self):
+        before = sample("whisperlive_realtime_factor_sum", backend="unit")
+        metrics.observe_inference("unit", window_s=4.0, elapsed_s=1.0)
+        self.assertAlmostEqual(sample("whisperlive_realtime_factor_sum", backend="unit") - before, 0.25)
+        self.assertGreaterEqual(sample("whisperlive_audio_window_seconds_count", backend="unit"), 1)
+
+    def test_transcription_pass_and_buffer_depth(self):
+        client = MetricsClient(mock.MagicMock(), client_uid="metrics-client")
+        before = sample("whisperlive_inference_seconds_count", backend="test")
+        client.add_frames(np.zeros(16000, dtype=np.float32))
+        _, duration = client.get_audio_chunk_for_processing()
+        self.assertEqual(sample("whisperlive_client_buffer_seconds", client_uid="metrics-client"), 1.0)
+        client.record_busy_time(time.monotonic(), duration)
+        self.assertEqual(sample("whisperlive_inference_seconds_count", backend="test") - before, 1)
+
+        client.cleanup()
+        self.assertIsNone(REGISTRY.get_sample_value("whisperlive_client_buffer_seconds",
+                                                    {"client_uid": "metrics-client"}))
+
+    def test_buffer_depth_grows_while_no_pass_runs(self):
+        client = MetricsClient(mock.MagicMock(), client_uid="behind-client")
+        for _ in range(3):
+            client.add_frames(np.zeros(16000, dtype=np.float32))
+        self.assertEqual(sample("whisperlive_client_buffer_seconds", client_uid="behind-client"), 3.0)
+        with client.lock:
+            client.timestamp_offset = 2.5
+        client.add_frames(np.zeros(8000, dtype=np.float32))
+        self.assertEqual(sample("whisperlive_client_buffer_seconds", client_uid="behind-client"), 1.0)
+        client.cleanup()
+
+    def test_client_manager_counts_connected_and_rejected(self):
+        manager = ClientManager(max_clients=1)
+        rejected = sample("whisperlive_clients_rejected_total")
+        websocket, client = mock.MagicMock(), mock.MagicMock()
+        manager.add_client(websocket, client)
+        self.assertEqual(sample("whisperlive_clients_connected"), 1)
+
+        other = mock.MagicMock()
+        self.assertTrue(manager.is_server_full(other, {"uid": "late"}))
+        self.assertEqual(json.loads(other.send.call_args[0][0])["status"], "WAIT")
+        self.assertEqual(sample("whisperlive_clients_rejected_total") - rejected, 1)
+
+        manager.remove_client(websocket)
+        self.assertEqual(sample("whisperlive_clients_connected"), 0)
+
+    def test_render_exposes_metrics(self):
+        body, content_type = metrics.render()
+        self.assertIn(b"whisperlive_inference_seconds", body)
+        self.assertTrue(content_type.startswith("text/plain"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+
+from whisper_live.model_pool import ModelPool
+
+
+class FakeModel:
+    def __init__(self, device_index, num_workers):
+        self.device_index = device_index
+        self.num_workers = num_workers
+
+
+class TestModelPool(unittest.TestCase):
+    def test_shared_model_has_one_slot_per_worker_and_device(self):
+        pool = ModelPool.create(FakeModel, size=4, device_index=[0, 1])
+        self.assertEqual(len(pool.models), 1)
+        self.assertEqual(pool.models[0].num_workers, 4)
+        self.assertEqual(pool.models[0].device_index, [0, 1])
+        self.assertEqual(pool.size, 8)
+
+    def test_replicas_are_spread_over_devices(self):
+        pool = ModelPool.create(FakeModel, size=3, replicas=True, device_index=[0, 1])
+        self.assertEqual([m.device_index for m in pool.models], [0, 1, 0])
+        self.assertTrue(all(m.num_workers == 1 for m in pool.models))
+        self.assertEqual(pool.size, 3)
+
+    def test_acquire_hands_out_distinct_replicas(self):
+        pool = ModelPool.create(FakeModel, size=2, replicas=True)
+        with pool.acquire() as first, pool.acquire() as second:
+            self.assertIsNot(first, second)
+            self.assertEqual(pool.in_use, 2)
+            with self.assertRaises(TimeoutError):
+                with pool.acquire(timeout=0.01):
+                    pass
+        self.assertEqual(pool.in_use, 0)
+
+    def test_concurrency_is_bounded_by_pool_size(self):
+        pool = ModelPool.create(FakeModel, size=3)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def decode():
+            with pool.acquire():
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=decode) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(max(peak), 3)
+
+    def test_slot_is_released_on_error(self):
+        pool = ModelPool.create(FakeModel, size=1)
+        with self.assertRaises(RuntimeError):
+            with pool.acquire():
+                raise RuntimeError("decode failed")
+        with pool.acquire(timeout=0.01) as model:
+            self.assertIs(model, pool.models[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
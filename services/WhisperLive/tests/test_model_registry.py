@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from whisper_live.model_registry import ModelRegistry
+from whisper_live.server import ServeClientFasterWhisper
+
+
+class FakeModel:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        self.registry = ModelRegistry(memory_budget_bytes=250, size_estimator=lambda m: m.size)
+
+    def loader(self, name, size=100):
+        def load():
+            self.loads.append(name)
+            return FakeModel(name, size)
+        return load
+
+    def test_same_key_shares_one_model(self):
+        first = self.registry.acquire(("small", "cpu", "int8"), self.loader("small"))
+        second = self.registry.acquire(("small", "cpu", "int8"), self.loader("small"))
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, ["small"])
+        self.assertEqual(self.registry.stats()["models"][0]["refs"], 2)
+
+    def test_compute_type_is_part_of_the_key(self):
+        self.registry.acquire(("small", "cpu", "int8"), self.loader("small-int8"))
+        self.registry.acquire(("small", "cpu", "float32"), self.loader("small-fp32"))
+        self.assertEqual(self.loads, ["small-int8", "small-fp32"])
+
+    def test_released_model_stays_cached(self):
+        model = self.registry.acquire("small", self.loader("small"))
+        self.registry.release(model)
+        self.assertIs(self.registry.acquire("small", self.loader("small")), model)
+        self.assertEqual(self.loads, ["small"])
+
+    def test_evicts_least_recently_used_unreferenced_model(self):
+        a = self.registry.acquire("a", self.loader("a"))
+        b = self.registry.acquire("b", self.loader("b"))
+        self.registry.release(a)
+        self.registry.release(b)
+        self.registry.acquire("a", self.loader("a"))    # a is now more recently used than b
+        self.registry.acquire("c", self.loader("c"))
+        keys = [m["key"] for m in self.registry.stats()["models"]]
+        self.assertEqual(keys, ["a", "c"])
+        self.assertEqual(self.registry.resident_bytes, 200)
+
+    def test_release_order_decides_eviction(self):
+        a = self.registry.acquire("a", self.loader("a"))
+        b = self.registry.acquire("b", self.loader("b"))
+        self.registry.release(b)
+        self.registry.release(a)    # acquired first, but used last
+        self.registry.acquire("c", self.loader("c"))
+        self.assertEqual([m["key"] for m in self.registry.stats()["models"]], ["a", "c"])
+
+    def test_models_in_use_are_never_evicted(self):
+        models = {name: self.registry.acquire(name, self.loader(name)) for name in ("a", "b", "c")}
+        self.assertEqual(self.registry.resident_bytes, 300)
+        self.registry.release(models["b"])
+        self.assertEqual([m["key"] for m in self.registry.stats()["models"]], ["a", "c"])
+
+    def test_concurrent_acquire_loads_once(self):
+        def slow_loader():
+            time.sleep(0.05)
+            self.loads.append("large")
+            return FakeModel("large", 100)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.acquire("large", slow_loader)))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.loads, ["large"])
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_failed_load_can_be_retried(self):
+        def failing_loader():
+            raise RuntimeError("download failed")
+
+        with self.assertRaises(RuntimeError):
+            self.registry.acquire("small", failing_loader)
+        self.assertIsNotNone(self.registry.acquire("small", self.loader("small")))
+
+
+class TestSingleModelSlot(unittest.TestCase):
+    def tearDown(self):
+        ServeClientFasterWhisper.SINGLE_MODEL = None
+        ServeClientFasterWhisper.SINGLE_MODEL_NAME = None
+        ServeClientFasterWhisper.MODEL_REGISTRY = None
+
+    def test_first_connections_with_different_models_get_their_own(self):
+        def load_model(client, device, device_index=None, num_workers=1):
+            time.sleep(0.05)
+            return FakeModel(client.model_size_or_path, 100)
+
+        clients = {}
+
+        def connect(model):
+            clients[model] = ServeClientFasterWhisper(
+                mock.MagicMock(), client_uid=model, model=model, device="cpu", single_model=True,
+                server_options={"transcription_thread": False, "session_checkpoint": False,
+                                "language_cache": False})
+
+        with mock.patch.object(ServeClientFasterWhisper, "load_model", load_model):
+            threads = [threading.Thread(target=connect, args=(m,)) for m in ("fake-a", "fake-b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for model, client in clients.items():
+            self.assertEqual(client.transcriber.name, model)
+        self.assertIn(ServeClientFasterWhisper.SINGLE_MODEL_NAME, ("fake-a", "fake-b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from redis.exceptions import DataError
+
+from whisper_live.redis_publisher import RedisStreamPublisher
+from whisper_live.server import TranscriptionCollectorClient
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def xadd(self, stream_key, fields, maxlen=None, approximate=True):
+        self.commands.append((stream_key, fields, maxlen, approximate))
+
+    def execute(self, raise_on_error=True):
+        self.redis.release.wait(5)
+        if self.redis.fail:
+            raise ConnectionError("connection reset")
+        # like redis-py, the whole pipeline is packed before anything is sent
+        for _, fields, _, _ in self.commands:
+            for value in fields.values():
+                if not isinstance(value, (str, bytes, int, float)) or isinstance(value, bool) \
+                        or value in self.redis.unencodable:
+                    raise DataError(f"Invalid input of type: '{type(value).__name__}'")
+        self.redis.batches.append(self.commands)
+        return [b"1-0"] * len(self.commands)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+        self.unencodable = set()
+        self.release = threading.Event()
+        self.release.set()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    @property
+    def messages(self):
+        return [fields["text"] for batch in self.batches for _, fields, _, _ in batch]
+
+
+class TestRedisStreamPublisher(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.client = self.redis
+        self.publisher = RedisStreamPublisher(lambda: self.client, max_queue=3, batch_size=10,
+                                              maxlen=1000, retry_s=0.01)
+
+    def tearDown(self):
+        self.redis.release.set()
+        self.publisher.stop()
+
+    def wait_until_flushed(self):
+        deadline = time.time() + 5
+        while self.publisher.depth and time.time() < deadline:
+            time.sleep(0.005)
+        self.publisher.stop()
+
+    def test_publishes_in_order_with_pipelined_trimmed_xadd(self):
+        self.publisher.start()
+        for i in range(5):
+            self.publisher.publish("stream", {"text": f"final-{i}"}, session="a")
+        self.wait_until_flushed()
+        self.assertEqual(self.redis.messages, [f"final-{i}" for i in range(5)])
+        self.assertTrue(all(cmd[2:] == (1000, True) for batch in self.redis.batches for cmd in batch))
+        self.assertEqual(self.publisher.stats()["published"], 5)
+
+    def test_partials_of_a_session_are_coalesced(self):
+        self.publisher.publish("stream", {"text": "start"}, session="a")
+        for i in range(3):
+            self.publisher.publish("stream", {"text": f"a-partial-{i}"}, session="a", droppable=True)
+        self.publisher.publish("stream", {"text": "b-partial"}, session="b", droppable=True)
+        self.assertEqual(self.publisher.depth, 3)
+        self.publisher.start()
+        self.wait_until_flushed()
+        self.assertEqual(self.redis.messages, ["start", "a-partial-2", "b-partial"])
+        self.assertEqual(self.publisher.coalesced, 2)
+
+    def test_backpressure_drops_oldest_partial_but_never_finals(self):
+        self.publisher.publish("stream", {"text": "a-partial"}, session="a", droppable=True)
+        self.publisher.publish("stream", {"text": "b-final"}, session="b")
+        self.publisher.publish("stream", {"text": "c-partial"}, session="c", droppable=True)
+        # full: the oldest partial makes room
+        self.assertTrue(self.publisher.publish("stream", {"text": "d-final"}, session="d"))
+        self.publisher.publish("stream", {"text": "e-final"}, session="e")
+        # no partial left to drop: finals are still queued over the limit, partials are not
+        self.assertTrue(self.publisher.publish("stream", {"text": "f-final"}, session="f"))
+        self.assertFalse(self.publisher.publish("stream", {"text": "g-partial"}, session="g", droppable=True))
+        self.publisher.start()
+        self.wait_until_flushed()
+        self.assertEqual(self.redis.messages, ["b-final", "d-final", "e-final", "f-final"])
+        self.assertEqual(self.publisher.dropped, 3)
+
+    def test_messages_survive_disconnects_and_failed_flushes(self):
+        self.client = None
+        self.publisher.start()
+        self.publisher.publish("stream", {"text": "final"}, session="a")
+        self.publisher.publish("stream", {"text": "old-partial"}, session="a", droppable=True)
+        time.sleep(0.05)
+        self.assertEqual(self.publisher.depth, 2)
+
+        self.client = self.redis
+        self.redis.fail = True
+        time.sleep(0.05)
+        self.publisher.publish("stream", {"text": "new-partial"}, session="a", droppable=True)
+        time.sleep(0.05)
+        self.redis.fail = False
+        self.wait_until_flushed()
+        self.assertEqual(self.redis.messages, ["final", "new-partial"])
+
+    def test_non_string_fields_are_encoded(self):
+        self.publisher.start()
+        self.publisher.publish("speakers", {"text": "event", "bot": None, "active": True, "meta": {"a": 1}})
+        self.wait_until_flushed()
+        fields = self.redis.batches[0][0][1]
+        self.assertEqual((fields["bot"], fields["active"], fields["meta"]), ("null", "true", '{"a": 1}'))
+
+    def test_unencodable_message_does_not_block_the_queue(self):
+        self.redis.unencodable.add("poison")
+        self.publisher.max_queue = 10
+        for text in ["final-0", "final-1", "poison", "final-2", "final-3"]:
+            self.publisher.publish("stream", {"text": text}, session="a")
+        self.publisher.start()
+        self.wait_until_flushed()
+        self.assertEqual(self.redis.messages, ["final-0", "final-1", "final-2", "final-3"])
+        self.assertEqual(self.publisher.depth, 0)
+        self.assertEqual(self.publisher.failed, 1)
+
+    def test_publish_does_not_block_on_a_slow_redis(self):
+        self.redis.release.clear()
+        self.publisher.start()
+        self.publisher.publish("stream", {"text": "first"}, session="a")
+        time.sleep(0.02)
+        start = time.perf_counter()
+        for i in range(100):
+            self.publisher.publish("stream", {"text": f"partial-{i}"}, session="a", droppable=True)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(self.publisher.depth, 1)
+        self.redis.release.set()
+        self.wait_until_flushed()
+        self.assertEqual(self.redis.messages, ["first", "partial-99"])
+
+
+class TestDeltaTranscriptionMessages(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(TranscriptionCollectorClient, "connect"):
+            self.collector = TranscriptionCollectorClient("redis://unused")
+        self.collector.publisher.stop()
+        # Redis is unreachable and the queue is full after session_start and two messages
+        self.collector.publisher = RedisStreamPublisher(lambda: None, max_queue=3)
+
+    def send(self, *segments):
+        self.collector.send_transcription("token", "google_meet", "m-1", list(segments), session_uid="uid-1")
+
+    def queued(self):
+        return [[(s["id"], s["revision"], s["text"]) for s in json.loads(m.fields["payload"])["segments"]]
+                for m in self.collector.publisher._queue if not m.dropped
+                and json.loads(m.fields["payload"])["type"] == "transcription"]
+
+    def test_withdrawal_survives_backpressure(self):
+        self.send({"id": 0, "revision": 0, "text": "he", "completed": False})
+        self.send({"id": 0, "revision": 1, "text": "", "completed": False})
+        for revision, text in enumerate(["so", "so far", "so far so"]):
+            self.send({"id": 0, "revision": 2 + revision, "text": text, "completed": False})
+        self.send({"id": 1, "revision": 0, "text": "next", "completed": False})
+        # partials of one id replace each other, the withdrawal is neither coalesced nor dropped
+        self.assertEqual(self.queued(), [[(0, 1, "")], [(1, 0, "next")]])
+        self.assertEqual(self.collector.publisher.coalesced, 3)
+        self.assertEqual(self.collector.publisher.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
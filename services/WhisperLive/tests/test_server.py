@@ -1,4 +1,5 @@
 import subprocess
+import threading
 import time
 import json
 import unittest
@@ -8,7 +9,7 @@ import numpy as np
 import jiwer
 
 from websockets.exceptions import ConnectionClosed
-from whisper_live.server import TranscriptionServer, BackendType, ClientManager
+from whisper_live.server import TranscriptionServer, BackendType, ClientManager, ServeClientBase
 from whisper_live.client import Client, TranscriptionClient, TranscriptionTeeClient
 from whisper.normalizers import EnglishTextNormalizer
 
@@ -146,3 +147,173 @@ class TestExceptionHandling(unittest.TestCase):
                 print(message)
             print()
             self.assertTrue(any("Unexpected error" in message for message in log.output))
+
+
+class TestWaitForAudio(unittest.TestCase):
+    def setUp(self):
+        self.client = ServeClientBase(mock.Mock(), client_uid="test-client")
+
+    def test_times_out_without_audio(self):
+        self.assertFalse(self.client.wait_for_audio(1.0, timeout=0.05))
+        self.assertGreater(self.client.get_activity_stats()["idle_s"], 0)
+
+    def test_wakes_up_when_enough_audio_arrives(self):
+        threading.Timer(0.05, self.client.add_frames, args=(np.zeros(16000, dtype=np.float32),)).start()
+        start = time.monotonic()
+        self.assertTrue(self.client.wait_for_audio(1.0, timeout=5))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_waits_for_new_audio_after_a_pass(self):
+        self.client.add_frames(np.zeros(16000, dtype=np.float32))
+        self.assertTrue(self.client.wait_for_audio(1.0, timeout=0.05))
+        self.client.get_audio_chunk_for_processing()
+        self.assertFalse(self.client.wait_for_audio(1.0, timeout=0.05))
+        self.client.add_frames(np.zeros(1600, dtype=np.float32))
+        self.assertTrue(self.client.wait_for_audio(1.0, timeout=0.05))
+
+    def test_cleanup_wakes_up_waiting_thread(self):
+        threading.Timer(0.05, self.client.cleanup).start()
+        start = time.monotonic()
+        self.assertFalse(self.client.wait_for_audio(1.0, timeout=5))
+        self.assertLess(time.monotonic() - start, 1)
+
+
+class TestDeltaUpdates(unittest.TestCase):
+    def setUp(self):
+        self.client = ServeClientBase(mock.Mock(), client_uid="test-client", delta_updates=True)
+
+    def segment(self, start, text, completed):
+        return {"start": f"{start:.3f}", "end": f"{start + 1:.3f}", "text": text, "completed": completed}
+
+    def test_only_new_or_changed_segments_are_sent(self):
+        updates = self.client.prepare_segments(self.segment(0, "Hello", False))
+        self.assertEqual([(u["id"], u["revision"], u["text"]) for u in updates], [(0, 0, "Hello")])
+        self.assertEqual(self.client.prepare_segments(self.segment(0, "Hello", False)), [])
+
+        updates = self.client.prepare_segments(self.segment(0, "Hello world", False))
+        self.assertEqual([(u["id"], u["revision"]) for u in updates], [(0, 1)])
+
+        self.client.transcript.append(self.segment(0, "Hello world.", True))
+        updates = self.client.prepare_segments(self.segment(1, "How", False))
+        self.assertEqual([(u["id"], u["revision"], u["text"], u["completed"]) for u in updates],
+                         [(0, 2, "Hello world.", True), (1, 0, "How", False)])
+
+    def test_withdrawn_partial_is_cleared(self):
+        self.client.prepare_segments(self.segment(0, "Uh", False))
+        updates = self.client.prepare_segments()
+        self.assertEqual([(u["id"], u["revision"], u["text"]) for u in updates], [(0, 1, "")])
+        self.assertEqual(self.client.prepare_segments(), [])
+
+    def test_full_window_without_opt_in(self):
+        client = ServeClientBase(mock.Mock(), client_uid="full-client")
+        client.transcript.append(self.segment(0, "Hello.", True))
+        segments = client.prepare_segments(self.segment(1, "How", False))
+        self.assertEqual([s["text"] for s in segments], ["Hello.", "How"])
+        self.assertNotIn("id", segments[0])
+        self.assertEqual(len(client.prepare_segments(self.segment(1, "How", False))), 2)
+
+
+class WindowRecordingClient(ServeClientBase):
+    """Records the windows it would transcribe and commits each of them whole."""
+    BACKEND = "test"
+
+    def process_next_chunk(self):
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        if duration < self.min_audio_s or self.skip_silence(duration):
+            return
+        self.windows.append((self.timestamp_offset, self.timestamp_offset + duration))
+        self.timestamp_offset += duration
+
+
+class TestStreamingVadGate(unittest.TestCase):
+    def setUp(self):
+        self.client = WindowRecordingClient(mock.Mock(), client_uid="vad-client",
+                                            server_options={"vad_mode": "streaming", "min_audio_s": 1.0})
+        self.client.windows = []
+
+    def stream(self, audio, frame_s=0.25):
+        frame = int(frame_s * 16000)
+        for i in range(0, len(audio), frame):
+            self.client.add_frames(audio[i:i + frame])
+            self.client.process_next_chunk()
+
+    def test_silent_windows_are_skipped_and_speech_is_kept(self):
+        from whisper_live.tensorrt_utils import load_audio
+        from whisper_live.vad import StreamingVoiceActivityDetector
+
+        silence = np.zeros(16000 * 5, dtype=np.float32)
+        audio = np.concatenate([silence, load_audio("assets/jfk.flac"), silence])
+        self.stream(audio)
+
+        self.assertGreater(self.client.skipped_passes, 0)
+        transcribed = sum(end - start for start, end in self.client.windows)
+        self.assertLess(transcribed, len(audio) / 16000 - 6)
+
+        # every speech region found offline lies inside the transcribed windows
+        reference = StreamingVoiceActivityDetector()
+        reference.accept(audio, 0)
+        reference.close_region(len(audio))
+        for start, end in reference.regions:
+            covered = [(max(s, start / 16000), min(e, end / 16000)) for s, e in self.client.windows]
+            self.assertAlmostEqual(sum(max(0, e - s) for s, e in covered), (end - start) / 16000, delta=0.05)
+
+    def test_vad_is_off_by_default(self):
+        client = ServeClientBase(mock.Mock(), client_uid="no-vad-client")
+        self.assertIsNone(client.vad)
+        self.assertFalse(client.skip_silence(1.0))
+
+
+class WarmupClient:
+    def __init__(self, load_fails=False):
+        self.transcriber = None if load_fails else object()
+        self.passes = 0
+        self.cleaned_up = False
+
+    def transcribe_audio(self, audio):
+        self.passes += 1
+        return iter([])
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+
+class TestModelWarmup(unittest.TestCase):
+    def setUp(self):
+        self.server = TranscriptionServer()
+        self.server.backend = BackendType.FASTER_WHISPER
+        self.server.faster_whisper_custom_model_path = "custom-model"
+        self.server.whisper_tensorrt_path = None
+        self.server.trt_multilingual = False
+        self.server.single_model = True
+        self.server.server_options = {"preload_models": ["small", "custom-model"], "warmup_steps": 2}
+        self.clients = {}
+
+    def create_client(self, websocket, options, *args, server_options=None):
+        self.assertFalse(server_options["transcription_thread"])
+        client = self.clients[options["model"]] = WarmupClient(load_fails=options["model"] == "broken")
+        return client
+
+    def test_configured_models_are_loaded_and_warmed_up(self):
+        with mock.patch.object(self.server, "create_client", side_effect=self.create_client):
+            self.assertFalse(self.server.warmup_done)
+            self.server.preload_models()
+        self.assertTrue(self.server.warmup_done)
+        self.assertEqual(list(self.clients), ["custom-model", "small"])
+        self.assertTrue(all(c.passes == 2 and c.cleaned_up for c in self.clients.values()))
+        self.assertEqual([s["model"] for s in self.server.warmup_stats], ["custom-model", "small"])
+        self.assertTrue(all(s["first_inference_s"] <= s["warmup_s"] for s in self.server.warmup_stats))
+
+    def test_failed_load_does_not_block_readiness(self):
+        self.server.faster_whisper_custom_model_path = "broken"
+        self.server.server_options = {}
+        with mock.patch.object(self.server, "create_client", side_effect=self.create_client):
+            self.server.preload_models()
+        self.assertTrue(self.server.warmup_done)
+        self.assertIn("error", self.server.warmup_stats[0])
+
+    def test_tensorrt_engine_is_only_preloaded_in_single_model_mode(self):
+        self.server.backend = BackendType.TENSORRT
+        self.server.whisper_tensorrt_path = "/engines/small"
+        self.assertEqual(self.server.models_to_preload(), ["/engines/small"])
+        self.server.single_model = False
+        self.assertEqual(self.server.models_to_preload(), [])
@@ -0,0 +1,72 @@
+import unittest
+
+from whisper_live.streaming import LocalAgreement, TimedWord
+
+
+def words(*items):
+    return [TimedWord(start, end, word) for start, end, word in items]
+
+
+class TestLocalAgreement(unittest.TestCase):
+    def test_first_hypothesis_is_not_committed(self):
+        policy = LocalAgreement(n=2)
+        hypothesis = words((0.0, 0.4, " hello"), (0.5, 0.9, " world"))
+        self.assertEqual(policy.insert(hypothesis), [])
+        self.assertEqual(policy.tentative, hypothesis)
+
+    def test_commits_common_prefix_of_consecutive_hypotheses(self):
+        policy = LocalAgreement(n=2)
+        policy.insert(words((0.0, 0.4, " hello"), (0.5, 0.9, " word")))
+        committed = policy.insert(words((0.0, 0.4, " Hello"), (0.5, 0.9, " world"), (1.0, 1.3, " again")))
+        self.assertEqual([w.word for w in committed], [" Hello"])
+        self.assertEqual(policy.last_committed_time, 0.4)
+        self.assertEqual([w.word for w in policy.tentative], [" world", " again"])
+
+    def test_n3_needs_three_agreeing_decodes(self):
+        policy = LocalAgreement(n=3)
+        hypothesis = words((0.0, 0.4, " one"), (0.5, 0.9, " two"))
+        self.assertEqual(policy.insert(hypothesis), [])
+        self.assertEqual(policy.insert(hypothesis), [])
+        self.assertEqual(len(policy.insert(hypothesis)), 2)
+
+    def test_words_before_commit_point_are_ignored(self):
+        policy = LocalAgreement(n=2)
+        policy.insert(words((0.0, 0.4, " one"), (0.5, 0.9, " two")))
+        policy.insert(words((0.0, 0.4, " one"), (0.5, 0.9, " two")))
+        self.assertEqual(policy.last_committed_time, 0.9)
+        # the next window starts at 0.9 but whisper repeats the last committed word
+        policy.insert(words((0.9, 1.0, " two"), (1.1, 1.5, " three")))
+        committed = policy.insert(words((0.9, 1.0, " two"), (1.1, 1.5, " three"), (1.6, 2.0, " four")))
+        self.assertEqual([w.word for w in committed], [" three"])
+        self.assertEqual(policy.committed_text(), "one two three")
+
+    def test_committed_text_is_truncated_at_word_boundary(self):
+        policy = LocalAgreement(n=2)
+        hypothesis = words((0.0, 0.4, " alpha"), (0.5, 0.9, " beta"), (1.0, 1.4, " gamma"))
+        policy.insert(hypothesis)
+        policy.insert(hypothesis)
+        self.assertEqual(policy.committed_text(max_chars=9), "gamma")
+
+    def test_only_the_tail_of_the_committed_words_is_kept(self):
+        policy = LocalAgreement(n=2, max_committed_words=4)
+        for i in range(10):
+            hypothesis = words((i, i + 0.5, f" w{i}"))
+            policy.insert(hypothesis)
+            policy.insert(hypothesis)
+        self.assertEqual([w.word for w in policy.committed], [" w6", " w7", " w8", " w9"])
+        self.assertEqual(policy.committed_text(max_chars=7), "w8 w9")
+
+    def test_reset_drops_hypotheses(self):
+        policy = LocalAgreement(n=2)
+        policy.insert(words((0.0, 0.4, " one")))
+        policy.reset(10.0)
+        self.assertEqual(policy.tentative, [])
+        self.assertEqual(policy.insert(words((10.1, 10.4, " one"))), [])
+
+    def test_rejects_n_below_two(self):
+        with self.assertRaises(ValueError):
+            LocalAgreement(n=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
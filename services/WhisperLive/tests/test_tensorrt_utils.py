@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+import torch
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_live.tensorrt_utils import LogMelFrontend, N_SAMPLES, load_audio, pad_or_trim
+
+
+def padded_log_mel(audio, filters):
+    """The TensorRT backend's previous features: pad to 30 seconds, then STFT the whole window."""
+    audio = torch.from_numpy(pad_or_trim(audio, N_SAMPLES).astype(np.float32))
+    stft = torch.stft(audio, 400, 160, window=torch.hann_window(400), return_complex=True)
+    log_spec = torch.clamp(filters @ stft[..., :-1].abs() ** 2, min=1e-10).log10()
+    log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+
+class TestLogMelFrontend(unittest.TestCase):
+    def setUp(self):
+        self.filters = torch.from_numpy(FeatureExtractor().mel_filters.astype(np.float32))
+        self.frontend = LogMelFrontend(80, filters=self.filters)
+        self.audio = load_audio("assets/jfk.flac")
+
+    def test_matches_the_padded_spectrogram(self):
+        for n_samples in (0, 159, 32000, 32123, N_SAMPLES - 50, N_SAMPLES, N_SAMPLES + 16000):
+            audio = np.resize(self.audio, n_samples).astype(np.float32)
+            features, durations = self.frontend([audio])
+            self.assertEqual(tuple(features.shape), (1, 80, 3000))
+            self.assertAlmostEqual(durations[0], n_samples / 16000)
+            torch.testing.assert_close(features[0], padded_log_mel(audio, self.filters), atol=1e-5, rtol=0)
+
+    def test_windows_of_different_lengths_share_one_stft(self):
+        audios = [np.resize(self.audio, n).astype(np.float32) for n in (16000, 64000, N_SAMPLES - 50)]
+        features, _ = self.frontend(audios)
+        for feature, audio in zip(features, audios):
+            torch.testing.assert_close(feature, padded_log_mel(audio, self.filters), atol=1e-5, rtol=0)
+
+    def test_window_and_filters_are_cached_per_device(self):
+        self.frontend([self.audio])
+        window, filters = self.frontend.window(torch.device("cpu")), self.frontend.filters(torch.device("cpu"))
+        self.frontend([self.audio[:16000]])
+        self.assertIs(self.frontend.window(torch.device("cpu")), window)
+        self.assertIs(self.frontend.filters(torch.device("cpu")), filters)
+
+
+if __name__ == "__main__":
+    unittest.main()
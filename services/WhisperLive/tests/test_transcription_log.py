@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from whisper_live.server import ServeClientBase
+from whisper_live.transcription_log import NonBlockingQueueHandler, configure_transcription_log
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def emit(self, record):
+        self.events.append(record.event)
+
+
+class TestTranscriptionLog(unittest.TestCase):
+    def test_records_are_written_as_json_lines_by_the_listener(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            handler = configure_transcription_log(["test.transcription_log"], log_dir, max_bytes=1000)
+            test_logger = logging.getLogger("test.transcription_log")
+            test_logger.propagate = False
+            test_logger.setLevel(logging.INFO)
+            try:
+                test_logger.info("client %s connected", "a")
+                for i in range(200):
+                    test_logger.info("segment", extra={"event": {"event": "segment", "text": f"text {i}"}})
+            finally:
+                test_logger.removeHandler(handler)
+                handler.close()
+            files = sorted(os.listdir(log_dir))
+            # rotated by size, older files beyond the backup count deleted
+            self.assertEqual(files, ["transcription.jsonl"] + [f"transcription.jsonl.{i}" for i in range(1, 6)])
+            with open(os.path.join(log_dir, "transcription.jsonl")) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(lines[-1]["text"], "text 199")
+            self.assertIn("ts", lines[-1])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(maxsize=2)
+        test_logger = logging.getLogger("test.transcription_log.full")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        try:
+            for i in range(5):
+                test_logger.warning("message %d", i)
+        finally:
+            test_logger.removeHandler(handler)
+        self.assertEqual(handler.stats(), {"queued": 2, "dropped": 3})
+        # the arguments were merged on the logging thread
+        self.assertEqual(handler.queue.get_nowait().msg, "message 0")
+
+
+class TestSegmentLogging(unittest.TestCase):
+    def setUp(self):
+        self.handler = CapturingHandler()
+        logging.getLogger("transcription.segments").addHandler(self.handler)
+
+    def tearDown(self):
+        logging.getLogger("transcription.segments").removeHandler(self.handler)
+
+    def make_client(self, **options):
+        return ServeClientBase(mock.MagicMock(), client_uid="log-client",
+                               server_options=dict(options, transcription_thread=False))
+
+    def send_pass(self, client, completed, partial_text):
+        for text in completed:
+            client.transcript.append({"start": "0.000", "end": "1.000", "text": text, "completed": True})
+        client.log_segments(client.prepare_segments(
+            {"start": "1.000", "end": "2.000", "text": partial_text, "completed": False}))
+
+    def test_completed_segments_once_and_sampled_partials(self):
+        client = self.make_client(transcription_log_partial_every=3)
+        self.send_pass(client, ["one"], "p1")
+        for i in range(2, 7):
+            self.send_pass(client, [], f"p{i}")
+        self.send_pass(client, ["two"], "p7")
+        logged = [(e["text"], e["completed"]) for e in self.handler.events]
+        self.assertEqual(logged, [("one", True), ("p3", False), ("p6", False), ("two", True)])
+        self.assertEqual(self.handler.events[0]["uid"], "log-client")
+
+    def test_completed_only(self):
+        client = self.make_client(transcription_log_partial_every=1, transcription_log_completed_only=True)
+        self.send_pass(client, ["one", "two"], "p1")
+        self.send_pass(client, [], "p2")
+        self.assertEqual([e["text"] for e in self.handler.events], ["one", "two"])
+
+
+if __name__ == "__main__":
+    unittest.main()
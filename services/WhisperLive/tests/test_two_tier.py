@@ -0,0 +1,125 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from whisper_live.batching import BatchScheduler
+from whisper_live.server import ServeClientFasterWhisper
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def close(self):
+        pass
+
+
+class FakeFinalScheduler(BatchScheduler):
+    """Decodes every window as "accurate <n> s", n being its length in whole seconds."""
+
+    def __init__(self):
+        self.requests = []
+        super().__init__(max_batch_size=4, max_wait_s=0.0)
+
+    def process_batch(self, payloads):
+        self.requests.extend(payloads)
+        return [([segment(0, len(p.audio) / 16000, f" accurate {len(p.audio) // 16000} s")], None)
+                for p in payloads]
+
+
+def segment(start, end, text, no_speech_prob=0.0):
+    return SimpleNamespace(start=start, end=end, text=text, no_speech_prob=no_speech_prob)
+
+
+class TestTwoTierTranscription(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = FakeFinalScheduler()
+        ServeClientFasterWhisper.FINAL_SCHEDULER = self.scheduler
+        options = {"transcription_thread": False, "final_model": "large-v3", "session_checkpoint": False,
+                   "language_cache": False}
+        registry = ServeClientFasterWhisper.get_model_registry(options)
+        self.fast_model = registry.acquire(("fake-tiny.en", "cpu", "default"), lambda: SimpleNamespace())
+        self.websocket = FakeWebSocket()
+        self.client = ServeClientFasterWhisper(
+            self.websocket, client_uid="uid-1", model="fake-tiny.en", platform="google_meet",
+            meeting_url="https://meet", token="token", meeting_id="m-1", delta_updates=True,
+            server_options=options)
+        self.client.add_frames(np.zeros(16000 * 6, dtype=np.float32))
+
+    def tearDown(self):
+        self.scheduler.stop()
+        ServeClientFasterWhisper.FINAL_SCHEDULER = None
+        ServeClientFasterWhisper.MODEL_REGISTRY.release(self.fast_model)
+
+    def sent_segments(self):
+        return [s for message in self.websocket.sent for s in message.get("segments", [])]
+
+    def test_completed_segment_is_replaced_by_the_final_decode(self):
+        self.assertIs(self.client.final_scheduler, self.scheduler)
+        self.client.handle_transcription_output(
+            [segment(0.0, 2.0, " fast one"), segment(2.0, 3.0, " partial")], 6.0)
+        self.assertEqual([(s["id"], s["revision"], s["text"]) for s in self.sent_segments()],
+                         [(0, 0, " fast one"), (1, 0, " partial")])
+        # the final model got the segment's audio only, with a small margin after it
+        self.client.final_decodes[0].result(timeout=1)
+        self.assertEqual(len(self.scheduler.requests[0].audio), int((2.0 + self.client.FINAL_MARGIN_S) * 16000))
+
+        self.websocket.sent.clear()
+        self.client.on_idle()
+        self.assertEqual([(s["id"], s["revision"], s["text"]) for s in self.sent_segments()],
+                         [(0, 1, " accurate 2 s")])
+        self.assertEqual(self.client.transcript[0]["text"], " accurate 2 s")
+        self.assertTrue(self.client.transcript[0]["completed"])
+        self.assertEqual(self.client.final_decodes, {})
+
+    def test_final_decode_rides_with_the_next_pass(self):
+        self.client.handle_transcription_output(
+            [segment(0.0, 2.0, " fast one"), segment(2.0, 3.0, " partial")], 6.0)
+        self.client.final_decodes[0].result(timeout=1)
+        self.websocket.sent.clear()
+        self.client.handle_transcription_output([segment(0.0, 1.5, " partial two")], 4.0)
+        self.assertEqual([(s["id"], s["revision"], s["text"]) for s in self.sent_segments()],
+                         [(0, 1, " accurate 2 s"), (1, 1, " partial two")])
+
+    def test_partial_is_completed_once_the_client_goes_quiet(self):
+        self.client.handle_transcription_output(
+            [segment(0.0, 2.0, " fast one"), segment(2.0, 3.0, " partial")], 6.0)
+        self.client.final_decodes[0].result(timeout=1)
+        self.websocket.sent.clear()
+        self.client.on_idle()   # the client sent audio just now
+        self.assertEqual([s for s in self.sent_segments() if s["id"] == 1], [])
+        self.assertEqual(len(self.client.transcript), 1)
+
+        self.client.last_audio_at -= self.client.finalize_after_s
+        self.client.on_idle()
+        partial = self.sent_segments()[-1]
+        self.assertEqual((partial["id"], partial["revision"], partial["text"], partial["completed"]),
+                         (1, 1, " partial", True))
+        self.assertEqual(self.client.timestamp_offset, 3.0)
+        self.assertIsNone(self.client.last_partial)
+
+        # the completed segment gets its final decode like any other, and is only completed once
+        self.client.final_decodes[1].result(timeout=1)
+        self.websocket.sent.clear()
+        self.client.on_idle()
+        self.assertEqual([(s["id"], s["revision"], s["text"]) for s in self.sent_segments()],
+                         [(1, 2, " accurate 1 s")])
+        self.assertEqual(len(self.client.transcript), 2)
+
+    def test_segment_keeps_the_fast_text_without_speech(self):
+        self.scheduler.process_batch = lambda payloads: [([segment(0, 1, " noise", 0.9)], None) for _ in payloads]
+        self.client.handle_transcription_output(
+            [segment(0.0, 2.0, " fast one"), segment(2.0, 3.0, " partial")], 6.0)
+        self.client.final_decodes[0].result(timeout=1)
+        self.assertFalse(self.client.apply_final_decodes())
+        self.assertEqual(self.client.transcript[0]["text"], " fast one")
+        self.assertEqual(self.client.segment_revisions, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
+import threading
 import unittest
 import numpy as np
 from whisper_live.tensorrt_utils import load_audio
-from whisper_live.vad import VoiceActivityDetector
+from whisper_live.vad import BatchedVADService, StreamingVoiceActivityDetector, VADRequest, VoiceActivityDetector
 
 
 class TestVoiceActivityDetection(unittest.TestCase):
@@ -24,3 +25,101 @@ class TestVoiceActivityDetection(unittest.TestCase):
         audio_tensor = load_audio("assets/jfk.flac")
         is_speech_present = self.vad(audio_tensor)
         self.assertTrue(is_speech_present, "VAD failed to identify speech segment.")
+
+
+class TestStreamingVoiceActivityDetector(unittest.TestCase):
+    def setUp(self):
+        self.sample_rate = 16000
+        self.speech = load_audio("assets/jfk.flac")
+        self.silence = np.zeros(self.sample_rate * 2, dtype=np.float32)
+
+    def test_silence_has_no_speech(self):
+        vad = StreamingVoiceActivityDetector()
+        vad.accept(self.silence, 0)
+        self.assertEqual(vad.position, len(self.silence) // 512 * 512)
+        self.assertFalse(vad.has_speech(0, len(self.silence)))
+
+    def test_speech_region_is_padded(self):
+        vad = StreamingVoiceActivityDetector(preroll_s=0.3, hangover_s=0.5)
+        audio = np.concatenate([self.silence, self.speech, self.silence])
+        vad.accept(audio, 0)
+        speech_start, speech_end = len(self.silence), len(self.silence) + len(self.speech)
+        self.assertTrue(vad.has_speech(speech_start, speech_end))
+        # the first region starts shortly after the silence, and its pre-roll reaches back into it
+        first_start = vad.regions[0][0]
+        self.assertLess(first_start - speech_start, self.sample_rate)
+        self.assertTrue(vad.has_speech(first_start - int(0.2 * self.sample_rate), first_start - 1))
+        self.assertFalse(vad.has_speech(0, first_start - int(0.4 * self.sample_rate)))
+        self.assertFalse(vad.has_speech(speech_end + self.sample_rate, len(audio)))
+
+    def test_incremental_calls_match_one_call(self):
+        audio = np.concatenate([self.silence, self.speech])
+        whole = StreamingVoiceActivityDetector()
+        whole.accept(audio, 0)
+        streamed = StreamingVoiceActivityDetector()
+        for end in range(1000, len(audio) + 1000, 1000):
+            # callers pass everything from the current position on
+            streamed.accept(audio[streamed.position:end], streamed.position)
+        self.assertEqual(list(streamed.regions), list(whole.regions))
+        self.assertEqual(streamed.speech_start, whole.speech_start)
+
+
+class TestBatchedVADService(unittest.TestCase):
+    def setUp(self):
+        self.sample_rate = 16000
+        speech = load_audio("assets/jfk.flac")
+        silence = np.zeros(self.sample_rate, dtype=np.float32)
+        # streams of different lengths, so a batch has different numbers of chunks per stream
+        self.streams = [
+            np.concatenate([silence, speech]),
+            speech[:5 * self.sample_rate],
+            np.concatenate([speech[3 * self.sample_rate:], silence]),
+            silence,
+        ]
+        self.service = BatchedVADService(max_batch_size=8, max_wait_s=0.05)
+
+    def tearDown(self):
+        self.service.stop()
+
+    def test_batched_streams_match_separate_streams(self):
+        separate = [StreamingVoiceActivityDetector() for _ in self.streams]
+        batched = [StreamingVoiceActivityDetector(service=self.service) for _ in self.streams]
+        for vad, audio in zip(separate, self.streams):
+            vad.accept(audio, 0)
+
+        def feed(vad, audio):
+            for end in range(8000, len(audio) + 8000, 8000):
+                vad.accept(audio[vad.position:end], vad.position)
+
+        threads = [threading.Thread(target=feed, args=(vad, audio)) for vad, audio in zip(batched, self.streams)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for expected, actual in zip(separate, batched):
+            self.assertEqual(actual.position, expected.position)
+            self.assertEqual(len(actual.regions), len(expected.regions))
+            for (a_start, a_end), (e_start, e_end) in zip(actual.regions, expected.regions):
+                self.assertEqual(a_start, e_start)
+                self.assertEqual(a_end, e_end)
+            np.testing.assert_allclose(actual.state, expected.state, atol=1e-4)
+
+    def test_process_batch_scatters_results_in_request_order(self):
+        model = self.service.model
+        requests = []
+        for audio in self.streams:
+            n = min(len(audio) // 512, 20)
+            state = np.zeros((2, 1, 128), dtype=np.float32)
+            context = np.zeros((1, 64), dtype=np.float32)
+            requests.append((audio[:n * 512].reshape(n, 512), state, context))
+
+        results = self.service.process_batch([VADRequest(*r) for r in requests])
+        for (chunks, state, context), (probs, new_state, new_context) in zip(requests, results):
+            expected = []
+            for chunk in chunks:
+                prob, state, context = model.run_chunks(chunk[None], state, context, self.sample_rate)
+                expected.append(prob[0])
+            np.testing.assert_allclose(probs, expected, atol=1e-4)
+            np.testing.assert_allclose(new_state, state, atol=1e-4)
+            np.testing.assert_allclose(new_context, context)
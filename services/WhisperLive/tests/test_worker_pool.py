@@ -0,0 +1,158 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from whisper_live.server import ServeClientBase
+from whisper_live.worker_pool import TranscriptionWorkerPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeWebSocket:
+    def send(self, message):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingClient(ServeClientBase):
+    """Takes each chunk as if it was transcribed and records the calls the pool makes."""
+
+    def __init__(self, uid, calls):
+        super().__init__(FakeWebSocket(), client_uid=uid,
+                         server_options={"min_audio_s": 0.5, "session_checkpoint": False})
+        self.calls = calls
+
+    def process_next_chunk(self):
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        self.calls.append(("pass", self.client_uid, threading.current_thread().name))
+        with self.lock:
+            self.timestamp_offset += duration
+
+    def on_idle(self):
+        self.calls.append(("idle", self.client_uid))
+
+    def save_checkpoint(self, force=False):
+        self.calls.append(("exit", self.client_uid))
+
+
+def seconds(s):
+    return np.zeros(int(16000 * s), dtype=np.float32)
+
+
+class TestWorkerPoolScheduling(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pool = TranscriptionWorkerPool(num_workers=1, idle_timeout_s=1.0, clock=self.clock)
+        self.calls = []
+        self.a = RecordingClient("a", self.calls)
+        self.b = RecordingClient("b", self.calls)
+        self.pool.add(self.a)
+        self.pool.add(self.b)
+
+    def run_next(self):
+        item = self.pool.next_item(block=False)
+        if item is not None:
+            self.pool.run_item(*item)
+        return item
+
+    def feed(self, client, s):
+        client.worker_pool = self.pool
+        client.add_frames(seconds(s))
+
+    def test_client_that_waited_longest_goes_first(self):
+        self.feed(self.b, 1.0)
+        self.clock.now = 0.2
+        self.feed(self.a, 1.0)
+        self.assertGreater(self.pool.priority(self.b), self.pool.priority(self.a))
+        self.assertEqual(self.run_next(), ("pass", self.b))
+        self.assertEqual(self.run_next(), ("pass", self.a))
+        self.assertIsNone(self.run_next())
+
+    def test_client_with_more_backlog_goes_first(self):
+        self.feed(self.a, 1.0)
+        self.clock.now = 0.5
+        self.feed(self.b, 5.0)
+        self.assertEqual(self.run_next(), ("pass", self.b))
+        self.assertEqual(self.pool.stats()["max_queue_wait_s"], 0.0)
+
+    def test_new_audio_requeues_a_client_only_after_its_pass(self):
+        self.feed(self.a, 1.0)
+        self.feed(self.b, 1.0)
+        kind, client = self.pool.next_item(block=False)
+        self.assertIs(client, self.a)
+        self.feed(self.a, 1.0)      # arrives during the pass
+        self.assertIsNone(self.pool.priority(self.a))
+        self.assertEqual(self.run_next(), ("pass", self.b))
+        self.assertIsNone(self.pool.next_item(block=False))
+        self.pool.done(self.a)
+        self.assertEqual(self.pool.next_item(block=False), ("pass", self.a))
+
+    def test_too_little_audio_is_not_queued(self):
+        self.feed(self.a, 0.25)
+        self.assertIsNone(self.pool.priority(self.a))
+        self.assertIsNone(self.run_next())
+
+    def test_idle_client_gets_on_idle(self):
+        self.feed(self.a, 1.0)
+        self.clock.now = 0.5
+        self.run_next()
+        self.clock.now = 1.0
+        self.assertEqual(self.run_next(), ("idle", self.b))
+        self.assertIsNone(self.run_next())
+        self.clock.now = 2.0
+        self.assertEqual(self.run_next(), ("idle", self.a))
+        self.assertIn(("idle", self.a.client_uid), self.calls)
+
+    def test_exit_is_checkpointed_after_the_running_pass(self):
+        self.feed(self.a, 1.0)
+        kind, client = self.pool.next_item(block=False)
+        self.a.cleanup()
+        self.assertFalse(self.pool.wait(self.a, timeout=0))
+        self.pool.done(self.a)
+        self.assertEqual(self.run_next(), ("exit", self.a))
+        self.assertTrue(self.pool.wait(self.a, timeout=0))
+        self.assertEqual(self.pool.stats()["clients"], 1)
+
+
+class TestWorkerPoolThreads(unittest.TestCase):
+    def tearDown(self):
+        ServeClientBase.WORKER_POOL = None
+
+    def test_thread_count_is_independent_of_connections(self):
+        pool = TranscriptionWorkerPool(num_workers=2)
+        ServeClientBase.WORKER_POOL = pool
+        pool.start()
+        threads_before = threading.active_count()
+        calls = []
+        clients = [RecordingClient(f"client-{i}", calls) for i in range(10)]
+        for client in clients:
+            client.start_transcription_thread()
+            self.assertIsNone(getattr(client, "trans_thread", None))
+            client.add_frames(seconds(1.0))
+        deadline = time.monotonic() + 5
+        while sum(1 for c in calls if c[0] == "pass") < len(clients) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(threading.active_count(), threads_before)
+        passes = [c for c in calls if c[0] == "pass"]
+        self.assertEqual(sorted(c[1] for c in passes), sorted(c.client_uid for c in clients))
+        self.assertTrue({c[2] for c in passes} <= {"transcription-worker-0", "transcription-worker-1"})
+        for client in clients:
+            client.cleanup()
+        for client in clients:
+            self.assertTrue(pool.wait(client, timeout=5))
+        pool.stop(timeout=5)
+        self.assertEqual(pool.stats()["clients"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
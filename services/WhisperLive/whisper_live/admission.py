@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class AdmissionDecision:
+    """
+    Outcome of an admission check.
+
+    Attributes:
+        admit (bool): Whether the new connection is accepted.
+        reason (str): Why it was refused, "" when admitted.
+        projected_load (float): Estimated share of the inference capacity in use with the new
+            connection, 1.0 being exactly real time. None without measurements.
+        backlog_s (float): Average unprocessed audio per connected client in seconds.
+    """
+
+    def __init__(self, admit, reason="", projected_load=None, backlog_s=0.0):
+        self.admit = admit
+        self.reason = reason
+        self.projected_load = projected_load
+        self.backlog_s = backlog_s
+
+
+class AdmissionController:
+    """
+    Admits new connections only while the node keeps up with real time, from live measurements.
+
+    Every transcription pass reports its inference time and the seconds of new audio it consumed.
+    Over the last `window_s` seconds this gives:
+
+    * the aggregate real-time factor (RTF): inference seconds spent per second of incoming audio.
+      Each client sends one second of audio per second, so with `n` clients the node needs
+      `n * rtf` seconds of inference per second, spread over its `slots` parallel decodes;
+    * the average occupancy of the inference slots: inference seconds per second of wall time
+      and slot, which also covers passes that re-decode overlapping audio.
+
+    A new connection is refused when either estimate, scaled to one more client, exceeds
+    `max_load`, or when clients already wait on more than `max_backlog_s` of unprocessed audio on
+    average, which means the node is behind right now. Until a first measurement exists, only
+    the static connection limit applies.
+    """
+
+    def __init__(self, max_load: float = 0.8, max_backlog_s: float = 2.0, window_s: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_load (float): Maximum projected share of the inference capacity in use, 1.0 meaning
+                the node would exactly keep up with real time.
+            max_backlog_s (float): Maximum average unprocessed audio per client in seconds.
+            window_s (float): Period in seconds the measurements are averaged over.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.max_load = max_load
+        self.max_backlog_s = max_backlog_s
+        self.window_s = window_s
+        self.clock = clock
+        self._passes = deque()
+        self._inference_s = 0.0
+        self._audio_s = 0.0
+        self._lock = threading.Lock()
+        self._started = clock()
+        self.admitted = 0
+        self.refused = 0
+        self.last_decision = None
+
+    def record_pass(self, inference_s: float, audio_s: float):
+        """
+        Records a transcription pass.
+
+        Args:
+            inference_s (float): Time spent running the model, without waiting for it.
+            audio_s (float): Seconds of audio that arrived since the client's previous pass.
+        """
+        with self._lock:
+            now = self.clock()
+            self._passes.append((now, inference_s, audio_s))
+            self._inference_s += inference_s
+            self._audio_s += audio_s
+            self._prune(now)
+
+    def real_time_factor(self) -> Optional[float]:
+        """Inference seconds per second of incoming audio over the window, None without passes."""
+        with self._lock:
+            self._prune(self.clock())
+            if self._audio_s <= 0:
+                return None
+            return self._inference_s / self._audio_s
+
+    def occupancy(self, slots: int) -> Optional[float]:
+        """Average share of the `slots` inference slots in use over the window."""
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            if not self._passes:
+                return None
+            span = max(min(self.window_s, now - self._started), 1.0)
+            return self._inference_s / (span * max(slots, 1))
+
+    def decide(self, n_clients: int, backlog_s: float, slots: int = 1) -> AdmissionDecision:
+        """
+        Decides whether one more client can be served.
+
+        Args:
+            n_clients (int): Number of connected clients.
+            backlog_s (float): Total unprocessed audio of the connected clients in seconds.
+            slots (int): Number of transcriptions the node runs in parallel.
+        """
+        avg_backlog = backlog_s / n_clients if n_clients else 0.0
+        projected = None
+        if n_clients:
+            rtf = self.real_time_factor()
+            occupancy = self.occupancy(slots)
+            estimates = []
+            if rtf is not None:
+                estimates.append((n_clients + 1) * rtf / max(slots, 1))
+            if occupancy is not None:
+                estimates.append(occupancy * (n_clients + 1) / n_clients)
+            projected = max(estimates) if estimates else None
+
+        if avg_backlog > self.max_backlog_s:
+            decision = AdmissionDecision(False, f"clients are {avg_backlog:.1f}s behind on average",
+                                         projected, avg_backlog)
+        elif projected is not None and projected > self.max_load:
+            decision = AdmissionDecision(False, f"projected load {projected:.2f} exceeds {self.max_load:.2f}",
+                                         projected, avg_backlog)
+        else:
+            decision = AdmissionDecision(True, "", projected, avg_backlog)
+
+        with self._lock:
+            if decision.admit:
+                self.admitted += 1
+            else:
+                self.refused += 1
+            self.last_decision = decision
+        return decision
+
+    def stats(self) -> dict:
+        """Measurements and decision counts for the health endpoint."""
+        rtf = self.real_time_factor()
+        last = self.last_decision
+        return {
+            "real_time_factor": round(rtf, 4) if rtf is not None else None,
+            "admitted": self.admitted,
+            "refused": self.refused,
+            "last_projected_load": round(last.projected_load, 4) if last and last.projected_load is not None else None,
+            "last_backlog_s": round(last.backlog_s, 3) if last else None,
+        }
+
+    def _prune(self, now):
+        # caller holds self._lock
+        while self._passes and now - self._passes[0][0] > self.window_s:
+            _, inference_s, audio_s = self._passes.popleft()
+            self._inference_s -= inference_s
+            self._audio_s -= audio_s
+        if not self._passes:
+            self._inference_s = self._audio_s = 0.0
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from websockets.exceptions import ConnectionClosed
+
+_CLOSE = object()
+
+
+class AsyncWebSocketAdapter:
+    """
+    Thread-safe, non-blocking stand-in for a sync websocket, backed by an asyncio connection.
+
+    The ServeClient classes call `send` and `close` from inference threads. Here both only enqueue
+    onto the event loop; a writer task owned by the connection drains the queue. A slow client can
+    therefore never block inference.
+
+    Messages sent with `send_superseding` carry a key, and a queued message is replaced by a newer
+    one with the same key, e.g. the full-window transcription snapshots of a client. All other
+    messages (control messages, delta updates) are sent exactly once and in order. If they fill up
+    the queue, the client cannot keep up and the connection is closed; it may reconnect and
+    resume from its checkpoint.
+    """
+
+    def __init__(self, websocket, loop, max_queue=256):
+        """
+        Args:
+            websocket: The asyncio websocket connection.
+            loop (asyncio.AbstractEventLoop): The loop serving the connection.
+            max_queue (int): Maximum number of messages waiting to be sent.
+        """
+        self.websocket = websocket
+        self.loop = loop
+        self.max_queue = max_queue
+        self.queue = deque()    # [message, key] entries, emptied in place when superseded
+        self.superseding = {}   # key -> queued entry
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.coalesced = 0
+
+    def send(self, message):
+        """Queues a message for the client. Safe to call from any thread."""
+        if not self.closed:
+            self.loop.call_soon_threadsafe(self._enqueue, message, None)
+
+    def send_superseding(self, message, key):
+        """Queues a message that replaces the queued message sent with the same `key`, if any."""
+        if not self.closed:
+            self.loop.call_soon_threadsafe(self._enqueue, message, key)
+
+    def close(self):
+        """Closes the connection once all queued messages are sent. Safe to call from any thread."""
+        if not self.closed:
+            self.closed = True
+            self.loop.call_soon_threadsafe(self._enqueue, _CLOSE, None)
+
+    def recv(self):
+        raise RuntimeError("Messages of async connections are received by the event loop")
+
+    def _enqueue(self, message, key):
+        if key is not None and key in self.superseding:
+            self.superseding.pop(key)[0] = None
+            self.coalesced += 1
+        elif message is not _CLOSE and len(self.queue) >= self.max_queue:
+            self._overflow()
+            return
+        entry = [message, key]
+        self.queue.append(entry)
+        if key is not None:
+            self.superseding[key] = entry
+        self.ready.set()
+
+    def _overflow(self):
+        # nothing may be dropped without the client missing an update, so the connection goes
+        if self.queue and self.queue[-1][0] is _CLOSE:
+            return
+        logging.warning(f"Client at {self.websocket.remote_address} is not keeping up, "
+                        f"{len(self.queue)} outgoing messages queued, closing the connection")
+        self.closed = True
+        self.queue.clear()
+        self.superseding.clear()
+        self.queue.append([_CLOSE, None])
+        self.ready.set()
+
+    async def writer(self):
+        """Sends queued messages until the connection is closed."""
+        while True:
+            while not self.queue:
+                self.ready.clear()
+                await self.ready.wait()
+            message, key = self.queue.popleft()
+            if message is None:
+                continue
+            if key is not None:
+                del self.superseding[key]
+            try:
+                if message is _CLOSE:
+                    await self.websocket.close()
+                    return
+                await self.websocket.send(message)
+            except ConnectionClosed:
+                self.closed = True
+                return
+
+
+class AsyncTranscriptionFrontend:
+    """
+    Serves all WebSocket connections of a `TranscriptionServer` from one asyncio event loop.
+
+    Receiving, control-message dispatch and sending happen on the loop. Clients are created with
+    `transcription_thread=False`, so they have no thread of their own. Whenever a client has enough
+    new audio, one `process_next_chunk` pass is submitted to a bounded inference executor. A client
+    that got no pass for `WAKEUP_TIMEOUT_S` gets an `on_idle` call on the same executor instead, and
+    once it disconnects, its last checkpoint is written there too. At most one of these runs per
+    client at a time, so the last checkpoint waits for the pass in progress. Model loading during the
+    handshake and the decoding of
+    incoming messages (Opus, and voice activity detection with the tensorrt backend) run in the
+    loop's default executor, so a slow frame does not hold up the other connections.
+    """
+
+    def __init__(self, server, max_workers=4, faster_whisper_custom_model_path=None,
+                 whisper_tensorrt_path=None, trt_multilingual=False):
+        """
+        Args:
+            server (TranscriptionServer): The server owning the client manager and backends.
+            max_workers (int): Number of threads running transcription passes.
+        """
+        self.server = server
+        self.max_workers = max_workers
+        self.faster_whisper_custom_model_path = faster_whisper_custom_model_path
+        self.whisper_tensorrt_path = whisper_tensorrt_path
+        self.trt_multilingual = trt_multilingual
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self.busy = {}          # client -> future of its running pass, on_idle call or last checkpoint
+        self.last_active = {}   # client -> loop time its last pass or on_idle call ended
+        self.loop = None
+
+    async def serve(self, host, port):
+        from websockets.asyncio.server import serve
+
+        self.loop = asyncio.get_running_loop()
+        async with serve(self.handle_connection, host, port, max_size=None) as ws_server:
+            self.server.is_healthy = True
+            logging.info(f"SERVER_RUNNING: WhisperLive async server running on {host}:{port} "
+                         f"with {self.max_workers} inference workers")
+            self.server.start_self_monitor()
+            ticker = asyncio.create_task(self._tick())
+            try:
+                await ws_server.serve_forever()
+            finally:
+                ticker.cancel()
+                self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, websocket):
+        adapter = AsyncWebSocketAdapter(websocket, self.loop)
+        writer = asyncio.create_task(adapter.writer())
+        server = self.server
+        try:
+            logging.info("New client connected")
+            options = await websocket.recv()
+            connected = await self.loop.run_in_executor(
+                None, server.setup_new_connection, adapter, options,
+                self.faster_whisper_custom_model_path, self.whisper_tensorrt_path, self.trt_multilingual)
+            if not connected:
+                return
+            client = server.client_manager.get_client(adapter)
+            while not server.client_manager.is_client_timeout(adapter):
+                message = await websocket.recv()
+                if not await self.loop.run_in_executor(None, self.handle_message, adapter, message):
+                    break
+                self.schedule(client)
+        except ConnectionClosed:
+            logging.info("Connection closed by client")
+        except Exception as e:
+            logging.error(f"Unexpected error: {str(e)}")
+        finally:
+            client = server.client_manager.get_client(adapter) if server.client_manager else None
+            if client:
+                server.cleanup(adapter)
+                await self.finish(client)
+            adapter.close()
+            await writer
+
+    def handle_message(self, adapter, message):
+        """Decodes a message of `adapter`'s connection and feeds it to its client, off the loop."""
+        frame_np = self.server.parse_websocket_message(adapter, message)
+        return self.server.handle_audio_frame(adapter, frame_np, throttle=False)
+
+    def schedule(self, client):
+        """Submits a transcription pass for `client` unless one is running or there is no new audio."""
+        if client in self.busy or not client.poll_audio():
+            return
+        self._submit(client, client.process_next_chunk)
+
+    async def finish(self, client):
+        """Writes the last checkpoint of a client that exited, once the work still running for it is done."""
+        while client in self.busy:
+            await asyncio.wait([self.busy[client]])
+        self.last_active.pop(client, None)
+        try:
+            await self._submit(client, client.save_checkpoint, True)
+        except Exception as e:
+            logging.error(f"Failed to checkpoint session {client.client_uid}: {e}")
+
+    def tick(self):
+        """Schedules passes for clients with new audio and `on_idle` calls for clients without."""
+        client_manager = self.server.client_manager
+        if client_manager is None:
+            return
+        now = self.loop.time()
+        for client in list(client_manager.clients.values()):
+            self.schedule(client)
+            if (client not in self.busy and not client.exit
+                    and now - self.last_active.setdefault(client, now) >= client.WAKEUP_TIMEOUT_S):
+                self._submit(client, client.on_idle)
+
+    def _submit(self, client, fn, *args):
+        future = self.loop.run_in_executor(self.executor, fn, *args)
+        self.busy[client] = future
+        future.add_done_callback(lambda f, c=client, name=fn.__name__: self._done(c, f, name))
+        return future
+
+    def _done(self, client, future, name):
+        del self.busy[client]
+        if not future.cancelled() and future.exception() is not None:
+            logging.error(f"[ERROR]: {name} failed for client {client.client_uid}: {future.exception()}")
+        if not client.exit:
+            self.last_active[client] = self.loop.time()
+            # audio that arrived during the pass is picked up right away
+            self.schedule(client)
+
+    async def _tick(self):
+        # idle calls, and a safety net for deadlines: passes are normally scheduled by incoming audio
+        while True:
+            await asyncio.sleep(1.0)
+            self.tick()
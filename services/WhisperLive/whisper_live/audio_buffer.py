@@ -0,0 +1,97 @@
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity audio buffer addressed by a monotonically increasing sample index.
+
+    Samples are written twice, at ``i % capacity`` and ``i % capacity + capacity``, into a
+    backing array of ``2 * capacity`` samples. Any window of at most ``capacity`` samples is
+    therefore contiguous in memory and can be returned as a view, while an append only costs
+    O(len(frame)) regardless of how much audio is retained.
+
+    A view stays valid until the writer has advanced a full ``capacity`` past the first sample
+    of the view, i.e. until those samples would have been dropped from the buffer anyway.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        """
+        Args:
+            capacity (int): Number of samples retained by the buffer.
+            dtype: Sample dtype of the backing array. Defaults to float32.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self._begin = 0
+        self._end = 0
+
+    @property
+    def end_index(self) -> int:
+        """Absolute index one past the most recently written sample."""
+        return self._end
+
+    @property
+    def start_index(self) -> int:
+        """Absolute index of the oldest sample still held by the buffer."""
+        return max(self._begin, self._end - self.capacity)
+
+    def __len__(self):
+        return self._end - self.start_index
+
+    def reset(self, start_index: int = 0):
+        """Drop all samples and continue the timeline at ``start_index``."""
+        self._begin = self._end = int(start_index)
+
+    def append(self, frame: np.ndarray, scale: Optional[float] = None):
+        """
+        Appends samples to the buffer, overwriting the oldest ones once it is full.
+
+        Args:
+            frame (np.ndarray): 1-D array of samples. It is cast to the buffer dtype while copying,
+                so integer PCM can be written without an intermediate float array.
+            scale (float, optional): Factor applied to every sample while copying, e.g. ``1 / 32768``
+                for int16 PCM.
+        """
+        n = frame.shape[0]
+        if n == 0:
+            return
+        if n > self.capacity:
+            # only the last `capacity` samples can survive this write
+            self._end += n - self.capacity
+            frame = frame[-self.capacity:]
+            n = self.capacity
+
+        pos = self._end % self.capacity
+        first = min(n, self.capacity - pos)
+        for base in (pos, pos + self.capacity):
+            self._copy(self._data[base:base + first], frame[:first], scale)
+        if first < n:
+            rest = n - first
+            self._copy(self._data[:rest], frame[first:], scale)
+            self._copy(self._data[self.capacity:self.capacity + rest], frame[first:], scale)
+        self._end += n
+
+    @staticmethod
+    def _copy(dst, src, scale):
+        if scale is None:
+            np.copyto(dst, src, casting="unsafe")
+        else:
+            np.multiply(src, scale, out=dst, casting="unsafe")
+
+    def view(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the samples in ``[start, end)`` as a view into the buffer.
+
+        Indices are absolute sample indices; they are clamped to the range currently held by the
+        buffer, so asking for audio that was already overwritten returns the oldest retained audio.
+        """
+        first = self.start_index
+        start = first if start is None else min(max(int(start), first), self._end)
+        end = self._end if end is None else min(max(int(end), start), self._end)
+        pos = start % self.capacity
+        return self._data[pos:pos + (end - start)]
+
@@ -0,0 +1,90 @@
+from typing import List
+
+import numpy as np
+
+# scale turning int16 PCM into float samples in [-1, 1)
+INT16_SCALE = 1 / 32768
+
+
+class AudioDecoder:
+    """
+    Decodes the binary audio messages of one connection into 16 kHz mono samples.
+
+    The base decoder reads raw little-endian float32 PCM, the format clients send by default.
+    """
+
+    ENCODING = "float32"
+    RATE = 16000
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """
+        Args:
+            data (bytes): One binary websocket message.
+
+        Returns:
+            np.ndarray: The samples. Float arrays hold samples in [-1, 1]; int16 arrays hold PCM
+                that is scaled by `INT16_SCALE` when copied into the audio buffer.
+        """
+        return np.frombuffer(data, dtype=np.float32)
+
+
+class Int16Decoder(AudioDecoder):
+    """Raw little-endian int16 PCM, half the bandwidth of float32."""
+
+    ENCODING = "int16"
+
+    def decode(self, data: bytes) -> np.ndarray:
+        # kept as int16, the conversion to float happens while writing into the ring buffer
+        return np.frombuffer(data, dtype=np.int16)
+
+
+class OpusDecoder(AudioDecoder):
+    """
+    Opus packets, one packet per binary message, as produced by e.g. WebCodecs' AudioEncoder.
+
+    Opus always decodes at 48 kHz; the decoded audio is resampled to 16 kHz float32 by
+    libswresample. The decoder is stateful, so every connection needs its own instance.
+    """
+
+    ENCODING = "opus"
+
+    def __init__(self):
+        import av
+
+        self._av = av
+        self.codec = av.CodecContext.create("libopus" if "libopus" in av.codecs_available else "opus", "r")
+        # a mono decoder downmixes stereo packets itself; left at the default it would upmix mono ones
+        self.codec.layout = "mono"
+        self.resampler = av.AudioResampler(format="flt", layout="mono", rate=self.RATE)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        chunks = [
+            resampled.to_ndarray()[0]
+            for frame in self.codec.decode(self._av.Packet(data))
+            for resampled in self.resampler.resample(frame)
+        ]
+        if not chunks:
+            return np.zeros(0, dtype=np.float32)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+
+AUDIO_DECODERS = {decoder.ENCODING: decoder for decoder in (AudioDecoder, Int16Decoder, OpusDecoder)}
+
+
+def audio_encodings() -> List[str]:
+    """Names of the audio encodings clients can declare in their handshake."""
+    return list(AUDIO_DECODERS)
+
+
+def create_audio_decoder(encoding: str = "float32") -> AudioDecoder:
+    """
+    Creates the decoder for the `audio_encoding` a client declared.
+
+    Raises:
+        ValueError: If the encoding is not supported.
+    """
+    try:
+        decoder_cls = AUDIO_DECODERS[encoding]
+    except KeyError:
+        raise ValueError(f"Unsupported audio_encoding {encoding!r}, expected one of {audio_encodings()}") from None
+    return decoder_cls()
@@ -0,0 +1,290 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, List, Optional
+
+
+class BatchRequest:
+    """
+    A unit of work submitted to a `BatchScheduler`.
+
+    Attributes:
+        payload: Backend specific input, e.g. an audio window with its decoding options.
+        key (Hashable): Requests are only batched with requests that have the same key.
+        future (Future): Resolved with the result of this request once its batch has run.
+        submitted_at (float): `time.monotonic()` at submission, used for the max-wait deadline.
+        started_at (float): `time.monotonic()` when its batch started running, None until then.
+    """
+
+    def __init__(self, payload: Any, key: Hashable = None):
+        self.payload = payload
+        self.key = key
+        self.future = Future()
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+
+
+class BatchScheduler:
+    """
+    Collects inference requests from many client threads and runs them in batches on one worker thread.
+
+    A batch is dispatched as soon as `max_batch_size` requests with the same key are pending, or when the
+    oldest pending request has waited `max_wait_s`. Subclasses implement `process_batch`, which receives
+    the payloads of one batch and returns one result per payload in the same order.
+    """
+
+    def __init__(self, max_batch_size: int = 8, max_wait_s: float = 0.05, name: str = "batch-scheduler"):
+        """
+        Args:
+            max_batch_size (int): Maximum number of requests run together.
+            max_wait_s (float): Maximum time the oldest request waits for the batch to fill up.
+            name (str): Name of the worker thread.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_s
+        self._pending: List[BatchRequest] = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.batches_run = 0
+        self.requests_run = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: Any, key: Hashable = None) -> Future:
+        """
+        Queues a request and returns a future resolved with its result.
+
+        Raises:
+            RuntimeError: If the scheduler has been stopped.
+        """
+        return self._submit(payload, key).future
+
+    def run(self, payload: Any, key: Hashable = None, timeout: Optional[float] = None,
+            on_wait: Optional[Callable[[float], None]] = None) -> Any:
+        """
+        Submits a request and blocks until its result is available.
+
+        Args:
+            on_wait (callable, optional): Called with the seconds the request spent queued and
+                waiting for its batch to fill up, i.e. from submission until its batch started.
+        """
+        request = self._submit(payload, key)
+        result = request.future.result(timeout=timeout)
+        if on_wait is not None:
+            on_wait(request.started_at - request.submitted_at)
+        return result
+
+    def _submit(self, payload: Any, key: Hashable) -> BatchRequest:
+        request = BatchRequest(payload, key)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("BatchScheduler is stopped")
+            self._pending.append(request)
+            self._cond.notify()
+        return request
+
+    def stop(self):
+        """Stops the worker thread; requests still pending are cancelled."""
+        with self._cond:
+            self._stopped = True
+            pending, self._pending = self._pending, []
+            self._cond.notify_all()
+        for request in pending:
+            request.future.cancel()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def process_batch(self, payloads: List[Any]) -> List[Any]:
+        raise NotImplementedError
+
+    def _next_batch(self) -> Optional[List[BatchRequest]]:
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                key = self._pending[0].key
+                same_key = [r for r in self._pending if r.key == key]
+                deadline = self._pending[0].submitted_at + self.max_wait_s
+                remaining = deadline - time.monotonic()
+                if len(same_key) >= self.max_batch_size or remaining <= 0:
+                    batch = same_key[:self.max_batch_size]
+                    taken = set(map(id, batch))
+                    self._pending = [r for r in self._pending if id(r) not in taken]
+                    return batch
+                self._cond.wait(remaining)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            started_at = time.monotonic()
+            for request in batch:
+                request.started_at = started_at
+            try:
+                results = self.process_batch([r.payload for r in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"process_batch returned {len(results)} results for {len(batch)} requests")
+            except Exception as e:
+                logging.error(f"[ERROR]: Batched inference failed for {len(batch)} requests: {e}")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            self.batches_run += 1
+            self.requests_run += len(batch)
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+
+class TranscriptionRequest:
+    """Payload of a faster_whisper batch request: one client's audio window and decoding options."""
+
+    def __init__(self, audio, language=None, task="transcribe", initial_prompt=None, word_timestamps=False):
+        self.audio = audio
+        self.language = language
+        self.task = task
+        self.initial_prompt = initial_prompt
+        self.word_timestamps = word_timestamps
+
+
+class FasterWhisperBatchScheduler(BatchScheduler):
+    """
+    Batches transcription windows of all clients sharing a single faster_whisper model.
+
+    The windows are padded to 30 seconds and decoded with one encoder and one decoder call through
+    `BatchedInferencePipeline.transcribe_batch`. Windows longer than 30 seconds cannot be stacked
+    and are transcribed one by one with `WhisperModel.transcribe`. Requests are keyed by task and
+    word_timestamps since both are shared by the whole batch.
+    """
+
+    def __init__(self, model, max_batch_size: int = 8, max_wait_s: float = 0.05, **transcribe_kwargs):
+        """
+        Args:
+            model (WhisperModel): The shared model.
+            max_batch_size (int): Maximum number of windows decoded together.
+            max_wait_s (float): Maximum time a window waits for others to join its batch.
+            **transcribe_kwargs: Extra decoding options passed to every transcription call.
+        """
+        from whisper_live.transcriber import BatchedInferencePipeline
+
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model)
+        self.transcribe_kwargs = transcribe_kwargs
+        super().__init__(max_batch_size, max_wait_s, name="faster-whisper-batch")
+
+    def transcribe(self, audio, language=None, task="transcribe", initial_prompt=None, word_timestamps=False,
+                   on_wait=None):
+        """
+        Blocking call used by client threads, returns (segments, info) for one window. `on_wait` is
+        passed to `run`.
+        """
+        request = TranscriptionRequest(audio, language, task, initial_prompt, word_timestamps)
+        return self.run(request, key=(task, word_timestamps), on_wait=on_wait)
+
+    def process_batch(self, payloads: List[TranscriptionRequest]):
+        results = [None] * len(payloads)
+        n_samples = self.model.feature_extractor.n_samples
+        batched = [i for i, p in enumerate(payloads) if p.audio.shape[0] <= n_samples]
+        for i, p in enumerate(payloads):
+            if p.audio.shape[0] > n_samples:
+                results[i] = self.model.transcribe(
+                    p.audio,
+                    language=p.language,
+                    task=p.task,
+                    initial_prompt=p.initial_prompt,
+                    word_timestamps=p.word_timestamps,
+                    vad_filter=False,
+                    **self.transcribe_kwargs,
+                )
+        if batched:
+            outputs = self.pipeline.transcribe_batch(
+                [payloads[i].audio for i in batched],
+                [payloads[i].language for i in batched],
+                task=payloads[batched[0]].task,
+                initial_prompts=[payloads[i].initial_prompt for i in batched],
+                word_timestamps=payloads[batched[0]].word_timestamps,
+                **self.transcribe_kwargs,
+            )
+            for i, output in zip(batched, outputs):
+                results[i] = output
+        return results
+
+
+class TensorRTRequest:
+    """Payload of a TensorRT batch request: one client's log-mel spectrogram and decoder prompt."""
+
+    def __init__(self, mel, text_prefix):
+        self.mel = mel
+        self.text_prefix = text_prefix
+
+
+class TensorRTBatchScheduler(BatchScheduler):
+    """
+    Batches transcription windows of all clients sharing a single TensorRT-LLM Whisper engine.
+
+    Every client computes the log-mel spectrogram of its window on its own thread and submits it
+    with its decoder prompt. The spectrograms of a batch are padded to `n_frames` frames, stacked
+    and decoded with one `WhisperTRTLLM.process_batch` call, each with its own prompt, so clients
+    with different languages or tasks still share a batch. The decoder cannot mix prompts of
+    different lengths, requests are therefore keyed by the number of prompt tokens.
+
+    `max_batch_size` must not exceed the batch size the engines were built with.
+    """
+
+    def __init__(self, model, max_batch_size: int = 8, max_wait_s: float = 0.05, dtype: str = "float16",
+                 n_frames: int = 3000, num_beams: int = 1):
+        """
+        Args:
+            model (WhisperTRTLLM): The shared engine, or any object with `encode_prompt` and
+                `process_batch`.
+            max_batch_size (int): Maximum number of windows decoded together.
+            max_wait_s (float): Maximum time a window waits for others to join its batch.
+            dtype (str): Torch dtype of the encoder input.
+            n_frames (int): Number of mel frames every spectrogram is padded or trimmed to.
+            num_beams (int): Beam size of the decoder.
+        """
+        self.model = model
+        self.dtype = dtype
+        self.n_frames = n_frames
+        self.num_beams = num_beams
+        self._prompt_lengths = {}
+        super().__init__(max_batch_size, max_wait_s, name="tensorrt-batch")
+
+    def prompt_length(self, text_prefix: str) -> int:
+        """Number of tokens of a decoder prompt; there are only a few distinct prompts, so they are cached."""
+        length = self._prompt_lengths.get(text_prefix)
+        if length is None:
+            length = self._prompt_lengths[text_prefix] = len(self.model.encode_prompt(text_prefix))
+        return length
+
+    def transcribe(self, mel, text_prefix: str, on_wait=None) -> str:
+        """
+        Blocking call used by client threads, returns the text of one window without special tokens.
+        `on_wait` is passed to `run`.
+        """
+        return self.run(TensorRTRequest(mel, text_prefix), key=self.prompt_length(text_prefix), on_wait=on_wait)
+
+    def process_batch(self, payloads: List[TensorRTRequest]) -> List[str]:
+        import torch
+        import torch.nn.functional as F
+
+        mels = []
+        for p in payloads:
+            mel = p.mel[..., :self.n_frames]
+            mels.append(F.pad(mel, (0, self.n_frames - mel.shape[-1])))
+        mel = torch.stack(mels).type(getattr(torch, self.dtype))
+        mel_input_lengths = torch.full((mel.shape[0],), mel.shape[2], dtype=torch.int32, device=mel.device)
+        texts = self.model.process_batch(mel, mel_input_lengths, [p.text_prefix for p in payloads],
+                                         num_beams=self.num_beams)
+        # remove all special tokens in the predictions
+        return [re.sub(r'<\|.*?\|>', '', text).strip() for text in texts]
@@ -0,0 +1,179 @@
+import base64
+import json
+import logging
+import threading
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+
+class SessionCheckpointStore:
+    """
+    Keeps a bounded snapshot of every session's state in Redis, so a session can resume on any
+    instance after a restart, a crash or a node drain.
+
+    A snapshot holds what a session cannot rebuild from new audio: the tail of its transcript, the
+    timestamp offset, the detected language and the last `max_audio_s` seconds of audio that was
+    not transcribed for good yet. Snapshots are submitted by the transcription threads and written
+    from a background thread with one pipelined ``SET ... EX ttl_s`` per batch, so Redis latency
+    never blocks a transcription pass. Only the newest pending snapshot of a session is written.
+
+    A snapshot expires `ttl_s` seconds after it was written; sessions that end normally delete
+    theirs.
+    """
+
+    def __init__(self, get_client: Callable[[], object], key_prefix: str = "whisperlive:checkpoint:",
+                 ttl_s: float = 300, interval_s: float = 5.0, max_audio_s: float = 10.0,
+                 max_segments: int = 50, retry_s: float = 1.0, name: str = "session-checkpoints"):
+        """
+        Args:
+            get_client (callable): Returns the current redis client, or None while disconnected.
+            key_prefix (str): Prefix of the Redis keys, followed by the session uid.
+            ttl_s (float): Time in seconds a snapshot is kept after it was written.
+            interval_s (float): Minimum time in seconds between two snapshots of a session.
+            max_audio_s (float): Maximum audio in seconds kept in a snapshot.
+            max_segments (int): Maximum number of transcript segments kept in a snapshot.
+            retry_s (float): Delay before retrying after a failed or impossible write.
+        """
+        self.get_client = get_client
+        self.key_prefix = key_prefix
+        self.ttl_s = ttl_s
+        self.interval_s = interval_s
+        self.max_audio_s = max_audio_s
+        self.max_segments = max_segments
+        self.retry_s = retry_s
+        self.name = name
+
+        self._pending = {}
+        self._deleted = set()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+        self.saved = 0
+        self.restored = 0
+        self.failed = 0
+
+    def key(self, uid: Hashable) -> str:
+        """Redis key of the snapshot of session `uid`."""
+        return f"{self.key_prefix}{uid}"
+
+    @staticmethod
+    def encode_audio(samples: np.ndarray) -> str:
+        """Encodes float32 samples as base64 16-bit PCM, half the size of the float samples."""
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+        return base64.b64encode(pcm.tobytes()).decode("ascii")
+
+    @staticmethod
+    def decode_audio(data: str) -> np.ndarray:
+        """Decodes the output of `encode_audio` back into float32 samples."""
+        pcm = np.frombuffer(base64.b64decode(data), dtype="<i2")
+        return pcm.astype(np.float32) / 32768.0
+
+    def start(self):
+        """Starts the writing thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stops the writing thread after it has tried to write the pending snapshots."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, uid: Hashable, state: dict):
+        """Queues a snapshot of session `uid`, replacing the pending one of the session if any."""
+        with self._cond:
+            self._deleted.discard(uid)
+            self._pending[uid] = state
+            self._cond.notify()
+
+    def delete(self, uid: Hashable):
+        """Drops the snapshot of a session that ended, pending or written."""
+        with self._cond:
+            self._pending.pop(uid, None)
+            self._deleted.add(uid)
+            self._cond.notify()
+
+    def load(self, uid: Hashable) -> Optional[dict]:
+        """
+        Returns the newest snapshot of session `uid`, None if there is none or Redis is unavailable.
+
+        A snapshot still waiting to be written is returned without asking Redis, so a session that
+        reconnects to the same instance right away resumes from its latest state.
+        """
+        with self._cond:
+            state = self._pending.get(uid)
+        if state is None:
+            client = self.get_client()
+            if client is None:
+                return None
+            try:
+                data = client.get(self.key(uid))
+                state = json.loads(data) if data else None
+            except Exception as e:
+                logging.error(f"{self.name}: failed to load the checkpoint of {uid}: {e}")
+                return None
+        if state is not None:
+            self.restored += 1
+        return state
+
+    def stats(self) -> dict:
+        """Snapshot counters for the health endpoint."""
+        with self._cond:
+            pending = len(self._pending)
+        return {"pending": pending, "saved": self.saved, "restored": self.restored, "failed": self.failed}
+
+    def run(self):
+        """Writing loop; writes the pending snapshots until stopped."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._deleted and not self._stop:
+                    self._cond.wait()
+                if not self._pending and not self._deleted:
+                    return
+                stopping = self._stop
+
+            client = self.get_client()
+            if client is not None:
+                with self._cond:
+                    pending, self._pending = self._pending, {}
+                    deleted, self._deleted = self._deleted, set()
+                if self.flush(client, pending, deleted):
+                    continue
+                with self._cond:
+                    # snapshots submitted meanwhile are newer
+                    for uid, state in pending.items():
+                        if uid not in self._deleted:
+                            self._pending.setdefault(uid, state)
+                    self._deleted |= deleted - set(self._pending)
+            if stopping:
+                logging.warning(f"{self.name}: stopped with {len(self._pending)} unwritten checkpoints")
+                return
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop, timeout=self.retry_s)
+
+    def flush(self, client, pending: dict, deleted: set) -> bool:
+        """
+        Writes `pending` snapshots and deletes the `deleted` ones in one pipeline on `client`.
+
+        Returns:
+            bool: False if Redis could not be reached and the batch should be retried.
+        """
+        try:
+            pipe = client.pipeline(transaction=False)
+            for uid, state in pending.items():
+                pipe.set(self.key(uid), json.dumps(state), ex=max(1, int(self.ttl_s)))
+            for uid in deleted:
+                pipe.delete(self.key(uid))
+            pipe.execute()
+        except Exception as e:
+            self.failed += 1
+            logging.error(f"{self.name}: failed to write {len(pending)} checkpoints, will retry: {e}")
+            return False
+        self.saved += len(pending)
+        return True
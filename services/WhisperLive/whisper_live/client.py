@@ -35,7 +35,8 @@ class Client:
         max_connection_time=600,
         platform="test_platform",
         meeting_url="test_url",
-        token="test_token"
+        token="test_token",
+        delta_updates=False
     ):
         """
         Initializes a Client instance for audio recording and streaming to a server.
@@ -58,11 +59,13 @@ class Client:
             platform (str, optional): Platform identifier sent to the server. Defaults to "test_platform".
             meeting_url (str, optional): Meeting URL identifier sent to the server. Defaults to "test_url".
             token (str, optional): Token identifier sent to the server. Defaults to "test_token".
+            delta_updates (bool, optional): Ask the server to send only new or changed segments. Default is False.
         """
         self.recording = False
         self.task = "transcribe"
         self.uid = str(uuid.uuid4())
         self.waiting = False
+        self.redirect_url = None
         self.last_response_received = None
         self.disconnect_if_no_response_for = 15
         self.language = lang
@@ -78,6 +81,8 @@ class Client:
         self.platform = platform
         self.meeting_url = meeting_url
         self.token = token
+        self.delta_updates = delta_updates
+        self.segments_by_id = {}
 
         if translate:
             self.task = "translate"
@@ -115,12 +120,34 @@ class Client:
         if status == "WAIT":
             self.waiting = True
             print(f"[INFO]: Server is full. Estimated wait time {round(message_data['message'])} minutes.")
+        elif status == "REDIRECT":
+            self.waiting = True
+            self.redirect_url = message_data["message"]
+            print(f"[INFO]: Server is at capacity, connect to {self.redirect_url} instead.")
         elif status == "ERROR":
             print(f"Message from Server: {message_data['message']}")
             self.server_error = True
         elif status == "WARNING":
             print(f"Message from Server: {message_data['message']}")
 
+    def merge_segment_updates(self, updates):
+        """
+        Applies delta updates to the segments received so far.
+
+        Returns:
+            list: The most recent segments, in the same form as a full update from the server.
+        """
+        for seg in updates:
+            current = self.segments_by_id.get(seg["id"])
+            if current is not None and current["revision"] > seg["revision"]:
+                continue
+            if not seg.get("completed", False) and not seg["text"]:
+                # the incomplete segment was withdrawn
+                self.segments_by_id.pop(seg["id"], None)
+            else:
+                self.segments_by_id[seg["id"]] = seg
+        return [self.segments_by_id[i] for i in sorted(self.segments_by_id)[-10:]]
+
     def process_segments(self, segments):
         """Processes transcript segments."""
         text = []
@@ -187,7 +214,11 @@ class Client:
             return
 
         if "segments" in message.keys():
-            self.process_segments(message["segments"])
+            segments = message["segments"]
+            if self.delta_updates:
+                segments = self.merge_segment_updates(segments)
+            if segments:
+                self.process_segments(segments)
 
     def on_error(self, ws, error):
         print(f"[ERROR] WebSocket Error: {error}")
@@ -222,6 +253,7 @@ class Client:
             "platform": self.platform,
             "meeting_url": self.meeting_url,
             "token": self.token,
+            "delta_updates": self.delta_updates,
         }
         ws.send(json.dumps(initial_payload))
 
@@ -694,6 +726,7 @@ class TranscriptionClient(TranscriptionTeeClient):
         platform (str, optional): Platform identifier sent to the server. Defaults to "test_platform".
         meeting_url (str, optional): Meeting URL identifier sent to the server. Defaults to "test_url".
         token (str, optional): Token identifier sent to the server. Defaults to "test_token".
+        delta_updates (bool, optional): Ask the server to send only new or changed segments. Default is False.
 
     Attributes:
         client (Client): An instance of the underlying Client class responsible for handling the WebSocket connection.
@@ -722,7 +755,8 @@ class TranscriptionClient(TranscriptionTeeClient):
         mute_audio_playback=False,
         platform="test_platform",
         meeting_url="test_url",
-        token="test_token"
+        token="test_token",
+        delta_updates=False
     ):
         self.client = Client(
             host, port, lang, translate, model, srt_file_path=output_transcription_path,
@@ -730,7 +764,8 @@ class TranscriptionClient(TranscriptionTeeClient):
             max_connection_time=max_connection_time,
             platform=platform,
             meeting_url=meeting_url,
-            token=token
+            token=token,
+            delta_updates=delta_updates
         )
 
         if save_output_recording and not output_recording_filename.endswith(".wav"):
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import platform
+import re
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+# CPU compute types tried by the probe, most accurate last
+CPU_CANDIDATES = ("int8", "int8_float32", "float32")
+
+
+def supported_compute_types(device: str = "cpu") -> Set[str]:
+    """Compute types ctranslate2 supports on `device` of this host, empty if it cannot tell."""
+    try:
+        import ctranslate2
+        return set(ctranslate2.get_supported_compute_types(device))
+    except Exception as e:
+        logging.warning(f"Cannot read the compute types supported on {device}: {e}")
+        return set()
+
+
+def host_key(model: str, device: str, supported: Iterable[str]) -> str:
+    """
+    Cache key of a probe: the model, the device, the CPU and the ctranslate2 build.
+
+    The supported compute types stand for the instruction sets ctranslate2 found on the CPU, so a
+    cache file copied to a different host does not apply there.
+    """
+    try:
+        import ctranslate2
+        version = ctranslate2.__version__
+    except ImportError:
+        version = "unknown"
+    return "|".join([model, device, platform.machine(), f"ctranslate2-{version}", ",".join(sorted(supported))])
+
+
+def _normalize(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word error rate of `hypothesis` against `reference`, ignoring case and punctuation."""
+    ref, hyp = _normalize(reference), _normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    # edit distance over words, one row at a time
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, other in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (word != other))
+    return row[-1] / len(ref)
+
+
+class ComputeTypeCache:
+    """
+    Probe results of this host in a JSON file, so a restart skips the probe.
+
+    The file maps `host_key` strings to the result of `probe_compute_types`. It is rewritten
+    atomically on every update; a missing or unreadable file is treated as empty.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+
+    def load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable compute type cache {self.path}: {e}")
+            return {}
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.load().get(key)
+
+    def put(self, key: str, entry: dict):
+        entries = self.load()
+        entries[key] = entry
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Cannot write compute type cache {self.path}: {e}")
+
+
+def probe_compute_types(load_model: Callable[[str], object], transcribe: Callable[[object, np.ndarray], str],
+                        audio: np.ndarray, reference: str, candidates: Iterable[str] = CPU_CANDIDATES,
+                        supported: Optional[Set[str]] = None, wer_tolerance: float = 0.02, steps: int = 2,
+                        clock: Callable[[], float] = time.perf_counter) -> Optional[dict]:
+    """
+    Benchmarks a model in each candidate compute type and picks the fastest accurate one.
+
+    Every supported candidate is loaded with `load_model(compute_type)`, transcribes `audio` once
+    to warm up, then `steps` more times while timed. Its word error rate against `reference` may
+    exceed the lowest word error rate of all candidates by `wer_tolerance` at most; among those,
+    the one with the lowest mean transcription time is chosen.
+
+    Args:
+        load_model (callable): Loads the model in the given compute type.
+        transcribe (callable): Transcribes audio with a loaded model and returns the text.
+        supported (set, optional): Compute types the host supports; all candidates are tried if None.
+
+    Returns:
+        dict: The chosen "compute_type" and per-candidate "results", None if no candidate could run.
+    """
+    results = []
+    for compute_type in candidates:
+        if supported is not None and compute_type not in supported:
+            results.append({"compute_type": compute_type, "supported": False})
+            continue
+        try:
+            model = load_model(compute_type)
+            transcribe(model, audio)
+            timings = []
+            for _ in range(max(1, steps)):
+                started = clock()
+                text = transcribe(model, audio)
+                timings.append(clock() - started)
+            del model
+        except Exception as e:
+            logging.warning(f"COMPUTE_TYPE_PROBE: {compute_type} failed: {e}")
+            results.append({"compute_type": compute_type, "supported": True, "error": str(e)})
+            continue
+        results.append({
+            "compute_type": compute_type,
+            "supported": True,
+            "inference_s": round(sum(timings) / len(timings), 4),
+            "rtf": round(sum(timings) / len(timings) / (len(audio) / 16000), 4),
+            "wer": round(word_error_rate(reference, text), 4),
+        })
+
+    measured = [r for r in results if "wer" in r]
+    if not measured:
+        return None
+    best_wer = min(r["wer"] for r in measured)
+    accurate = [r for r in measured if r["wer"] <= best_wer + wer_tolerance]
+    choice = min(accurate, key=lambda r: r["inference_s"])
+    return {"compute_type": choice["compute_type"], "wer_tolerance": wer_tolerance, "results": results}
+
+
+def select_compute_type(model: str, load_model: Callable[[str], object],
+                        transcribe: Callable[[object, np.ndarray], str], audio: np.ndarray, reference: str,
+                        cache: Optional[ComputeTypeCache] = None, device: str = "cpu",
+                        candidates: Iterable[str] = CPU_CANDIDATES, wer_tolerance: float = 0.02,
+                        steps: int = 2) -> Optional[dict]:
+    """
+    Returns the compute type `model` should run in on this host, probing it unless `cache` has it.
+
+    Returns:
+        dict: The probe result of `probe_compute_types` with the "model", whether it came from the
+            cache ("cached") and when it was probed ("probed_at"); None if the probe failed.
+    """
+    supported = supported_compute_types(device)
+    key = host_key(model, device, supported)
+    if cache is not None:
+        entry = cache.get(key)
+        if entry is not None:
+            return dict(entry, cached=True)
+
+    result = probe_compute_types(load_model, transcribe, audio, reference, candidates,
+                                 supported=supported or None, wer_tolerance=wer_tolerance, steps=steps)
+    if result is None:
+        return None
+    entry = dict(result, model=model, device=device, probed_at=time.time())
+    if cache is not None:
+        cache.put(key, entry)
+    return dict(entry, cached=False)
@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class FeatureCache:
+    """
+    Incremental log-mel features of one client's audio stream.
+
+    Consecutive transcription windows of a client overlap by all but the audio that arrived in
+    between, yet faster-whisper's `FeatureExtractor` recomputes the STFT and mel projection of the
+    whole window on every pass. This cache keeps the log-mel frames of the stream on its absolute
+    sample timeline, so a pass only computes the frames of the newly arrived hops and reuses the
+    rest.
+
+    Frames are cached before Whisper's normalization, which depends on the maximum over the whole
+    window and is applied again on every call. Only frames whose STFT window lies entirely inside
+    the audio seen so far are cached; the last few frames, which the extractor pads with zeros and
+    a reflection, are recomputed on every call exactly like the extractor does.
+
+    The result equals `feature_extractor(audio)` for the same window, except for the first two
+    frames after the window start moved forward: those keep the real audio before the start
+    in their STFT window instead of a reflection of the window.
+    """
+
+    def __init__(self, feature_extractor):
+        """
+        Args:
+            feature_extractor (faster_whisper.feature_extractor.FeatureExtractor): Defines the
+                STFT, hop and mel filters, normally the model's own extractor.
+        """
+        self.n_fft = feature_extractor.n_fft
+        self.hop_length = feature_extractor.hop_length
+        self.mel_filters = feature_extractor.mel_filters
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        """Forgets all cached frames."""
+        self.frames = np.zeros((self.mel_filters.shape[0], 0), dtype=np.float32)
+        self.first_index = 0    # sample index of the centre of the first cached frame
+        self.computed = 0       # frames computed by the last call, for statistics
+        self.reused = 0         # frames taken from the cache by the last call
+
+    @property
+    def end_index(self) -> int:
+        """Sample index of the centre of the frame after the last cached one."""
+        return self.first_index + self.frames.shape[1] * self.hop_length
+
+    def features(self, audio: np.ndarray, start_index: int) -> np.ndarray:
+        """
+        Returns Whisper's log-mel features of `audio`, using and extending the cached frames.
+
+        Args:
+            audio (np.ndarray): The window, float32 samples.
+            start_index (int): Absolute sample index of the first sample of `audio`. Windows of
+                consecutive calls are expected to start at the same or a later index.
+
+        Returns:
+            np.ndarray: The normalized features, shape (n_mels, len(audio) // hop_length + 1), as
+                `FeatureExtractor.__call__` returns them.
+        """
+        hop, half = self.hop_length, self.n_fft // 2
+        end_index = start_index + len(audio)
+        n_frames = len(audio) // hop + 1
+
+        if (start_index - self.first_index) % hop or not self.first_index <= start_index <= self.end_index:
+            # not on the grid of the cached frames, or a gap behind them
+            self.reset()
+            self.first_index = start_index
+        elif start_index > self.first_index:
+            # drop the frames behind the window
+            self.frames = self.frames[:, (start_index - self.first_index) // hop:]
+            self.first_index = start_index
+
+        # frames whose STFT window fits in the audio received so far are final
+        n_complete = min(max((end_index - half - start_index) // hop + 1, 0), n_frames)
+        n_cached = min(self.frames.shape[1], n_complete)
+        self.reused = n_cached
+        if n_complete > n_cached:
+            new = self._log_mel(audio, n_cached, n_complete - n_cached, pad_end=False)
+            self.frames = np.concatenate([self.frames[:, :n_cached], new], axis=1)
+        else:
+            self.frames = self.frames[:, :n_complete]
+        tail = self._log_mel(audio, n_complete, n_frames - n_complete, pad_end=True)
+        self.computed = n_frames - n_cached
+
+        log_spec = np.concatenate([self.frames, tail], axis=1) if tail.shape[1] else self.frames.copy()
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+    def _log_mel(self, audio, first, count, pad_end):
+        # unnormalized log-mel of `count` frames from frame `first` of `audio`, padded like the
+        # extractor: a reflection before the window start and, at the end, zeros and a reflection
+        hop, half = self.hop_length, self.n_fft // 2
+        if count <= 0:
+            return np.zeros((self.mel_filters.shape[0], 0), dtype=np.float32)
+        begin = first * hop - half
+        end = len(audio) if pad_end else (first + count - 1) * hop + half
+        samples = audio[max(begin, 0):end].astype(np.float32, copy=False)
+        if pad_end:
+            samples = np.pad(np.pad(samples, (0, hop)), (0, half), mode="reflect")
+        if begin < 0:
+            samples = np.pad(samples, (-begin, 0), mode="reflect")
+
+        frames = np.lib.stride_tricks.sliding_window_view(samples, self.n_fft)[::hop][:count]
+        stft = np.fft.rfft(frames * self.window, n=self.n_fft, axis=-1).astype(np.complex64)
+        magnitudes = np.abs(stft.T) ** 2
+        mel_spec = self.mel_filters @ magnitudes
+        return np.log10(np.clip(mel_spec, a_min=1e-10, a_max=None))
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class CachedLanguage:
+    """A detected language, with the probability it was detected with and when."""
+
+    __slots__ = ("language", "probability", "detected_at")
+
+    def __init__(self, language: str, probability: float, detected_at: float):
+        self.language = language
+        self.probability = probability
+        self.detected_at = detected_at
+
+
+class LanguageCache:
+    """
+    Process-wide cache of the languages detected for sessions and meetings.
+
+    Language detection runs an extra encoder pass on every transcription of a session until it
+    finds a confident result. Caching that result by `client_uid` lets a reconnecting session skip
+    detection, and caching it by meeting lets the other sessions of the meeting (a second bot, a
+    new connection) start in the meeting's language right away.
+
+    Only results with at least `min_probability` are cached. An entry older than `recheck_s` is
+    still returned, but `needs_recheck` tells the session to detect again on its next pass, so a
+    meeting that switched language is picked up. Entries are evicted in least recently used order
+    beyond `max_entries`.
+    """
+
+    def __init__(self, min_probability: float = 0.8, recheck_s: float = 300, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            min_probability (float): Minimum detection probability of a cached language.
+            recheck_s (float): Age in seconds after which a cached language is detected again,
+                0 to never re-check.
+            max_entries (int): Maximum number of cached sessions and meetings.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.min_probability = min_probability
+        self.recheck_s = recheck_s
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def meeting_key(platform: Optional[str], meeting_id: Optional[str]) -> Optional[tuple]:
+        """Cache key of a meeting, None if the session does not belong to one."""
+        if platform is None or meeting_id is None:
+            return None
+        return ("meeting", platform, meeting_id)
+
+    def get(self, client_uid: Hashable, meeting_key: Optional[tuple] = None) -> Optional[CachedLanguage]:
+        """
+        Returns the cached language of the session, or else of its meeting.
+        """
+        with self._lock:
+            for key in (("session", client_uid), meeting_key):
+                entry = self._entries.get(key) if key is not None else None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def put(self, client_uid: Hashable, meeting_key: Optional[tuple], language: str,
+            probability: float) -> Optional[CachedLanguage]:
+        """
+        Caches a detection result for the session and its meeting.
+
+        Returns:
+            CachedLanguage: The new entry, or None if the probability is below `min_probability`
+                and nothing was cached.
+        """
+        if probability < self.min_probability:
+            return None
+        entry = CachedLanguage(language, probability, self.clock())
+        with self._lock:
+            for key in (("session", client_uid), meeting_key):
+                if key is None:
+                    continue
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def needs_recheck(self, entry: CachedLanguage) -> bool:
+        """Whether `entry` is old enough to be detected again."""
+        return self.recheck_s > 0 and self.clock() - entry.detected_at >= self.recheck_s
+
+    def stats(self) -> dict:
+        """Cache statistics for the health endpoint."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
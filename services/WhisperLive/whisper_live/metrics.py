@@ -0,0 +1,72 @@
+"""
+Prometheus metrics of the WhisperLive server, served on the health server's /metrics endpoint.
+
+Metrics live in the default prometheus_client registry and are updated from the transcription
+threads, the client manager and the Redis collector client.
+"""
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# window lengths go up to clip_if_no_segment_s (25 s by default), latencies up to a few seconds
+_WINDOW_BUCKETS = (0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 25, 30)
+_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10)
+_RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+
+INFERENCE_SECONDS = Histogram(
+    "whisperlive_inference_seconds", "Duration of one transcription pass.",
+    ["backend"], buckets=_LATENCY_BUCKETS)
+AUDIO_WINDOW_SECONDS = Histogram(
+    "whisperlive_audio_window_seconds", "Length of the audio window transcribed in one pass.",
+    ["backend"], buckets=_WINDOW_BUCKETS)
+REALTIME_FACTOR = Histogram(
+    "whisperlive_realtime_factor",
+    "Inference time divided by audio window length; a node falls behind when this nears the pass rate.",
+    ["backend"], buckets=_RTF_BUCKETS)
+MODEL_LOCK_WAIT_SECONDS = Histogram(
+    "whisperlive_model_lock_wait_seconds", "Time spent waiting for SINGLE_MODEL_LOCK.",
+    ["backend"], buckets=_LATENCY_BUCKETS)
+VAD_SKIPPED_SECONDS = Counter(
+    "whisperlive_vad_skipped_audio_seconds_total",
+    "Audio in transcription windows skipped because the streaming VAD found no speech.",
+    ["backend"])
+CLIENT_BUFFER_SECONDS = Gauge(
+    "whisperlive_client_buffer_seconds",
+    "Seconds of buffered audio after the last completed segment, which the next pass has to transcribe, per client.",
+    ["client_uid"])
+
+REDIS_PUBLISH_SECONDS = Histogram(
+    "whisperlive_redis_publish_seconds", "Latency of one pipelined flush to Redis.",
+    buckets=_LATENCY_BUCKETS)
+REDIS_PUBLISH_FAILURES = Counter(
+    "whisperlive_redis_publish_failures_total", "Failed flushes (error) and messages rejected by Redis.",
+    ["reason"])
+REDIS_PUBLISH_QUEUE_DEPTH = Gauge(
+    "whisperlive_redis_publish_queue_depth", "Messages waiting to be published to Redis.")
+REDIS_PUBLISH_DROPPED = Counter(
+    "whisperlive_redis_publish_dropped_total", "Partial transcriptions dropped because the publish queue was full.")
+TRANSCRIPTION_LOG_DROPPED = Counter(
+    "whisperlive_transcription_log_dropped_total", "Transcription log records dropped because the log queue was full.")
+
+CLIENTS_CONNECTED = Gauge("whisperlive_clients_connected", "Currently connected clients.")
+CLIENTS_REJECTED = Counter(
+    "whisperlive_clients_rejected_total", "Connections turned away because the server was full.")
+
+
+def observe_inference(backend, window_s, elapsed_s):
+    """Records one transcription pass over `window_s` seconds of audio that took `elapsed_s`."""
+    INFERENCE_SECONDS.labels(backend).observe(elapsed_s)
+    AUDIO_WINDOW_SECONDS.labels(backend).observe(window_s)
+    if window_s > 0:
+        REALTIME_FACTOR.labels(backend).observe(elapsed_s / window_s)
+
+
+def remove_client(client_uid):
+    """Drops the per-client series of a disconnected client."""
+    try:
+        CLIENT_BUFFER_SECONDS.remove(client_uid)
+    except KeyError:
+        pass
+
+
+def render():
+    """Returns the exposition body and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
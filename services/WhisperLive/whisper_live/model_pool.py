@@ -0,0 +1,90 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+
+class ModelPool:
+    """
+    Hands a free model to each transcription request, bounding how many decodes run at once.
+
+    The pool holds a number of slots, each referring to a model. There are two ways to fill it:
+
+    * one model loaded with ``num_workers=K`` (ctranslate2 ``inter_threads``), which owns K internal
+      workers per device and runs concurrent ``generate`` calls in parallel while sharing one copy of
+      the weights; the pool then has ``K * len(device_index)`` slots pointing to that model.
+    * K independent replicas, spread round-robin over ``device_index``, one slot each. This costs K
+      copies of the weights but the replicas share nothing, not even ctranslate2's internal queue.
+
+    A request blocks in `acquire` until a slot is free, which replaces the single global model lock.
+    """
+
+    def __init__(self, models: List, slots_per_model: int = 1):
+        """
+        Args:
+            models (list): The loaded models.
+            slots_per_model (int): Number of requests each model may serve concurrently.
+        """
+        if not models:
+            raise ValueError("ModelPool needs at least one model")
+        self.models = list(models)
+        self.size = len(self.models) * slots_per_model
+        self._free = queue.Queue()
+        for _ in range(slots_per_model):
+            for model in self.models:
+                self._free.put(model)
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, factory: Callable[..., object], size: int = 1, replicas: bool = False,
+               device_index: Optional[List[int]] = None):
+        """
+        Loads the models of a pool.
+
+        Args:
+            factory (callable): Called as ``factory(device_index=..., num_workers=...)`` to load a model.
+            size (int): Number of concurrent decodes per device (shared model) or number of replicas.
+            replicas (bool): Load `size` independent replicas instead of one model with `size` workers.
+            device_index (list of int, optional): Devices to place the model(s) on. Defaults to [0].
+
+        Returns:
+            ModelPool: The pool.
+        """
+        device_index = list(device_index or [0])
+        size = max(1, int(size))
+        if replicas:
+            models = [factory(device_index=device_index[i % len(device_index)], num_workers=1)
+                      for i in range(size)]
+            logging.info(f"Model pool: loaded {size} replicas on devices {device_index}")
+            return cls(models, slots_per_model=1)
+        model = factory(device_index=device_index, num_workers=size)
+        logging.info(f"Model pool: loaded one model with {size} workers on devices {device_index}")
+        return cls([model], slots_per_model=size * len(device_index))
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Context manager yielding a free model and returning it to the pool on exit.
+
+        Raises:
+            TimeoutError: If no model became free within `timeout` seconds.
+        """
+        try:
+            model = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free model in the pool after {timeout}s") from None
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._free.put(model)
+
+    @property
+    def in_use(self) -> int:
+        """Number of slots currently handed out."""
+        return self._in_use
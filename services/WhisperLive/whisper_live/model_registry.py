@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+logger = logging.getLogger("transcription")
+
+
+def estimate_model_bytes(model) -> int:
+    """
+    Estimates the memory held by a loaded model from the size of its files on disk.
+
+    ctranslate2 keeps the weights in memory at the size they are stored with (or smaller when
+    quantized on load), so the size of the model directory is a good upper bound.
+    """
+    model_path = getattr(model, "model_path", None)
+    if not model_path or not os.path.isdir(model_path):
+        return 0
+    total = 0
+    for name in os.listdir(model_path):
+        path = os.path.join(model_path, name)
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+    return total
+
+
+class _Entry:
+    def __init__(self, model, size_bytes):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.refs = 0
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models, shared by all connections asking for the same model.
+
+    Models are keyed by a tuple such as (model, device, compute_type) and reference counted. A
+    model stays loaded after its last user releases it, so the next connection asking for it does
+    not reload the weights. When a memory budget is set, unreferenced models are evicted in least
+    recently used order until the resident size fits. Models that are in use are never evicted,
+    so the budget can be exceeded while they are needed.
+    """
+
+    def __init__(self, memory_budget_bytes: int = 0, size_estimator: Callable = estimate_model_bytes):
+        """
+        Args:
+            memory_budget_bytes (int): Maximum total size of loaded models, 0 for no limit.
+            size_estimator (callable): Returns the size in bytes of a loaded model.
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self.size_estimator = size_estimator
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable, loader: Callable[[], object]):
+        """
+        Returns the model for `key`, loading it with `loader()` if it is not resident.
+
+        Concurrent requests for a model that is being loaded wait for that load instead of loading
+        a second copy. Every call must be paired with a `release` of the returned model.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs += 1
+                    entry.last_used = time.time()
+                    self._entries.move_to_end(key)
+                    return entry.model
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = self._loading[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            start = time.time()
+            model = loader()
+            entry = _Entry(model, self.size_estimator(model))
+            entry.refs = 1
+            with self._lock:
+                self._entries[key] = entry
+                evicted = self._evict()
+                resident = self.resident_bytes
+        finally:
+            with self._lock:
+                del self._loading[key]
+            pending.set()
+
+        logger.info(f"MODEL_LOAD: key={key}, size_mb={entry.size_bytes / 2**20:.1f}, "
+                    f"load_s={time.time() - start:.2f}, resident_mb={resident / 2**20:.1f}")
+        self._log_evicted(evicted)
+        return model
+
+    def release(self, model):
+        """Drops one reference to `model`; it stays cached until evicted."""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if entry.model is model:
+                    entry.refs = max(0, entry.refs - 1)
+                    entry.last_used = time.time()
+                    # _evict walks the entries from least to most recently used
+                    self._entries.move_to_end(key)
+                    break
+            evicted = self._evict()
+        self._log_evicted(evicted)
+
+    @property
+    def resident_bytes(self) -> int:
+        """Total estimated size of the loaded models."""
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self) -> dict:
+        """Resident models with their reference counts and sizes, for the health endpoint."""
+        with self._lock:
+            return {
+                "resident_mb": round(self.resident_bytes / 2**20, 1),
+                "budget_mb": round(self.memory_budget_bytes / 2**20, 1) if self.memory_budget_bytes else None,
+                "models": [
+                    {
+                        "key": list(key) if isinstance(key, tuple) else key,
+                        "refs": entry.refs,
+                        "size_mb": round(entry.size_bytes / 2**20, 1),
+                        "idle_s": round(time.time() - entry.last_used, 1) if entry.refs == 0 else 0.0,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+    def _evict(self):
+        # caller holds self._lock
+        evicted = []
+        if not self.memory_budget_bytes:
+            return evicted
+        for key in list(self._entries):
+            if self.resident_bytes <= self.memory_budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs == 0:
+                del self._entries[key]
+                evicted.append((key, entry))
+        return evicted
+
+    def _log_evicted(self, evicted):
+        for key, entry in evicted:
+            logger.info(f"MODEL_EVICT: key={key}, size_mb={entry.size_bytes / 2**20:.1f}, "
+                        f"resident_mb={self.resident_bytes / 2**20:.1f}")
+        if self.memory_budget_bytes and self.resident_bytes > self.memory_budget_bytes:
+            logger.warning(f"MODEL_BUDGET: resident models use {self.resident_bytes / 2**20:.1f} MB, over the "
+                           f"{self.memory_budget_bytes / 2**20:.1f} MB budget, because they are all in use")
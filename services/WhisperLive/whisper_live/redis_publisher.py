@@ -0,0 +1,284 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Hashable, Optional
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from whisper_live import metrics
+
+# failures of the connection rather than of the messages; only these are retried
+RETRYABLE_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, TimeoutError)
+
+
+def encode_fields(fields: dict) -> dict:
+    """
+    Returns `fields` with values redis-py can pack: strings, bytes, ints and floats are kept, None,
+    bools, lists and dicts are JSON-encoded and anything else is converted with `str`.
+    """
+    encoded = {}
+    for key, value in fields.items():
+        if not isinstance(key, (str, bytes)):
+            key = str(key)
+        if isinstance(value, bool) or value is None or isinstance(value, (dict, list, tuple)):
+            value = json.dumps(value, default=str)
+        elif not isinstance(value, (str, bytes, int, float)):
+            value = str(value)
+        encoded[key] = value
+    return encoded
+
+
+class _Message:
+    __slots__ = ("stream_key", "fields", "session", "droppable", "dropped", "queued_at")
+
+    def __init__(self, stream_key, fields, session, droppable):
+        self.stream_key = stream_key
+        self.fields = fields
+        self.session = session
+        self.droppable = droppable
+        self.dropped = False
+        self.queued_at = time.monotonic()
+
+
+class RedisStreamPublisher:
+    """
+    Publishes messages to Redis streams from a background thread, so that a slow or unavailable
+    Redis never blocks the transcription threads.
+
+    Messages are queued and sent in batches with one pipelined round-trip of ``XADD ... MAXLEN ~``
+    per batch. A message is either droppable (a partial transcription, superseded by the next one
+    of its session) or not (completed segments and session events):
+
+    * a new droppable message replaces the pending droppable message of the same session;
+    * when the queue holds `max_queue` messages, the oldest droppable message is dropped to make
+      room, or the new message itself if it is droppable and there is none;
+    * non-droppable messages are always queued, even over `max_queue`, and are kept across
+      reconnects until Redis accepts them.
+
+    Messages are published in the order they were queued. Only connection failures are retried; a
+    message Redis or redis-py rejects is counted as failed and dropped on its own, without holding
+    up the rest of its batch.
+    """
+
+    def __init__(self, get_client: Callable[[], object], max_queue: int = 1000, batch_size: int = 100,
+                 maxlen: int = 0, retry_s: float = 1.0, name: str = "redis-publisher"):
+        """
+        Args:
+            get_client (callable): Returns the current redis client, or None while disconnected.
+            max_queue (int): Number of queued messages above which droppable messages are dropped.
+            batch_size (int): Maximum number of messages sent in one pipeline.
+            maxlen (int): Approximate maximum length the streams are trimmed to, 0 to not trim.
+            retry_s (float): Delay before retrying after a failed or impossible flush.
+        """
+        self.get_client = get_client
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.maxlen = maxlen or None
+        self.retry_s = retry_s
+        self.name = name
+
+        self._queue = deque()
+        self._live = 0
+        self._pending_partial = {}
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+        self.published = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_flush_s = 0.0
+
+    def start(self):
+        """Starts the publishing thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stops the publishing thread after it has tried to flush the queued messages."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def publish(self, stream_key: str, fields: dict, session: Optional[Hashable] = None,
+                droppable: bool = False) -> bool:
+        """
+        Queues `fields` to be added to `stream_key`.
+
+        Args:
+            stream_key (str): The stream to add the message to.
+            fields (dict): The stream entry. Values that are not strings or numbers are encoded with
+                `encode_fields`.
+            session (hashable, optional): Groups the droppable messages that supersede each other.
+            droppable (bool): Whether the message may be replaced by a newer one of its session or
+                dropped under backpressure.
+
+        Returns:
+            bool: False if the message was dropped right away because the queue is full.
+        """
+        message = _Message(stream_key, encode_fields(fields), session, droppable)
+        with self._cond:
+            if droppable:
+                previous = self._pending_partial.pop(session, None)
+                if previous is not None:
+                    self._discard(previous)
+                    self.coalesced += 1
+            if self._live >= self.max_queue:
+                victim = self._oldest_droppable()
+                if victim is not None:
+                    self._discard(victim)
+                    self._count_drop()
+                elif droppable:
+                    self._count_drop()
+                    return False
+                elif self._live == self.max_queue:
+                    logging.warning(f"{self.name}: {self._live} messages queued, Redis is not keeping up")
+            self._queue.append(message)
+            self._live += 1
+            if droppable:
+                self._pending_partial[session] = message
+            metrics.REDIS_PUBLISH_QUEUE_DEPTH.set(self._live)
+            self._cond.notify()
+        return True
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be published."""
+        return self._live
+
+    def stats(self) -> dict:
+        """Queue and flush statistics for the health endpoint."""
+        with self._cond:
+            oldest = next((m for m in self._queue if not m.dropped), None)
+            return {
+                "queue_depth": self._live,
+                "oldest_queued_s": round(time.monotonic() - oldest.queued_at, 3) if oldest else 0.0,
+                "last_flush_s": round(self.last_flush_s, 4),
+                "published": self.published,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+    def run(self):
+        """Publishing loop; sends the queued messages in batches until stopped."""
+        while True:
+            with self._cond:
+                while self._live == 0 and not self._stop:
+                    self._cond.wait()
+                if self._live == 0:
+                    return
+                stopping = self._stop
+
+            client = self.get_client()
+            if client is not None:
+                with self._cond:
+                    batch = self._take_batch()
+                unsent = self.flush(client, batch)
+                if not unsent:
+                    continue
+                self._requeue(unsent)
+            if stopping:
+                logging.warning(f"{self.name}: stopped with {self._live} unpublished messages")
+                return
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop, timeout=self.retry_s)
+
+    def flush(self, client, batch) -> list:
+        """
+        Sends `batch` in one pipeline on `client`.
+
+        redis-py packs the whole pipeline before sending it, so one message it cannot encode fails
+        the pipeline. The batch is then split in halves until the offending message is isolated
+        and counted as failed.
+
+        Returns:
+            list: The messages that were not sent because Redis could not be reached, to be retried.
+        """
+        start = time.perf_counter()
+        try:
+            pipe = client.pipeline(transaction=False)
+            for message in batch:
+                pipe.xadd(message.stream_key, message.fields, maxlen=self.maxlen, approximate=True)
+            results = pipe.execute(raise_on_error=False)
+        except RETRYABLE_ERRORS as e:
+            metrics.REDIS_PUBLISH_FAILURES.labels("error").inc()
+            logging.error(f"{self.name}: failed to publish {len(batch)} messages, will retry: {e}")
+            return batch
+        except Exception as e:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                unsent = self.flush(client, batch[:middle])
+                return unsent + batch[middle:] if unsent else self.flush(client, batch[middle:])
+            self.failed += 1
+            metrics.REDIS_PUBLISH_FAILURES.labels("rejected").inc()
+            logging.error(f"{self.name}: dropping a message to {batch[0].stream_key} that cannot be sent: {e}")
+            return []
+        finally:
+            self.last_flush_s = time.perf_counter() - start
+            metrics.REDIS_PUBLISH_SECONDS.observe(self.last_flush_s)
+
+        for message, result in zip(batch, results):
+            if isinstance(result, Exception) or not result:
+                # rejected by Redis itself, retrying would fail again
+                self.failed += 1
+                metrics.REDIS_PUBLISH_FAILURES.labels("rejected").inc()
+                logging.error(f"{self.name}: Redis rejected a message to {message.stream_key}: {result}")
+            else:
+                self.published += 1
+        return []
+
+    def _take_batch(self):
+        # caller holds self._cond
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            message = self._queue.popleft()
+            if message.dropped:
+                continue
+            if message.droppable and self._pending_partial.get(message.session) is message:
+                del self._pending_partial[message.session]
+            batch.append(message)
+        self._live -= len(batch)
+        metrics.REDIS_PUBLISH_QUEUE_DEPTH.set(self._live)
+        return batch
+
+    def _requeue(self, batch):
+        with self._cond:
+            for message in reversed(batch):
+                if message.droppable:
+                    if message.session in self._pending_partial:
+                        # a newer partial of the session was queued meanwhile
+                        self.coalesced += 1
+                        continue
+                    self._pending_partial[message.session] = message
+                self._queue.appendleft(message)
+                self._live += 1
+            metrics.REDIS_PUBLISH_QUEUE_DEPTH.set(self._live)
+
+    def _oldest_droppable(self):
+        # caller holds self._cond
+        while self._queue and self._queue[0].dropped:
+            self._queue.popleft()
+        for message in self._queue:
+            if message.droppable and not message.dropped:
+                return message
+        return None
+
+    def _discard(self, message):
+        # caller holds self._cond
+        message.dropped = True
+        self._live -= 1
+        if message.droppable and self._pending_partial.get(message.session) is message:
+            del self._pending_partial[message.session]
+
+    def _count_drop(self):
+        self.dropped += 1
+        metrics.REDIS_PUBLISH_DROPPED.inc()
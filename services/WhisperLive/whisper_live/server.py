@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 import threading
@@ -9,13 +10,29 @@ from typing import List, Optional
 import datetime
 import websocket
 import sys # Added sys import
+import signal
 
 import torch
 import numpy as np
 from websockets.sync.server import serve
 from websockets.exceptions import ConnectionClosed
-from whisper_live.vad import VoiceActivityDetector
-from whisper_live.transcriber import WhisperModel
+from whisper_live.vad import BatchedVADService, StreamingVoiceActivityDetector, VoiceActivityDetector
+from whisper_live import metrics
+from whisper_live.admission import AdmissionController
+from whisper_live.audio_buffer import AudioRingBuffer
+from whisper_live.audio_codec import INT16_SCALE, AudioDecoder, audio_encodings, create_audio_decoder
+from whisper_live.batching import FasterWhisperBatchScheduler, TensorRTBatchScheduler, TranscriptionRequest
+from whisper_live.checkpoint import SessionCheckpointStore
+from whisper_live.compute_type import ComputeTypeCache, select_compute_type
+from whisper_live.features import FeatureCache
+from whisper_live.language_cache import LanguageCache
+from whisper_live.model_pool import ModelPool
+from whisper_live.model_registry import ModelRegistry
+from whisper_live.redis_publisher import RedisStreamPublisher
+from whisper_live.streaming import LocalAgreement, TimedWord
+from whisper_live.transcription_log import configure_transcription_log
+from whisper_live.transcriber import WhisperModel, decode_audio
+from whisper_live.worker_pool import TranscriptionWorkerPool
 try:
     from whisper_live.transcriber_tensorrt import WhisperTRTLLM
     TENSORRT_AVAILABLE = True
@@ -35,17 +52,14 @@ import uuid
 # Setup basic logging
 logging.basicConfig(level=logging.INFO)
 
-# Add file logging for transcription data
-LOG_DIR = "transcription_logs"
-os.makedirs(LOG_DIR, exist_ok=True)
-log_filename = os.path.join(LOG_DIR, f"transcription_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-file_handler = logging.FileHandler(log_filename)
-file_handler.setLevel(logging.INFO)
-file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
+# Server events go to the console and, once TranscriptionServer.run configured it, to the
+# transcription log: JSON lines written by a background thread, see whisper_live.transcription_log
 logger = logging.getLogger("transcription")
 logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
+# transcribed segments only go to the transcription log
+segment_logger = logging.getLogger("transcription.segments")
+segment_logger.setLevel(logging.INFO)
+segment_logger.propagate = False
 
 class TranscriptionCollectorClient:
     """Client that maintains connection to Redis on a separate thread
@@ -81,6 +95,18 @@ class TranscriptionCollectorClient:
         
         # Track session_uids for which we've published session_start events
         self.session_starts_published = set()
+        # Completed segments in the last transcription queued per session_uid
+        self.completed_segments = {}
+        
+        # Messages are queued and published from a background thread, so that Redis latency
+        # or a reconnect never blocks the transcription threads
+        self.publisher = RedisStreamPublisher(
+            get_client=lambda: self.redis_client if self.is_connected else None,
+            max_queue=int(os.getenv("REDIS_PUBLISH_QUEUE_SIZE", "1000")),
+            batch_size=int(os.getenv("REDIS_PUBLISH_BATCH_SIZE", "100")),
+            maxlen=int(os.getenv("REDIS_STREAM_MAXLEN", "100000")),
+        )
+        self.publisher.start()
         
         # Connect on initialization 
         self.connect()
@@ -154,7 +180,8 @@ class TranscriptionCollectorClient:
             retry_delay = min(retry_delay * 2, max_retry_delay)
     
     def disconnect(self):
-        """Disconnect from Redis and stop the connection thread."""
+        """Flush the queued messages, disconnect from Redis and stop the connection thread."""
+        self.publisher.stop()
         with self.connection_lock:
             self.stop_requested = True
             self.is_connected = False
@@ -172,7 +199,7 @@ class TranscriptionCollectorClient:
             logging.info("Disconnected from Redis")
 
     def publish_session_start_event(self, token, platform, meeting_id, session_uid):
-        """Publish a session_start event to the Redis stream.
+        """Queue a session_start event for the Redis stream.
         
         Args:
             token: User's API token
@@ -181,155 +208,108 @@ class TranscriptionCollectorClient:
             session_uid: Unique identifier for this session
         
         Returns:
-            Boolean indicating success or failure
+            Boolean indicating whether the event was queued
         """
         if session_uid in self.session_starts_published:
             logging.debug(f"Session start already published for {session_uid}")
             return True
             
-        # Check connection
-        if not self.is_connected or not self.redis_client:
-            logging.warning("Cannot publish session_start: Not connected to Redis")
-            return False
-            
         # Validate required fields
         if not all([token, platform, meeting_id, session_uid]):
             logging.error("Missing required fields for session_start event")
             return False
             
-        try:
-            # Create event payload with ISO 8601 timestamp
-            now = datetime.datetime.utcnow()
-            timestamp_iso = now.isoformat() + "Z"
-            
-            payload = {
-                "type": "session_start",
-                "token": token,
-                "platform": platform,
-                "meeting_id": meeting_id,
-                "uid": session_uid,
-                "start_timestamp": timestamp_iso
-            }
-            
-            # Publish to Redis stream
-            message = {
-                "payload": json.dumps(payload)
-            }
-            
-            result = self.redis_client.xadd(
-                self.stream_key,
-                message
-            )
-            
-            if result:
-                logging.info(f"Published session_start event for session {session_uid}")
-                # Mark this session as having a published start event
-                self.session_starts_published.add(session_uid)
-                return True
-            else:
-                logging.error(f"Failed to publish session_start event for {session_uid}")
-                return False
-                
-        except Exception as e:
-            logging.error(f"Error publishing session_start event: {e}")
-            return False
+        # Create event payload with ISO 8601 timestamp
+        now = datetime.datetime.utcnow()
+        timestamp_iso = now.isoformat() + "Z"
+        
+        payload = {
+            "type": "session_start",
+            "token": token,
+            "platform": platform,
+            "meeting_id": meeting_id,
+            "uid": session_uid,
+            "start_timestamp": timestamp_iso
+        }
+        
+        # Queued ahead of the session's transcriptions, the publisher keeps the order
+        self.publisher.publish(self.stream_key, {"payload": json.dumps(payload)})
+        logging.info(f"Queued session_start event for session {session_uid}")
+        # Mark this session as having a published start event
+        self.session_starts_published.add(session_uid)
+        return True
+
+    def mark_session_started(self, session_uid):
+        """
+        Records that the session_start event of `session_uid` was already published, e.g. by another
+        instance before the session resumed here, so it is not published again.
+        """
+        self.session_starts_published.add(session_uid)
 
     def publish_speaker_event(self, event_data: dict):
-        """Publish a speaker_activity event to the new Redis stream.
+        """Queue a speaker_activity event for the speaker events Redis stream.
         
         Args:
             event_data: The payload from the Vexa Bot's speaker_activity message.
                         This includes uid, relative_client_timestamp_ms, participant_name, etc.
         
         Returns:
-            Boolean indicating success or failure
+            Boolean indicating whether the event was queued
         """
-        if not self.is_connected or not self.redis_client:
-            logging.warning(f"Cannot publish speaker event to {self.speaker_events_stream_key}: Not connected to Redis")
-            return False
-            
         if not event_data or not isinstance(event_data, dict):
             logging.error(f"Invalid event_data for publishing to {self.speaker_events_stream_key}")
             return False
 
-        try:
-            # Add server received timestamp
-            now = datetime.datetime.utcnow()
-            timestamp_iso = now.isoformat() + "Z"
-            
-            # Create a new dictionary for the Redis message to avoid modifying the original
-            redis_message_payload = event_data.copy()
-            redis_message_payload["server_received_timestamp_iso"] = timestamp_iso
-            
-            # Ensure all values in redis_message_payload are suitable for xadd
-            # (typically strings, numbers, or booleans)
-            # For simplicity, we assume the structure is already flat as per planstate.md
-            
-            result = self.redis_client.xadd(
-                self.speaker_events_stream_key,
-                redis_message_payload 
-            )
-            
-            if result:
-                uid = redis_message_payload.get('uid', 'N/A')
-                event_type = redis_message_payload.get('event_type', 'N/A')
-                logging.info(f"Published speaker event ({event_type}) for UID {uid} to {self.speaker_events_stream_key}")
-                return True
-            else:
-                uid = redis_message_payload.get('uid', 'N/A')
-                logging.error(f"Failed to publish speaker event for UID {uid} to {self.speaker_events_stream_key}")
-                return False
-                
-        except Exception as e:
-            uid = event_data.get('uid', 'N/A')
-            logging.error(f"Error publishing speaker event for UID {uid} to {self.speaker_events_stream_key}: {e}")
-            logging.error(f"Error publishing transcription: {e}")
-            return False
+        # Add server received timestamp
+        now = datetime.datetime.utcnow()
+        timestamp_iso = now.isoformat() + "Z"
+        
+        # Create a new dictionary for the Redis message to avoid modifying the original
+        redis_message_payload = event_data.copy()
+        redis_message_payload["server_received_timestamp_iso"] = timestamp_iso
+        
+        # Ensure all values in redis_message_payload are suitable for xadd
+        # (typically strings, numbers, or booleans)
+        # For simplicity, we assume the structure is already flat as per planstate.md
+        
+        self.publisher.publish(self.speaker_events_stream_key, redis_message_payload)
+        uid = redis_message_payload.get('uid', 'N/A')
+        event_type = redis_message_payload.get('event_type', 'N/A')
+        logging.info(f"Queued speaker event ({event_type}) for UID {uid} to {self.speaker_events_stream_key}")
+        return True
 
     def publish_session_end_event(self, token, platform, meeting_id, session_uid):
-        # ... (This method was in the original TranscriptionCollectorClient, ensure it's still there and correct)
-        # For brevity, not re-listing its full content if unchanged by this specific Phase 2 task.
-        # It should publish a message like: 
-        # payload = {
-        #     "type": "session_end",
-        #     "token": token, 
-        #     "platform": platform, 
-        #     "meeting_id": meeting_id, 
-        #     "uid": session_uid,
-        #     "end_timestamp": timestamp_iso 
-        # }
-        # to self.stream_key (transcription_segments stream)
-        if not self.is_connected or not self.redis_client:
-            logging.warning(f"Cannot publish session_end for UID {session_uid}: Not connected to Redis")
-            return False
-        try:
-            now = datetime.datetime.utcnow()
-            timestamp_iso = now.isoformat() + "Z"
-            payload = {
-                "type": "session_end",
-                "token": token,
-                "platform": platform,
-                "meeting_id": meeting_id,
-                "uid": session_uid,
-                "end_timestamp": timestamp_iso
-            }
-            message = {"payload": json.dumps(payload)}
-            result = self.redis_client.xadd(self.stream_key, message)
-            if result:
-                logging.info(f"Published session_end event for UID {session_uid} to {self.stream_key}")
-                # Remove from published starts if present, as session is now considered ended
-                if session_uid in self.session_starts_published:
-                    self.session_starts_published.remove(session_uid)
-                return True
-            else:
-                logging.error(f"Failed to publish session_end for UID {session_uid} to {self.stream_key}")
-                return False
-        except Exception as e:
-            logging.error(f"Error publishing session_end for UID {session_uid} to {self.stream_key}: {e}")
-            return False
+        """Queue a session_end event for the Redis stream (self.stream_key).
+
+        Returns:
+            Boolean indicating whether the event was queued
+        """
+        now = datetime.datetime.utcnow()
+        timestamp_iso = now.isoformat() + "Z"
+        payload = {
+            "type": "session_end",
+            "token": token,
+            "platform": platform,
+            "meeting_id": meeting_id,
+            "uid": session_uid,
+            "end_timestamp": timestamp_iso
+        }
+        self.publisher.publish(self.stream_key, {"payload": json.dumps(payload)})
+        logging.info(f"Queued session_end event for UID {session_uid} to {self.stream_key}")
+        # Remove from published starts if present, as session is now considered ended
+        self.session_starts_published.discard(session_uid)
+        self.completed_segments.pop(session_uid, None)
+        return True
 
     def send_transcription(self, token, platform, meeting_id, segments, session_uid=None):
-        """Send transcription segments to Redis stream (self.stream_key).
+        """Queue transcription segments for the Redis stream (self.stream_key).
+
+        Returns immediately; the background publisher sends the message. A full-window message
+        carries the most recent segments of the session, so one that does not complete any new
+        segment is superseded by the next one and may be coalesced or dropped under backpressure.
+        Delta updates (segments with an "id") are not snapshots: only a message holding nothing but
+        the text of an incomplete segment may be replaced, by a newer one for the same id. Messages
+        completing, revising or withdrawing a segment are always published.
         
         Args:
             token: User's API token
@@ -339,12 +319,8 @@ class TranscriptionCollectorClient:
             session_uid: Optional unique identifier for this session
             
         Returns:
-            Boolean indicating success or failure
+            Boolean indicating whether the message was queued
         """
-        if not self.is_connected or not self.redis_client:
-            logging.warning(f"Cannot send transcription to {self.stream_key}: Not connected to Redis")
-            return False
-            
         # segments can be an empty list (e.g. for an early session_end or empty audio), 
         # but other fields are required
         if not all([token, platform, meeting_id]): 
@@ -361,39 +337,40 @@ class TranscriptionCollectorClient:
         if session_uid not in self.session_starts_published:
             self.publish_session_start_event(token, platform, meeting_id, session_uid)
         
-        try:
-            payload = {
-                "type": "transcription", 
-                "token": token,
-                "platform": platform, 
-                "meeting_id": meeting_id,
-                "segments": segments, 
-                "uid": session_uid
-            }
-            
-            message = {
-                # Per current structure, the whole payload is JSON dumped into one field
-                "payload": json.dumps(payload) 
-            }
-            
-            result = self.redis_client.xadd(
-                self.stream_key, 
-                message
-            )
-            
-            if result:
-                logging.debug(f"Published transcription with {len(segments)} segments for UID {session_uid} to {self.stream_key}")
-                return True
-            else:
-                logging.error(f"Failed to publish transcription for UID {session_uid} to {self.stream_key}")
-                return False
-                
-        except Exception as e:
-            logging.error(f"Error publishing transcription for UID {session_uid} to {self.stream_key}: {e}")
-            return False
+        completed = {
+            (segment.get("start"), segment.get("end"), segment.get("text"))
+            for segment in segments if segment.get("completed")
+        }
+        droppable = completed <= self.completed_segments.get(session_uid, set())
+        self.completed_segments[session_uid] = completed
+        coalesce_key = session_uid
+        if any("id" in segment for segment in segments):
+            partial_only = len(segments) == 1 and not segments[0].get("completed") and segments[0].get("text")
+            droppable = droppable and bool(partial_only)
+            coalesce_key = (session_uid, segments[0]["id"]) if droppable else session_uid
+
+        payload = {
+            "type": "transcription", 
+            "token": token,
+            "platform": platform, 
+            "meeting_id": meeting_id,
+            "segments": segments, 
+            "uid": session_uid
+        }
+        
+        message = {
+            # Per current structure, the whole payload is JSON dumped into one field
+            "payload": json.dumps(payload) 
+        }
+        
+        queued = self.publisher.publish(self.stream_key, message, session=coalesce_key, droppable=droppable)
+        if queued:
+            logging.debug(f"Queued transcription with {len(segments)} segments for UID {session_uid} to {self.stream_key}")
+        return queued
 
 class ClientManager:
-    def __init__(self, max_clients=4, max_connection_time=3600):
+    def __init__(self, max_clients=4, max_connection_time=3600, admission=None, inference_slots=None,
+                 redirect_url=None):
         """
         Initializes the ClientManager with specified limits on client connections and connection durations.
 
@@ -401,11 +378,20 @@ class ClientManager:
             max_clients (int, optional): The maximum number of simultaneous client connections allowed. Defaults to 4.
             max_connection_time (int, optional): The maximum duration (in seconds) a client can stay connected. Defaults
                                                  to 600 seconds (10 minutes).
+            admission (AdmissionController, optional): Additionally refuses connections the node could not
+                                                       serve in real time, from live measurements.
+            inference_slots (callable, optional): Returns the number of transcriptions the node runs in
+                                                  parallel, used by `admission`. Defaults to 1.
+            redirect_url (str, optional): Endpoint refused clients are sent to with a REDIRECT message
+                                          instead of being told to WAIT.
         """
         self.clients = {}
         self.start_times = {}
         self.max_clients = max_clients
         self.max_connection_time = max_connection_time
+        self.admission = admission
+        self.inference_slots = inference_slots
+        self.redirect_url = redirect_url
 
     def add_client(self, websocket, client):
         """
@@ -417,6 +403,7 @@ class ClientManager:
         """
         self.clients[websocket] = client
         self.start_times[websocket] = time.time()
+        metrics.CLIENTS_CONNECTED.set(len(self.clients))
 
     def get_client(self, websocket):
         """
@@ -444,6 +431,7 @@ class ClientManager:
         if client:
             client.cleanup()
         self.start_times.pop(websocket, None)
+        metrics.CLIENTS_CONNECTED.set(len(self.clients))
 
     def get_wait_time(self):
         """
@@ -459,10 +447,24 @@ class ClientManager:
                 wait_time = current_client_time_remaining
         return wait_time / 60 if wait_time is not None else 0
 
+    def get_backlog_s(self):
+        """
+        Returns the total audio in seconds the connected clients received but did not transcribe yet.
+        """
+        backlog = 0
+        for client in list(self.clients.values()):
+            buffer = getattr(client, "audio_buffer", None)
+            if buffer is not None:
+                backlog += max(0, buffer.end_index - client.processed_end_index) / client.RATE
+        return backlog
+
     def is_server_full(self, websocket, options):
         """
         Checks if the server is at its maximum client capacity and sends a wait message to the client if necessary.
 
+        With an admission controller, a client is also refused when accepting it would push the node
+        past real time. Refused clients are told to WAIT, or to connect to `redirect_url` instead.
+
         Args:
             websocket: The websocket of the client attempting to connect.
             options: A dictionary of options that may include the client's unique identifier.
@@ -471,12 +473,29 @@ class ClientManager:
             True if the server is full, False otherwise.
         """
         if len(self.clients) >= self.max_clients:
-            wait_time = self.get_wait_time()
-            response = {"uid": options["uid"], "status": "WAIT", "message": wait_time}
-            websocket.send(json.dumps(response))
+            self.refuse_client(websocket, options, f"{len(self.clients)} clients connected")
             return True
+        if self.admission is not None:
+            slots = self.inference_slots() if self.inference_slots else 1
+            decision = self.admission.decide(len(self.clients), self.get_backlog_s(), slots)
+            if not decision.admit:
+                self.refuse_client(websocket, options, decision.reason)
+                return True
         return False
 
+    def refuse_client(self, websocket, options, reason):
+        """
+        Sends a refused client a REDIRECT message if a redirect endpoint is configured, a WAIT message
+        with the estimated wait time in minutes otherwise.
+        """
+        logging.warning(f"Refusing client {options.get('uid')}: {reason}")
+        if self.redirect_url:
+            response = {"uid": options["uid"], "status": "REDIRECT", "message": self.redirect_url, "reason": reason}
+        else:
+            response = {"uid": options["uid"], "status": "WAIT", "message": self.get_wait_time()}
+        websocket.send(json.dumps(response))
+        metrics.CLIENTS_REJECTED.inc()
+
     def is_client_timeout(self, websocket):
         """
         Checks if a client has exceeded the maximum allowed connection time and disconnects them if so, issuing a warning.
@@ -514,8 +533,20 @@ class BackendType(Enum):
         return self == BackendType.TENSORRT
 
 
+class WarmupWebSocket:
+    """Stands in for the websocket of the warmup sessions run before the server accepts clients."""
+
+    def send(self, message):
+        pass
+
+    def close(self):
+        pass
+
+
 class TranscriptionServer:
     RATE = 16000
+    # decodes binary messages that arrive before their client exists
+    DEFAULT_AUDIO_DECODER = AudioDecoder()
 
     def __init__(self):
         self.client_manager = None
@@ -538,7 +569,11 @@ class TranscriptionServer:
             logging.warning("REDIS_STREAM_URL not set. TranscriptionCollectorClient will not be initialized in TranscriptionServer.")
 
         self.is_healthy = False  # Represents WebSocket server readiness primarily
+        self.warmup_done = False  # /health reports not ready until the models are loaded and warm
+        self.warmup_stats = []
+        self.compute_type_probes = []
         self.health_server = None
+        self.transcription_log = None
         self.backend = None # Initialize backend attribute
 
         # Self-monitoring
@@ -555,8 +590,24 @@ class TranscriptionServer:
         """
         Initializes a client based on the backend type.
         """
+        client = self.create_client(websocket, options, faster_whisper_custom_model_path,
+                                    whisper_tensorrt_path, trt_multilingual)
+        self.client_manager.add_client(websocket, client)
+
+    def create_client(
+        self, websocket, options, faster_whisper_custom_model_path,
+        whisper_tensorrt_path, trt_multilingual, server_options=None
+    ):
+        """
+        Creates the client for a connection's handshake `options`, without registering it.
+
+        Args:
+            server_options (dict, optional): Overrides the server options the client is created with.
+        """
         if options is None:
             options = {}
+        if server_options is None:
+            server_options = self.server_options
         backend_str = options.get("backend", self.backend)
         backend = BackendType(backend_str)
         
@@ -575,7 +626,9 @@ class TranscriptionServer:
                 token=options.get("token"),
                 meeting_id=options.get("meeting_id"),
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=server_options,
+                delta_updates=bool(options.get("delta_updates", False)),
+                audio_encoding=options.get("audio_encoding", "float32")
             )
         # faster-whisper client
         else:
@@ -594,9 +647,11 @@ class TranscriptionServer:
                 token=options.get("token"),
                 meeting_id=options.get("meeting_id"),
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=server_options,
+                delta_updates=bool(options.get("delta_updates", False)),
+                audio_encoding=options.get("audio_encoding", "float32")
             )
-        self.client_manager.add_client(websocket, client)
+        return client
 
     def get_audio_from_websocket(self, websocket):
         """
@@ -609,8 +664,19 @@ class TranscriptionServer:
         Returns:
             A numpy array containing the audio, or False if END_OF_AUDIO, or None if control message processed.
         """
-        frame_data = websocket.recv()
-        
+        return self.parse_websocket_message(websocket, websocket.recv())
+
+    def parse_websocket_message(self, websocket, frame_data):
+        """
+        Turns one message received from a client into audio, dispatching JSON control messages.
+
+        Args:
+            websocket: The websocket the message was received on.
+            frame_data (bytes or str): The raw message.
+
+        Returns:
+            A numpy array containing the audio, or False if END_OF_AUDIO, or None if control message processed.
+        """
         # Handle END_OF_AUDIO signal
         if frame_data == b"END_OF_AUDIO":
             return False
@@ -650,9 +716,11 @@ class TranscriptionServer:
             # Not a JSON message, treat as binary audio data
             pass
         
-        # Process as binary audio data
+        # Process as binary audio data, in the encoding the client declared in its handshake
+        client = self.client_manager.get_client(websocket) if self.client_manager else None
+        decoder = client.audio_decoder if client else self.DEFAULT_AUDIO_DECODER
         try:
-            return np.frombuffer(frame_data, dtype=np.float32)
+            return decoder.decode(frame_data)
         except (ValueError, TypeError) as e:
             logging.error(f"Failed to process audio data: {e}")
             return None
@@ -699,6 +767,9 @@ class TranscriptionServer:
             if event == "LEAVING_MEETING":
                 # Handle graceful disconnect
                 logging.info(f"Bot signaled LEAVING_MEETING for session {session_uid}")
+                client = self.client_manager.get_client(websocket) if self.client_manager else None
+                if client:
+                    client.end_session()
                 # The connection will be closed by the bot, we just acknowledge
                 
         except Exception as e:
@@ -747,6 +818,28 @@ class TranscriptionServer:
         try:
             logging.info("New client connected")
             options = websocket.recv()
+        except ConnectionClosed:
+            logging.info("Connection closed by client")
+            return False
+        except Exception as e:
+            logging.error(f"Error during new connection initialization: {str(e)}")
+            return False
+        return self.setup_new_connection(websocket, options, faster_whisper_custom_model_path,
+                                         whisper_tensorrt_path, trt_multilingual)
+
+    def setup_new_connection(self, websocket, options, faster_whisper_custom_model_path,
+                             whisper_tensorrt_path, trt_multilingual):
+        """
+        Validates the handshake message of a new connection and creates its client.
+
+        Args:
+            websocket: The websocket of the new connection.
+            options (str): The raw JSON handshake message.
+
+        Returns:
+            bool: True if the client was created and the connection should continue.
+        """
+        try:
             logging.info(f"Received raw message from client: {options}")
             options = json.loads(options)
             
@@ -764,14 +857,24 @@ class TranscriptionServer:
                 }))
                 websocket.close()
                 return False
+
+            audio_encoding = options.get("audio_encoding", "float32")
+            if audio_encoding not in audio_encodings():
+                error_msg = f"Unsupported audio_encoding: {audio_encoding}, expected one of {', '.join(audio_encodings())}"
+                logging.error(error_msg)
+                websocket.send(json.dumps({
+                    "uid": options["uid"],
+                    "status": "ERROR",
+                    "message": error_msg
+                }))
+                websocket.close()
+                return False
                 
             # Log the connection with critical parameters
             logging.info(f"Connection parameters received: uid={options['uid']}, platform={options['platform']}, meeting_url={options['meeting_url']}, token={options['token']}, meeting_id={options['meeting_id']}")
 
             if self.client_manager is None:
-                max_clients = options.get('max_clients', 4)
-                max_connection_time = options.get('max_connection_time', 3600)
-                self.client_manager = ClientManager(max_clients, max_connection_time)
+                self.client_manager = self.create_client_manager(options)
 
             # FORCE VAD DISABLED - ignore client request
             self.use_vad = False  # Always disable VAD regardless of client request
@@ -796,11 +899,27 @@ class TranscriptionServer:
 
     def process_audio_frames(self, websocket):
         frame_np = self.get_audio_from_websocket(websocket)
+        return self.handle_audio_frame(websocket, frame_np)
+
+    def handle_audio_frame(self, websocket, frame_np, throttle=True):
+        """
+        Feeds a parsed message into the client of `websocket`.
+
+        Args:
+            websocket: The websocket the message was received on.
+            frame_np: The result of `parse_websocket_message`.
+            throttle (bool): Let voice activity detection sleep after sustained silence. Must be False
+                when called from an event loop.
+
+        Returns:
+            bool: False once the client signalled END_OF_AUDIO, True otherwise.
+        """
         client = self.client_manager.get_client(websocket)
         
         # Handle different return values from get_audio_from_websocket
         if frame_np is False:
             # END_OF_AUDIO received
+            client.end_session()
             if self.backend.is_tensorrt():
                 client.set_eos(True)
             return False
@@ -809,7 +928,7 @@ class TranscriptionServer:
             return True
 
         if self.backend.is_tensorrt():
-            voice_active = self.voice_activity(websocket, frame_np)
+            voice_active = self.voice_activity(websocket, frame_np, throttle=throttle)
             if voice_active:
                 self.no_voice_activity_chunks = 0
                 client.set_eos(False)
@@ -855,6 +974,11 @@ class TranscriptionServer:
             server_options=None):
         """
         Run the transcription server.
+
+        With `server_options["async_mode"]` set, connections are served by the asyncio front-end in
+        `whisper_live.async_server` instead of one thread per connection. Otherwise, with
+        `server_options["transcription_workers"]` set, the transcription passes of all connections
+        run on a fixed `TranscriptionWorkerPool` instead of one transcription thread per connection.
         """
         self.backend = BackendType(backend)
         self.faster_whisper_custom_model_path = faster_whisper_custom_model_path
@@ -862,6 +986,9 @@ class TranscriptionServer:
         self.trt_multilingual = trt_multilingual
         self.single_model = single_model
         self.server_options = server_options or {}
+        if self.server_options.get("async_mode"):
+            # the event loop schedules transcription passes, clients must not start their own threads
+            self.server_options = dict(self.server_options, transcription_thread=False)
 
         # For the health check, we need to know if Redis is being used.
         # This is inferred from the presence of the REDIS_STREAM_URL env var.
@@ -869,8 +996,36 @@ class TranscriptionServer:
         if redis_url_for_health_check:
             self.start_health_check_server(host, 9091)
 
+        if self.server_options.get("transcription_log", True) and self.transcription_log is None:
+            self.transcription_log = configure_transcription_log(
+                ("transcription", "transcription.segments"),
+                log_dir=self.server_options.get("transcription_log_dir", "transcription_logs"),
+                rotation=self.server_options.get("transcription_log_rotation", "size"),
+                max_bytes=int(self.server_options.get("transcription_log_max_mb", 50) * 2 ** 20),
+                when=self.server_options.get("transcription_log_when", "midnight"),
+                backup_count=self.server_options.get("transcription_log_backups", 5),
+                queue_size=self.server_options.get("transcription_log_queue_size", 10000),
+            )
         logger.info(f"SERVER_START: host={host}, port={port}, backend={self.backend.value}, single_model={single_model}")
-        
+        self.start_checkpoint_store()
+        if ServeClientBase.CHECKPOINT_STORE is not None and threading.current_thread() is threading.main_thread():
+            # rolling deploys and node drains stop the container with SIGTERM
+            signal.signal(signal.SIGTERM, self.handle_sigterm)
+        self.preload_models()
+        self.start_worker_pool()
+
+        if self.server_options.get("async_mode"):
+            from whisper_live.async_server import AsyncTranscriptionFrontend
+            frontend = AsyncTranscriptionFrontend(
+                self,
+                max_workers=self.server_options.get("inference_workers", 4),
+                faster_whisper_custom_model_path=faster_whisper_custom_model_path,
+                whisper_tensorrt_path=whisper_tensorrt_path,
+                trt_multilingual=trt_multilingual,
+            )
+            asyncio.run(frontend.serve(host, port))
+            return
+
         with serve(
             functools.partial(
                 self.recv_audio,
@@ -884,16 +1039,253 @@ class TranscriptionServer:
         ) as server:
             self.is_healthy = True # WebSocket server is up
             logger.info(f"SERVER_RUNNING: WhisperLive server running on {host}:{port} with health check on {host}:9091/health")
-            
-            # Start self-monitoring thread
-            if self.self_monitor_thread is None:
-                self._stop_self_monitor.clear()
-                self.self_monitor_thread = threading.Thread(target=self._self_monitor, daemon=True)
-                self.self_monitor_thread.start()
-                logger.info(f"SELF_MONITOR: Started self-monitoring thread. Interval: {self.health_monitor_interval}s, Max Streak: {self.max_unhealthy_streak}")
-
+            self.start_self_monitor()
             server.serve_forever()
 
+    def start_worker_pool(self):
+        """
+        Starts the shared transcription workers that new clients register with, unless the
+        `transcription_workers` server option is 0 or the async front-end schedules the passes.
+        """
+        workers = self.server_options.get("transcription_workers", 0)
+        if not workers or self.server_options.get("async_mode") or ServeClientBase.WORKER_POOL is not None:
+            return
+        pool = TranscriptionWorkerPool(
+            num_workers=workers,
+            backlog_weight=self.server_options.get("worker_backlog_weight", 1.0),
+            idle_timeout_s=ServeClientBase.WAKEUP_TIMEOUT_S,
+        )
+        pool.start()
+        ServeClientBase.WORKER_POOL = pool
+
+    def start_checkpoint_store(self):
+        """
+        Starts writing session checkpoints to the Redis the transcriptions are published to, so the
+        sessions of this instance can resume on any instance. Requires REDIS_STREAM_URL.
+        """
+        if not self.server_options.get("session_checkpoint", True) or self.collector_client is None:
+            return
+        collector = self.collector_client
+        store = SessionCheckpointStore(
+            get_client=lambda: collector.redis_client if collector.is_connected else None,
+            ttl_s=self.server_options.get("checkpoint_ttl_s", 300),
+            interval_s=self.server_options.get("checkpoint_interval_s", 5.0),
+            max_audio_s=self.server_options.get("checkpoint_max_audio_s", 10.0),
+            max_segments=self.server_options.get("checkpoint_max_segments", 50),
+        )
+        store.start()
+        ServeClientBase.CHECKPOINT_STORE = store
+
+    def handle_sigterm(self, signum, frame):
+        """Checkpoints the connected sessions and exits."""
+        logging.info("Received SIGTERM, checkpointing sessions before exiting")
+        self.is_healthy = False
+        self.checkpoint_sessions()
+        sys.exit(0)
+
+    def checkpoint_sessions(self):
+        """Writes a final checkpoint of every connected session, e.g. before the process exits."""
+        store = ServeClientBase.CHECKPOINT_STORE
+        if store is None:
+            return
+        clients = list(self.client_manager.clients.values()) if self.client_manager else []
+        for client in clients:
+            client.cleanup()
+        deadline = time.monotonic() + 10
+        for client in clients:
+            thread = getattr(client, "trans_thread", None)
+            if thread is not None:
+                # the thread finishes its pass and writes the last checkpoint on its way out
+                thread.join(max(0.0, deadline - time.monotonic()))
+            elif client.worker_pool is not None:
+                # likewise a worker, once the pass in progress is done
+                client.worker_pool.wait(client, max(0.0, deadline - time.monotonic()))
+            else:
+                client.save_checkpoint(force=True)
+        store.stop()
+        logging.info(f"Checkpointed {len(clients)} sessions: {store.stats()}")
+
+    def create_client_manager(self, options):
+        """
+        Creates the client manager when the first client connects.
+
+        The connection limit comes from the `max_clients` server option, or else from the first
+        client's handshake. With the "capacity" admission mode, new connections are additionally
+        refused once the measured real-time factor says the node would fall behind; there is no
+        static limit then unless `max_clients` is set on the server.
+        """
+        capacity = self.server_options.get("admission_mode", "static") == "capacity"
+        max_clients = self.server_options.get("max_clients") or (
+            float("inf") if capacity else options.get('max_clients', 4))
+        max_connection_time = self.server_options.get("max_connection_time") or \
+            options.get('max_connection_time', 3600)
+        admission = None
+        if capacity:
+            admission = AdmissionController(
+                max_load=self.server_options.get("admission_max_load", 0.8),
+                max_backlog_s=self.server_options.get("admission_max_backlog_s", 2.0),
+                window_s=self.server_options.get("admission_window_s", 60),
+            )
+            ServeClientBase.ADMISSION_CONTROLLER = admission
+            logger.info(f"ADMISSION: capacity mode, max_load={admission.max_load}, "
+                        f"max_backlog_s={admission.max_backlog_s}, max_clients={max_clients}")
+        return ClientManager(max_clients, max_connection_time, admission=admission,
+                             inference_slots=self.inference_slots,
+                             redirect_url=self.server_options.get("redirect_url") or None)
+
+    def inference_slots(self) -> int:
+        """Number of transcriptions the node runs in parallel."""
+        if self.backend is not None and self.backend.is_tensorrt():
+            if ServeClientTensorRT.BATCH_SCHEDULER is not None:
+                return ServeClientTensorRT.BATCH_SCHEDULER.max_batch_size
+            return 1
+        if ServeClientFasterWhisper.MODEL_POOL is not None:
+            return ServeClientFasterWhisper.MODEL_POOL.size
+        if ServeClientFasterWhisper.BATCH_SCHEDULER is not None:
+            # a batch costs more than one window, so this is an upper bound
+            return ServeClientFasterWhisper.BATCH_SCHEDULER.max_batch_size
+        return 1
+
+    def models_to_preload(self) -> List[str]:
+        """
+        Models loaded at startup: the custom model, the `preload_models` and the `final_model` server
+        options for faster_whisper, the TensorRT engine when it is shared by all connections.
+        """
+        if self.backend.is_tensorrt():
+            # without single model mode every connection builds its own engine
+            return [self.whisper_tensorrt_path] if self.single_model and self.whisper_tensorrt_path else []
+        models = [self.faster_whisper_custom_model_path] if self.faster_whisper_custom_model_path else []
+        models += self.server_options.get("preload_models") or []
+        if self.server_options.get("final_model"):
+            models.append(self.server_options["final_model"])
+        return list(dict.fromkeys(models))
+
+    def preload_models(self):
+        """
+        Loads the configured models and warms them up before the server accepts connections.
+
+        Each model is loaded through a warmup session created like a client's, so it ends up where
+        clients look for it (the single model, model pool, batch scheduler or model registry). The
+        session then transcribes `warmup_audio` `warmup_steps` times, which compiles and caches the
+        inference kernels. Load time, first inference latency and warmup time are logged per model.
+        `warmup_done` is set at the end, also when a model failed to load, and gates `/health`.
+        """
+        models = self.models_to_preload() if self.server_options.get("warmup", True) else []
+        if models:
+            warmup_audio = self.server_options.get("warmup_audio", "assets/jfk.flac")
+            steps = max(1, self.server_options.get("warmup_steps", 3))
+            # warmup sessions never start a transcription thread nor touch the language cache or checkpoints
+            server_options = dict(self.server_options, transcription_thread=False, language_cache=False,
+                                  vad_mode="off", session_checkpoint=False)
+            try:
+                audio = decode_audio(warmup_audio, sampling_rate=self.RATE)
+            except Exception as e:
+                logging.error(f"Failed to read warmup audio {warmup_audio}: {e}")
+                audio = None
+            probe = (self.backend.is_faster_whisper() and not torch.cuda.is_available()
+                     and self.server_options.get("cpu_compute_type", "auto") == "auto")
+            for model in models:
+                if probe:
+                    self.probe_compute_type(model)
+                if audio is not None:
+                    self.warmup_model(model, audio, steps, server_options)
+        self.warmup_done = True
+
+    def probe_compute_type(self, model):
+        """
+        Picks the CPU compute type of `model` clients load it with, see `select_compute_type`.
+
+        The model is benchmarked in every CPU compute type ctranslate2 supports on this host on
+        `compute_type_probe_audio`, and the fastest one whose word error rate against
+        `compute_type_probe_reference` is within `compute_type_wer_tolerance` of the best is kept
+        in `ServeClientFasterWhisper.COMPUTE_TYPES`. The choice is cached in `compute_type_cache`
+        so later restarts skip the benchmark.
+        """
+        audio_path = self.server_options.get("compute_type_probe_audio", "assets/jfk.flac")
+        reference_path = self.server_options.get("compute_type_probe_reference", "assets/jfk.txt")
+        cache_path = self.server_options.get("compute_type_cache", "~/.cache/whisper-live/compute_types.json")
+        cpu_threads = self.server_options.get("cpu_threads", 0)
+
+        def load_model(compute_type):
+            return WhisperModel(model, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads,
+                                local_files_only=False)
+
+        def transcribe(whisper_model, audio):
+            segments, _ = whisper_model.transcribe(audio, language="en", vad_filter=False)
+            return " ".join(segment.text for segment in segments)
+
+        started = time.perf_counter()
+        try:
+            audio = decode_audio(audio_path, sampling_rate=self.RATE)
+            with open(reference_path, "r", encoding="utf-8") as f:
+                reference = f.read()
+            result = select_compute_type(
+                model, load_model, transcribe, audio, reference,
+                cache=ComputeTypeCache(cache_path) if cache_path else None,
+                wer_tolerance=self.server_options.get("compute_type_wer_tolerance", 0.02))
+        except Exception as e:
+            logging.error(f"COMPUTE_TYPE_PROBE: failed to probe {model}: {e}")
+            self.compute_type_probes.append({"model": model, "error": str(e)})
+            return
+        if result is None:
+            logging.error(f"COMPUTE_TYPE_PROBE: no compute type could run {model}, using the default")
+            self.compute_type_probes.append({"model": model, "error": "no compute type could run the model"})
+            return
+
+        ServeClientFasterWhisper.COMPUTE_TYPES[model] = result["compute_type"]
+        self.compute_type_probes.append(result)
+        measured = ", ".join(f"{r['compute_type']}={r['inference_s']}s/wer={r['wer']}"
+                             for r in result["results"] if "wer" in r)
+        logger.info(f"COMPUTE_TYPE_PROBE: model={model}, compute_type={result['compute_type']}, "
+                    f"cached={result['cached']}, probe_s={time.perf_counter() - started:.1f}, {measured}")
+
+    def warmup_model(self, model, audio, steps, server_options):
+        """Loads `model` through a warmup session and transcribes `audio` with it `steps` times."""
+        # multilingual faster_whisper models also warm up language detection
+        options = {"uid": f"warmup-{model}", "model": model,
+                   "language": "en" if self.backend.is_tensorrt() else None}
+        started = time.perf_counter()
+        try:
+            client = self.create_client(
+                WarmupWebSocket(), options, self.faster_whisper_custom_model_path,
+                self.whisper_tensorrt_path, self.trt_multilingual, server_options=server_options)
+            if getattr(client, "transcriber", None) is None:
+                raise RuntimeError("the model could not be loaded")
+            load_s = time.perf_counter() - started
+
+            timings = []
+            for _ in range(steps):
+                step_start = time.perf_counter()
+                result = client.transcribe_audio(audio)
+                if self.backend.is_faster_whisper() and result is not None:
+                    list(result)    # segments are decoded lazily
+                timings.append(time.perf_counter() - step_start)
+            client.cleanup()
+        except Exception as e:
+            logging.error(f"MODEL_WARMUP: failed to load and warm up {model}: {e}")
+            self.warmup_stats.append({"model": model, "error": str(e)})
+            return
+
+        stats = {
+            "model": model,
+            "load_s": round(load_s, 3),
+            "first_inference_s": round(timings[0], 3),
+            "warmup_s": round(sum(timings), 3),
+            "last_inference_s": round(timings[-1], 3),
+        }
+        self.warmup_stats.append(stats)
+        logger.info(f"MODEL_WARMUP: model={model}, load_s={stats['load_s']}, "
+                    f"first_inference_s={stats['first_inference_s']}, warmup_s={stats['warmup_s']}, "
+                    f"last_inference_s={stats['last_inference_s']}, steps={steps}")
+
+    def start_self_monitor(self):
+        """Starts the self-monitoring thread once the WebSocket server is up."""
+        if self.self_monitor_thread is None:
+            self._stop_self_monitor.clear()
+            self.self_monitor_thread = threading.Thread(target=self._self_monitor, daemon=True)
+            self.self_monitor_thread.start()
+            logger.info(f"SELF_MONITOR: Started self-monitoring thread. Interval: {self.health_monitor_interval}s, Max Streak: {self.max_unhealthy_streak}")
+
     def _self_monitor(self):
         """Periodically checks internal health and exits if persistently unhealthy."""
         while not self._stop_self_monitor.is_set():
@@ -972,7 +1364,13 @@ class TranscriptionServer:
             except Exception as e:
                 logging.error(f"Self-monitor: Error shutting down HTTP health_server: {e}", exc_info=True)
         
-        # 4. Disconnect the Redis collector client
+        # 4. Checkpoint the connected sessions, so their clients resume on another instance
+        try:
+            self.checkpoint_sessions()
+        except Exception as e:
+            logging.error(f"Self-monitor: Error checkpointing sessions: {e}", exc_info=True)
+
+        # 5. Disconnect the Redis collector client
         if self.collector_client:
             try:
                 logging.info("Self-monitor: Disconnecting TranscriptionCollectorClient...")
@@ -981,14 +1379,14 @@ class TranscriptionServer:
             except Exception as e:
                 logging.error(f"Self-monitor: Error disconnecting collector_client: {e}", exc_info=True)
 
-        # 5. TODO: Add cleanup for active WebSocket client connections if possible.
+        # 6. TODO: Add cleanup for active WebSocket client connections if possible.
         # This is complex as `server.serve_forever()` blocks the main thread.
         # Options: server.shutdown() if available, or rely on process exit for now.
 
         logging.critical("Self-monitor: Graceful shutdown attempt complete. Exiting process with code 1.")
         sys.exit(1) # Exit the process
 
-    def voice_activity(self, websocket, frame_np):
+    def voice_activity(self, websocket, frame_np, throttle=True):
         """
         Evaluates the voice activity in a given audio frame and manages the state of voice activity detection.
 
@@ -1002,19 +1400,23 @@ class TranscriptionServer:
                     from the client manager for state management.
             frame_np (numpy.ndarray): The audio frame to be analyzed. This should be a NumPy array containing
                                     the audio data for the current frame.
+            throttle (bool): Sleep briefly after sustained silence. Disabled by the async server.
 
         Returns:
             bool: True if voice activity is detected in the current frame, False otherwise. When returning False
                 after detecting no voice activity for more than three consecutive frames, it also triggers the
                 end-of-speech (EOS) flag for the client.
         """
+        if frame_np.dtype == np.int16:
+            frame_np = frame_np * np.float32(INT16_SCALE)
         if not self.vad_detector(frame_np):
             self.no_voice_activity_chunks += 1
             if self.no_voice_activity_chunks > 3:
                 client = self.client_manager.get_client(websocket)
                 if not client.eos:
                     client.set_eos(True)
-                time.sleep(0.1)    # Sleep 100m; wait some voice activity.
+                if throttle:
+                    time.sleep(0.1)    # Sleep 100m; wait some voice activity.
             return False
         return True
 
@@ -1043,6 +1445,15 @@ class TranscriptionServer:
                 super().__init__(*args, **kwargs)
             
             def do_GET(self):
+                if self.path == '/metrics':
+                    # Prometheus scrape; served before the Redis ping so scrapes stay cheap
+                    body, content_type = metrics.render()
+                    self.send_response(200)
+                    self.send_header('Content-type', content_type)
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
                 server_websocket_healthy = self.transcription_server_instance.is_healthy
                 
                 redis_healthy = False
@@ -1067,14 +1478,17 @@ class TranscriptionServer:
                     else: # redis_collector exists but its redis_client is None
                         redis_ping_error = "redis_collector.redis_client is None (implies not connected or error in worker)"
                 
+                warmup_done = self.transcription_server_instance.warmup_done
                 if self.path == '/health':
-                    if server_websocket_healthy and redis_healthy:
+                    if server_websocket_healthy and redis_healthy and warmup_done:
                         self.send_response(200)
                         self.send_header('Content-type', 'text/plain')
                         self.end_headers()
                         self.wfile.write(b'OK')
                     else:
                         unhealthy_reasons = []
+                        if not warmup_done:
+                            unhealthy_reasons.append("Model warmup in progress")
                         if not server_websocket_healthy:
                             unhealthy_reasons.append("WebSocket server not ready")
                         if not redis_healthy:
@@ -1085,6 +1499,29 @@ class TranscriptionServer:
                         self.send_header('Content-type', 'text/plain')
                         self.end_headers()
                         self.wfile.write(f"Service Unavailable: {', '.join(unhealthy_reasons)}".encode('utf-8'))
+                elif self.path == '/stats':
+                    # per-client idle/busy time of the transcription threads
+                    client_manager = self.transcription_server_instance.client_manager
+                    clients = list(client_manager.clients.values()) if client_manager else []
+                    registry = ServeClientFasterWhisper.MODEL_REGISTRY
+                    language_cache = ServeClientFasterWhisper.LANGUAGE_CACHE
+                    body = json.dumps({
+                        "clients": [client.get_activity_stats() for client in clients],
+                        "models": registry.stats() if registry else None,
+                        "language_cache": language_cache.stats() if language_cache else None,
+                        "warmup": self.transcription_server_instance.warmup_stats,
+                        "compute_type": self.transcription_server_instance.compute_type_probes,
+                        "admission": client_manager.admission.stats() if client_manager and client_manager.admission else None,
+                        "checkpoints": ServeClientBase.CHECKPOINT_STORE.stats() if ServeClientBase.CHECKPOINT_STORE else None,
+                        "worker_pool": ServeClientBase.WORKER_POOL.stats() if ServeClientBase.WORKER_POOL else None,
+                        "transcription_log": self.transcription_server_instance.transcription_log.stats()
+                        if self.transcription_server_instance.transcription_log else None,
+                        "redis_publisher": self.redis_collector.publisher.stats() if self.redis_collector else None,
+                    })
+                    self.send_response(200)
+                    self.send_header('Content-type', 'application/json')
+                    self.end_headers()
+                    self.wfile.write(body.encode('utf-8'))
                 else:
                     self.send_response(404)
                     self.send_header('Content-type', 'text/plain')
@@ -1221,11 +1658,24 @@ class ServeClientBase(object):
     RATE = 16000
     SERVER_READY = "SERVER_READY"
     DISCONNECT = "DISCONNECT"
+    # upper bound on how long the transcription thread sleeps without being signalled
+    WAKEUP_TIMEOUT_S = 1.0
+    # "backend" label of the inference metrics, set by the subclasses
+    BACKEND = None
+    # measures the cost of the passes of all connections, set by TranscriptionServer in capacity admission mode
+    ADMISSION_CONTROLLER = None
+    # writes the session snapshots a reconnecting session resumes from, set by TranscriptionServer
+    CHECKPOINT_STORE = None
+    # batched streaming VAD shared by all connections, created by the first one that needs it
+    VAD_SERVICE = None
+    VAD_SERVICE_LOCK = threading.Lock()
+    # shared transcription threads replacing the per-client thread, set by TranscriptionServer
+    WORKER_POOL = None
 
     def __init__(self, websocket, language="en", task="transcribe", client_uid=None, 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
-                 server_options: Optional[dict] = None):
+                 server_options: Optional[dict] = None, delta_updates=False, audio_encoding="float32"):
         self.websocket = websocket
         self.language = language
         self.task = task
@@ -1235,6 +1685,8 @@ class ServeClientBase(object):
         self.token = token
         self.meeting_id = meeting_id
         self.collector_client = collector_client_ref # Store the passed collector client
+        # decodes the binary messages of this connection, see whisper_live.audio_codec
+        self.audio_decoder = create_audio_decoder(audio_encoding)
         
         # Restore all the original instance variables that were deleted
         self.transcription_buffer = TranscriptionBuffer(self.client_uid)
@@ -1242,8 +1694,6 @@ class ServeClientBase(object):
         self.is_multilingual = True
         self.frames = b""
         self.timestamp_offset = 0.0
-        self.frames_np = None
-        self.frames_offset = 0.0
         self.text = []
         self.current_out = ''
         self.prev_out = ''
@@ -1252,21 +1702,77 @@ class ServeClientBase(object):
         self.same_output_count = 0
 
         server_options = server_options or {}
+        self.min_audio_s = server_options.get("min_audio_s", 1.0)
+        self.use_transcription_thread = server_options.get("transcription_thread", True)
+        self.worker_pool = None     # the shared pool running the passes instead of trans_thread, if any
         self.max_buffer_s = server_options.get("max_buffer_s", 45)
-        self.discard_buffer_s = server_options.get("discard_buffer_s", 30)
         self.clip_if_no_segment_s = server_options.get("clip_if_no_segment_s", 25)
         self.clip_retain_s = server_options.get("clip_retain_s", 5)
 
+        # streaming VAD only gates transcription passes, see skip_silence
+        self.vad = None
+        if server_options.get("vad_mode", "off") == "streaming":
+            self.vad = StreamingVoiceActivityDetector(
+                threshold=server_options.get("vad_onset", 0.5),
+                preroll_s=server_options.get("vad_preroll_s", 0.3),
+                hangover_s=server_options.get("vad_hangover_s", 0.5),
+                frame_rate=self.RATE,
+                service=self.get_vad_service(server_options))
+        self.skipped_passes = 0
+
         self.show_prev_out_thresh = server_options.get("show_prev_out_thresh_s", 5)   # if pause(no output from whisper) show previous output for 5 seconds
         self.add_pause_thresh = server_options.get("add_pause_thresh_s", 3)       # add a blank to segment list as a pause(no speech) for 3 seconds
         self.transcript = []
         self.send_last_n_segments = 10
 
+        # with delta updates, only segments that are new or changed since the last message are sent,
+        # each with a stable "id" (its index in the transcript) and a "revision"
+        self.delta_updates = delta_updates
+        self.segments_sent = 0      # transcript entries already sent as completed
+        self.sent_partial = None    # (id, revision, segment) of the incomplete segment last sent
+        # two-tier mode: completed segments are re-decoded by a second model and sent again, see
+        # ServeClientFasterWhisper.request_final_decode
+        self.final_decodes = {}     # transcript id -> future of the re-decode
+        self.segment_revisions = {}     # transcript id -> revision sent, for segments awaiting a re-decode
+        self.revised_segments = []  # ids of sent segments whose text changed since
+
+        # the transcription log gets every completed segment once and a sample of the partials
+        self.log_completed_only = server_options.get("transcription_log_completed_only", False)
+        self.log_partial_every = server_options.get("transcription_log_partial_every", 10)
+        self.partials_seen = 0
+
         # text formatting
         self.pick_previous_segments = 2
 
+        # audio is kept in a fixed-size ring buffer addressed by absolute sample index,
+        # so appending a frame never copies the retained audio
+        self.audio_buffer = AudioRingBuffer(int(self.max_buffer_s * self.RATE))
+
+        # audio after timestamp_offset, updated with every frame so it keeps growing while a client falls behind
+        self.buffer_gauge = metrics.CLIENT_BUFFER_SECONDS.labels(self.client_uid)
+
         # threading
         self.lock = threading.Lock()
+        # signalled by add_frames and cleanup, so the transcription thread sleeps until there is work
+        self.audio_available = threading.Condition(self.lock)
+        self.processed_end_index = 0    # audio_buffer.end_index when the last chunk was taken
+        self.chunk_start_index = 0      # sample index of the first sample of the last chunk taken
+        self.pass_audio_s = 0.0         # new audio in the last chunk taken, in seconds
+        self.pass_wait_s = 0.0          # time the current pass waited for the model
+        self.idle_time = 0.0            # seconds the transcription thread spent waiting for audio
+        self.busy_time = 0.0            # seconds spent transcribing
+        self.transcription_passes = 0
+        self.idle_since = time.monotonic()
+        self.last_audio_at = time.monotonic()   # when the client last sent audio
+
+        # the state of a session with this uid that ran on this or another instance, see restore_checkpoint
+        self.checkpoint_store = self.CHECKPOINT_STORE if server_options.get("session_checkpoint", True) else None
+        self.last_checkpoint_at = time.monotonic()
+        self.session_ended = False
+        self.checkpoint = self.checkpoint_store.load(self.client_uid) if self.checkpoint_store else None
+        if self.checkpoint is not None:
+            self.restore_checkpoint(self.checkpoint)
+        self.segments_logged = len(self.transcript)    # transcript entries already in the transcription log
         
         # Send SERVER_READY message
         ready_message = json.dumps({"status": self.SERVER_READY, "uid": self.client_uid})
@@ -1275,48 +1781,338 @@ class ServeClientBase(object):
         
         # Use the instance's self.collector_client
         if self.collector_client and all([platform, meeting_url, token, meeting_id]):
-            self.collector_client.publish_session_start_event(token, platform, meeting_id, self.client_uid)
-            logging.info(f"Published session_start event for client {self.client_uid}")
+            if self.checkpoint is not None:
+                # the session started on an earlier connection; a second session_start would move the
+                # start time the collector computes the absolute segment times from
+                self.collector_client.mark_session_started(self.client_uid)
+            else:
+                self.collector_client.publish_session_start_event(token, platform, meeting_id, self.client_uid)
+                logging.info(f"Published session_start event for client {self.client_uid}")
 
     def speech_to_text(self):
+        """
+        Process an audio stream in an infinite loop, continuously transcribing the speech.
+
+        This method continuously receives audio frames, performs real-time transcription, and sends
+        transcribed segments to the client via a WebSocket connection.
+
+        If the client's language is not detected, it waits for 30 seconds of audio input to make a language prediction.
+        It utilizes the Whisper ASR model to transcribe the audio, continuously processing and streaming results. Segments
+        are sent to the client in real-time, and a history of segments is maintained to provide context.Pauses in speech
+        (no output from Whisper) are handled by showing the previous output for a set duration. A blank segment is added if
+        there is no speech for a specified duration to indicate a pause.
+
+        Raises:
+            Exception: If there is an issue with audio processing or WebSocket communication.
+
+        """
+        while True:
+            if self.exit:
+                logging.info("Exiting speech to text thread")
+                break
+
+            if not self.wait_for_audio(self.min_audio_s):
+                self.on_idle()
+                continue
+
+            self.process_next_chunk()
+        # the pass in progress when the connection closed has finished, the state is consistent
+        self.save_checkpoint(force=True)
+
+    def start_transcription_thread(self):
+        """
+        Starts the per-client transcription thread running `speech_to_text`, or registers the
+        client with the shared `WORKER_POOL` when the server has one.
+
+        Skipped when the server drives `process_next_chunk` itself (server option
+        `transcription_thread` set to False, as in async mode).
+        """
+        if not self.use_transcription_thread:
+            return
+        if self.WORKER_POOL is not None:
+            self.worker_pool = self.WORKER_POOL
+            self.worker_pool.add(self)
+            return
+        self.trans_thread = threading.Thread(target=self.speech_to_text)
+        self.trans_thread.start()
+
+    def process_next_chunk(self):
         raise NotImplementedError
 
+    def on_idle(self):
+        """Called by the transcription thread when no audio worth a pass arrived for `WAKEUP_TIMEOUT_S`."""
+        pass
+
     def transcribe_audio(self):
         raise NotImplementedError
 
     def handle_transcription_output(self):
         raise NotImplementedError
 
+    @property
+    def frames_np(self):
+        """
+        View of all audio currently retained in the ring buffer, or None if no audio has arrived yet.
+        """
+        if self.audio_buffer.end_index == 0:
+            return None
+        return self.audio_buffer.view()
+
+    @property
+    def frames_offset(self):
+        """
+        Time in seconds of the oldest sample still held in the audio buffer.
+        """
+        return self.audio_buffer.start_index / self.RATE
+
     def add_frames(self, frame_np):
         """
         Add audio frames to the ongoing audio stream buffer.
 
-        This method is responsible for maintaining the audio stream buffer, allowing the continuous addition
-        of audio frames as they are received. It also ensures that the buffer does not exceed a specified size
-        to prevent excessive memory usage.
-
-        If the buffer size exceeds a threshold (45 seconds of audio data), it discards the oldest 30 seconds
-        of audio data to maintain a reasonable buffer size. If the buffer is empty, it initializes it with the provided
-        audio frame. The audio stream buffer is used for real-time processing of audio data for transcription.
+        Frames are written into a fixed-capacity ring buffer holding the last `max_buffer_s` seconds of
+        audio, so an append costs O(len(frame_np)) no matter how much audio is retained. Once the buffer
+        is full the oldest audio is overwritten and `frames_offset` advances with it. If the transcription
+        offset falls behind the retained audio (no speech was committed for the whole buffer), it is moved
+        forward to the oldest retained sample.
 
         Args:
             frame_np (numpy.ndarray): The audio frame data as a NumPy array.
 
         """
-        self.lock.acquire()
-        if self.frames_np is not None and self.frames_np.shape[0] > self.max_buffer_s * self.RATE:
-            self.frames_offset += self.discard_buffer_s
-            self.frames_np = self.frames_np[int(self.discard_buffer_s * self.RATE):]
+        # int16 PCM is converted to float while it is copied into the buffer
+        scale = INT16_SCALE if frame_np.dtype == np.int16 else None
+        with self.audio_available:
+            self.audio_buffer.append(frame_np, scale=scale)
             # check timestamp offset(should be >= self.frame_offset)
             # this basically means that there is no speech as timestamp offset hasnt updated
             # and is less than frame_offset
             if self.timestamp_offset < self.frames_offset:
                 self.timestamp_offset = self.frames_offset
-        if self.frames_np is None:
-            self.frames_np = frame_np.copy()
-        else:
-            self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
-        self.lock.release()
+            uncommitted = self.audio_buffer.end_index - int(round(self.timestamp_offset * self.RATE))
+            self.last_audio_at = time.monotonic()
+            self.audio_available.notify()
+        self.buffer_gauge.set(uncommitted / self.RATE)
+        if self.worker_pool is not None:
+            self.worker_pool.notify(self)
+
+    def _has_pending_audio(self, min_audio_s):
+        # new audio arrived since the last chunk was taken, and enough is unprocessed to be worth a pass
+        end_index = self.audio_buffer.end_index
+        if end_index <= self.processed_end_index:
+            return False
+        return end_index - int(round(self.timestamp_offset * self.RATE)) >= min_audio_s * self.RATE
+
+    def wait_for_audio(self, min_audio_s, timeout=None):
+        """
+        Blocks the transcription thread until there is audio worth transcribing.
+
+        Returns as soon as at least `min_audio_s` seconds of unprocessed audio are buffered and some
+        of it arrived after the last chunk was taken, so the same window is never transcribed twice
+        and an idle client costs no CPU. The time spent waiting is accounted as idle time.
+
+        Args:
+            min_audio_s (float): Minimum duration of unprocessed audio in seconds.
+            timeout (float, optional): Deadline in seconds. Defaults to `WAKEUP_TIMEOUT_S`.
+
+        Returns:
+            bool: True if audio is ready, False if the deadline expired or the client is exiting.
+        """
+        timeout = self.WAKEUP_TIMEOUT_S if timeout is None else timeout
+        start = time.monotonic()
+        with self.audio_available:
+            ready = self.audio_available.wait_for(
+                lambda: self.exit or self._has_pending_audio(min_audio_s), timeout)
+        self.idle_time += time.monotonic() - start
+        return bool(ready) and not self.exit
+
+    def poll_audio(self):
+        """
+        Non-blocking counterpart of `wait_for_audio` for servers that schedule passes themselves.
+
+        Returns:
+            bool: True if a `process_next_chunk` call would find new audio to transcribe. The time since
+                the previous pass is then accounted as idle time.
+        """
+        with self.lock:
+            ready = not self.exit and self._has_pending_audio(self.min_audio_s)
+        if ready:
+            self.idle_time += time.monotonic() - self.idle_since
+        return ready
+
+    def record_busy_time(self, started_at, duration=None):
+        """
+        Accounts a transcription pass that started at `started_at` (time.monotonic()).
+
+        When the `duration` of the transcribed window is given, the pass is also recorded in the
+        per-backend inference metrics.
+        """
+        now = time.monotonic()
+        self.busy_time += now - started_at
+        self.transcription_passes += 1
+        self.idle_since = now
+        if duration is not None and self.BACKEND is not None:
+            metrics.observe_inference(self.BACKEND, duration, now - started_at)
+        if duration is not None and ServeClientBase.ADMISSION_CONTROLLER is not None:
+            ServeClientBase.ADMISSION_CONTROLLER.record_pass(
+                max(0.0, now - started_at - self.pass_wait_s), self.pass_audio_s)
+
+    def record_model_wait(self, wait_s):
+        """
+        Accounts time spent waiting for the model, which admission control does not count as inference.
+        """
+        self.pass_wait_s += wait_s
+        metrics.MODEL_LOCK_WAIT_SECONDS.labels(self.BACKEND).observe(wait_s)
+
+    def get_activity_stats(self):
+        """
+        Returns how the transcription thread of this client spent its time.
+
+        Returns:
+            dict: Seconds idle (waiting for audio) and busy (transcribing), the number of
+                transcription passes and the busy share of the total.
+        """
+        total = self.idle_time + self.busy_time
+        return {
+            "uid": self.client_uid,
+            "idle_s": round(self.idle_time, 3),
+            "busy_s": round(self.busy_time, 3),
+            "passes": self.transcription_passes,
+            "skipped_passes": self.skipped_passes,
+            "busy_ratio": round(self.busy_time / total, 4) if total > 0 else 0.0,
+        }
+
+    @classmethod
+    def get_vad_service(cls, server_options: dict) -> Optional[BatchedVADService]:
+        """Returns the VAD service shared by all connections, or None if VAD batching is disabled."""
+        if not server_options.get("vad_batching", True):
+            return None
+        with ServeClientBase.VAD_SERVICE_LOCK:
+            if ServeClientBase.VAD_SERVICE is None:
+                ServeClientBase.VAD_SERVICE = BatchedVADService(
+                    max_batch_size=server_options.get("vad_max_batch_size", 128),
+                    max_wait_s=server_options.get("vad_max_wait_ms", 5) / 1000,
+                    frame_rate=cls.RATE)
+                logging.info("Batched streaming VAD enabled")
+            return ServeClientBase.VAD_SERVICE
+
+    def skip_silence(self, duration):
+        """
+        Decides, in streaming VAD mode, whether the window taken by `get_audio_chunk_for_processing`
+        can be skipped because it holds no speech.
+
+        New audio is classified first. Only when no padded speech region overlaps the window is the
+        pass skipped; the timestamp offset then moves to the end of the window, less the VAD pre-roll,
+        so the next window starts close to the next speech without cutting into it.
+
+        Args:
+            duration (float): Duration of the window in seconds.
+
+        Returns:
+            bool: True if the pass should be skipped.
+        """
+        if self.vad is None:
+            return False
+        with self.lock:
+            start = max(self.vad.position, self.audio_buffer.start_index)
+            audio = self.audio_buffer.view(start)
+            window_start = int(round(self.timestamp_offset * self.RATE))
+            window_end = self.processed_end_index
+        self.vad.accept(audio, start)
+        if self.vad.has_speech(window_start, window_end):
+            return False
+
+        with self.lock:
+            self.timestamp_offset = max(self.timestamp_offset, (window_end - self.vad.preroll) / self.RATE)
+        self.skipped_passes += 1
+        if self.BACKEND is not None:
+            metrics.VAD_SKIPPED_SECONDS.labels(self.BACKEND).inc(duration)
+        if ServeClientBase.ADMISSION_CONTROLLER is not None:
+            ServeClientBase.ADMISSION_CONTROLLER.record_pass(0.0, self.pass_audio_s)
+        return True
+
+    def checkpoint_offset(self):
+        """
+        Time in seconds up to which the audio is final: everything before it is in the transcript.
+        """
+        return self.timestamp_offset
+
+    def checkpoint_state(self):
+        """
+        Returns a bounded snapshot of the session for `SessionCheckpointStore`.
+
+        Holds the audio from `checkpoint_offset` on, at most the store's `max_audio_s` seconds, and
+        the transcript segments a resumed session may still send, at most `max_segments` plus those
+        not sent as completed yet. Earlier segments are only counted, so segment ids stay stable.
+        """
+        store = self.checkpoint_store
+        with self.lock:
+            offset_index = int(round(self.checkpoint_offset() * self.RATE))
+            audio_start = max(offset_index, self.audio_buffer.end_index - int(store.max_audio_s * self.RATE),
+                              self.audio_buffer.start_index)
+            audio = self.audio_buffer.view(audio_start)
+            kept = min(len(self.transcript), max(store.max_segments, self.send_last_n_segments,
+                                                 len(self.transcript) - self.segments_sent))
+            return {
+                "timestamp_offset": self.checkpoint_offset(),
+                "audio_start_index": audio_start,
+                "audio": store.encode_audio(audio),
+                "transcript_length": len(self.transcript),
+                "transcript": self.transcript[len(self.transcript) - kept:],
+                "text": self.text[-self.pick_previous_segments:],
+                "segments_sent": self.segments_sent,
+                "sent_partial": self.sent_partial,
+                "language": self.language,
+                "saved_at": time.time(),
+            }
+
+    def save_checkpoint(self, force=False):
+        """
+        Submits a snapshot of the session if checkpoints are enabled and the last one is older than the
+        store's `interval_s`, or `force` is set. Called at the end of every transcription pass.
+        """
+        if self.checkpoint_store is None or self.session_ended:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_checkpoint_at < self.checkpoint_store.interval_s:
+            return
+        self.last_checkpoint_at = now
+        try:
+            self.checkpoint_store.submit(self.client_uid, self.checkpoint_state())
+        except Exception as e:
+            logging.error(f"Failed to checkpoint session {self.client_uid}: {e}")
+
+    def restore_checkpoint(self, state):
+        """
+        Resumes the session from a snapshot written by `checkpoint_state`.
+
+        The retained audio is put back on its original timeline, so the next pass transcribes it again
+        from the checkpointed offset and new audio continues right after it. Audio the client sent
+        while it was disconnected is not part of the timeline.
+        """
+        audio = self.checkpoint_store.decode_audio(state["audio"])
+        with self.lock:
+            self.audio_buffer.reset(state["audio_start_index"])
+            self.audio_buffer.append(audio)
+            self.processed_end_index = self.audio_buffer.start_index
+            self.timestamp_offset = max(state["timestamp_offset"], self.frames_offset)
+            # segments left out of the snapshot were sent long ago and are never read again, they
+            # only keep their place so the ids of the later ones do not change
+            transcript = state["transcript"]
+            self.transcript = [None] * (state["transcript_length"] - len(transcript)) + transcript
+            self.text = list(state["text"])
+            self.segments_sent = state["segments_sent"]
+            self.sent_partial = tuple(state["sent_partial"]) if state["sent_partial"] else None
+            if self.language is None:
+                self.language = state["language"]
+        logger.info(f"SESSION_RESUMED: client={self.client_uid}, timestamp_offset={self.timestamp_offset:.3f}, "
+                    f"segments={state['transcript_length']}, audio_s={len(audio) / self.RATE:.1f}, "
+                    f"age_s={time.time() - state['saved_at']:.1f}")
+
+    def end_session(self):
+        """Drops the checkpoint of a session that ended on purpose, so it is never resumed."""
+        self.session_ended = True
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.delete(self.client_uid)
 
     def clip_audio_if_no_valid_segment(self):
         """
@@ -1325,18 +2121,20 @@ class ServeClientBase(object):
         no valid segment for the last 30 seconds from whisper
         """
         with self.lock:
-            if self.frames_np[int((self.timestamp_offset - self.frames_offset)*self.RATE):].shape[0] > self.clip_if_no_segment_s * self.RATE:
-                duration = self.frames_np.shape[0] / self.RATE
-                self.timestamp_offset = self.frames_offset + duration - self.clip_retain_s
+            end_time = self.audio_buffer.end_index / self.RATE
+            if end_time - max(self.timestamp_offset, self.frames_offset) > self.clip_if_no_segment_s:
+                self.timestamp_offset = end_time - self.clip_retain_s
 
     def get_audio_chunk_for_processing(self):
         """
         Retrieves the next chunk of audio data for processing based on the current offsets.
 
-        Calculates which part of the audio data should be processed next, based on
-        the difference between the current timestamp offset and the frame's offset, scaled by
-        the audio sample rate (RATE). It then returns this chunk of audio data along with its
-        duration in seconds.
+        Maps the current timestamp offset onto the ring buffer's sample index and returns the
+        audio from there to the end of the buffer along with its duration in seconds. The chunk
+        is a view into the ring buffer, not a copy: its oldest samples are overwritten once
+        `max_buffer_s` minus the chunk's own duration of newer audio has been written. With
+        `clip_if_no_segment_s` well below `max_buffer_s` that leaves many seconds for one
+        transcription pass; anything that keeps the audio longer must copy it.
 
         Returns:
             tuple: A tuple containing:
@@ -1344,9 +2142,14 @@ class ServeClientBase(object):
                 - duration (float): The duration of the audio chunk in seconds.
         """
         with self.lock:
-            samples_take = max(0, (self.timestamp_offset - self.frames_offset) * self.RATE)
-            input_bytes = self.frames_np[int(samples_take):].copy()
+            input_bytes = self.audio_buffer.view(int(round(self.timestamp_offset * self.RATE)))
+            backlog_s = (self.audio_buffer.end_index - self.processed_end_index) / self.RATE
+            self.processed_end_index = self.audio_buffer.end_index
+            self.chunk_start_index = self.processed_end_index - input_bytes.shape[0]
+        self.pass_audio_s = backlog_s
+        self.pass_wait_s = 0.0
         duration = input_bytes.shape[0] / self.RATE
+        self.buffer_gauge.set(duration)
         return input_bytes, duration
 
     def prepare_segments(self, last_segment=None):
@@ -1365,6 +2168,9 @@ class ServeClientBase(object):
         Returns:
             list: A list of transcribed text segments to be sent to the client.
         """
+        if self.delta_updates:
+            return self.prepare_segment_updates(last_segment)
+
         segments = []
         if len(self.transcript) >= self.send_last_n_segments:
             segments = self.transcript[-self.send_last_n_segments:].copy()
@@ -1374,6 +2180,52 @@ class ServeClientBase(object):
             segments = segments + [last_segment]
         return segments
 
+    def prepare_segment_updates(self, last_segment=None):
+        """
+        Prepares the segments that are new or changed since the last message, for delta updates.
+
+        Every segment carries an "id", its index in the transcript, and a "revision" that grows each
+        time a segment with that id is re-sent. The incomplete last segment takes the id of the next
+        completed segment, so a client replaces it when it is completed. If the incomplete segment
+        disappears without being completed, it is re-sent once with an empty text. Completed segments
+        whose text was replaced by a re-decode (two-tier mode) are sent again with the next revision.
+
+        Args:
+            last_segment (dict, optional): The most recent, incomplete segment.
+
+        Returns:
+            list: The segment updates, empty if nothing changed.
+        """
+        updates = []
+        partial_id, partial_revision, partial = self.sent_partial or (None, -1, None)
+        for segment_id in range(self.segments_sent, len(self.transcript)):
+            revision = partial_revision + 1 if segment_id == partial_id else 0
+            if segment_id in self.final_decodes:
+                self.segment_revisions[segment_id] = revision
+            updates.append(dict(self.transcript[segment_id], id=segment_id, revision=revision))
+        self.segments_sent = len(self.transcript)
+        for segment_id in self.revised_segments:
+            revision = self.segment_revisions.pop(segment_id, 0) + 1
+            updates.append(dict(self.transcript[segment_id], id=segment_id, revision=revision))
+        self.revised_segments = []
+        if partial_id is not None and partial_id < self.segments_sent:
+            # the incomplete segment was completed above
+            partial_id, partial_revision, partial = None, -1, None
+            self.sent_partial = None
+
+        next_id = len(self.transcript)
+        if last_segment is not None:
+            if partial_id != next_id:
+                partial_revision = -1
+            elif all(last_segment.get(k) == partial.get(k) for k in ("start", "end", "text")):
+                return updates
+            self.sent_partial = (next_id, partial_revision + 1, last_segment)
+            updates.append(dict(last_segment, id=next_id, revision=partial_revision + 1))
+        elif partial_id is not None:
+            self.sent_partial = None
+            updates.append(dict(partial, text="", id=partial_id, revision=partial_revision + 1))
+        return updates
+
     def get_audio_chunk_duration(self, input_bytes):
         """
         Calculates the duration of the provided audio chunk.
@@ -1407,7 +2259,12 @@ class ServeClientBase(object):
                 "uid": self.client_uid,
                 "segments": segments,
             }
-            self.websocket.send(json.dumps(data))
+            key = self.superseding_key(segments)
+            send_superseding = getattr(self.websocket, "send_superseding", None)
+            if key is not None and send_superseding is not None:
+                send_superseding(json.dumps(data), key)
+            else:
+                self.websocket.send(json.dumps(data))
             
             # Use the instance's self.collector_client
             if self.collector_client:
@@ -1419,22 +2276,60 @@ class ServeClientBase(object):
                     session_uid=self.client_uid
                 )
             
-            # Log the transcription data to file with more detailed formatting
-            formatted_segments = []
-            for i, segment in enumerate(segments):
-                if 'start' in segment and 'end' in segment:
-                    formatted_segments.append(
-                        f"[{i}] ({segment.get('start', 'N/A')}-{segment.get('end', 'N/A')}) "
-                        f"[{'COMPLETE' if segment.get('completed', False) else 'PARTIAL'}]: "
-                        f"\"{segment.get('text', '')}\""
-                    )
-                else:
-                    formatted_segments.append(f"[{i}]: \"{segment.get('text', '')}\"")
-                    
-            logger.info(f"TRANSCRIPTION: client={self.client_uid}, platform={self.platform}, meeting_url={self.meeting_url}, token={self.token}, meeting_id={self.meeting_id}, segments=\n" + "\n".join(formatted_segments))
+            self.log_segments(segments)
         except Exception as e:
             logging.error(f"[ERROR]: Sending data to client: {e}")
 
+    def superseding_key(self, segments):
+        """
+        Key under which a transcription message may replace an older one still waiting to be sent
+        (see `AsyncWebSocketAdapter`), or None if it must be delivered.
+
+        Without delta updates every message carries the recent window of the transcript, so the
+        newest one is all a slow client needs. Delta updates are sent only once, so only a message
+        holding nothing but the incomplete segment may be replaced, by a newer revision of the same
+        segment id. Completed segments and their revisions are always delivered.
+        """
+        if not self.delta_updates:
+            return "transcript"
+        if len(segments) == 1 and not segments[0].get("completed") and "id" in segments[0]:
+            return ("partial", segments[0]["id"])
+        return None
+
+    def log_segments(self, segments):
+        """
+        Writes the segments completed since the last call to the transcription log, each once, and
+        every `log_partial_every`-th incomplete segment unless only completed segments are logged.
+
+        Args:
+            segments (list): The segments just sent to the client.
+        """
+        if not segment_logger.handlers:
+            return
+        completed = self.transcript[self.segments_logged:]
+        self.segments_logged = len(self.transcript)
+        for segment in completed:
+            self._log_segment(segment)
+        if self.log_completed_only or self.log_partial_every <= 0 or not segments:
+            return
+        if not segments[-1].get("completed"):
+            self.partials_seen += 1
+            if self.partials_seen % self.log_partial_every == 0:
+                self._log_segment(segments[-1])
+
+    def _log_segment(self, segment):
+        segment_logger.info("segment", extra={"event": {
+            "event": "segment",
+            "uid": self.client_uid,
+            "platform": self.platform,
+            "meeting_id": self.meeting_id,
+            "start": segment.get("start"),
+            "end": segment.get("end"),
+            "text": segment.get("text", ""),
+            "completed": bool(segment.get("completed")),
+            "language": segment.get("language"),
+        }})
+
     def disconnect(self):
         """
         Notify the client of disconnection and send a disconnect message.
@@ -1457,8 +2352,13 @@ class ServeClientBase(object):
         associated with the transcription process.
 
         """
-        logging.info("Cleaning up.")
-        self.exit = True
+        logging.info(f"Cleaning up. Transcription thread activity: {self.get_activity_stats()}")
+        with self.audio_available:
+            self.exit = True
+            self.audio_available.notify_all()
+        if self.worker_pool is not None:
+            self.worker_pool.notify(self)
+        metrics.remove_client(self.client_uid)
 
     def forward_to_collector(self, segments):
         """Forward transcriptions to the collector if available"""
@@ -1475,33 +2375,48 @@ class ServeClientBase(object):
 
 class ServeClientTensorRT(ServeClientBase):
 
+    BACKEND = "tensorrt"
     SINGLE_MODEL = None
     SINGLE_MODEL_LOCK = threading.Lock()
+    BATCH_SCHEDULER = None
 
     def __init__(self, websocket, task="transcribe", multilingual=False, language=None, 
                  client_uid=None, model=None, single_model=False, 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
-                 server_options: Optional[dict] = None):
+                 server_options: Optional[dict] = None, delta_updates=False, audio_encoding="float32"):
         super().__init__(websocket, language, task, client_uid, platform, meeting_url, token, meeting_id,
-                         collector_client_ref=collector_client_ref, server_options=server_options)
+                         collector_client_ref=collector_client_ref, server_options=server_options,
+                         delta_updates=delta_updates, audio_encoding=audio_encoding)
+        server_options = server_options or {}
         self.eos = False
+        self.min_audio_s = 0.4
         
         # Log the critical parameters
         logging.info(f"Initializing TensorRT client {client_uid} with platform={platform}, meeting_url={meeting_url}, token={token}")
 
         if single_model:
-            if ServeClientTensorRT.SINGLE_MODEL is None:
-                self.create_model(model, multilingual)
-                ServeClientTensorRT.SINGLE_MODEL = self.transcriber
-            else:
-                self.transcriber = ServeClientTensorRT.SINGLE_MODEL
+            with ServeClientTensorRT.SINGLE_MODEL_LOCK:
+                if ServeClientTensorRT.SINGLE_MODEL is None:
+                    self.create_model(model, multilingual)
+                    ServeClientTensorRT.SINGLE_MODEL = self.transcriber
+                else:
+                    self.transcriber = ServeClientTensorRT.SINGLE_MODEL
+                if server_options.get("batch_inference") and ServeClientTensorRT.BATCH_SCHEDULER is None:
+                    ServeClientTensorRT.BATCH_SCHEDULER = TensorRTBatchScheduler(
+                        self.transcriber,
+                        max_batch_size=server_options.get("max_batch_size", 8),
+                        max_wait_s=server_options.get("max_batch_wait_ms", 50) / 1000,
+                    )
+                    logging.info(
+                        f"Batched TensorRT inference enabled: max_batch_size={server_options.get('max_batch_size', 8)}, "
+                        f"max_batch_wait_ms={server_options.get('max_batch_wait_ms', 50)}"
+                    )
         else:
             self.create_model(model, multilingual)
 
         # threading
-        self.trans_thread = threading.Thread(target=self.speech_to_text)
-        self.trans_thread.start()
+        self.start_transcription_thread()
 
         self.websocket.send(json.dumps({
             "uid": self.client_uid,
@@ -1562,7 +2477,8 @@ class ServeClientTensorRT(ServeClientBase):
             duration (float): Duration of the transcribed audio chunk.
         """
         segments = self.prepare_segments({"text": last_segment})
-        self.send_transcription_to_client(segments)
+        if segments:
+            self.send_transcription_to_client(segments)
         if self.eos:
             self.update_timestamp_offset(last_segment, duration)
 
@@ -1570,17 +2486,29 @@ class ServeClientTensorRT(ServeClientBase):
         """
         Transcribe the audio chunk and send the results to the client.
 
+        With batched inference enabled the spectrogram is handed to the shared `BATCH_SCHEDULER`,
+        which decodes it together with the pending windows of other clients and blocks until its
+        text is ready.
+
         Args:
             input_bytes (np.array): The audio chunk to transcribe.
         """
+        text_prefix = f"<|startoftranscript|><|{self.language}|><|{self.task}|><|notimestamps|>"
+        if ServeClientTensorRT.BATCH_SCHEDULER is not None and self.transcriber is ServeClientTensorRT.SINGLE_MODEL:
+            mel, duration = self.transcriber.log_mel_spectrogram(input_bytes)
+            last_segment = ServeClientTensorRT.BATCH_SCHEDULER.transcribe(
+                mel, text_prefix, on_wait=self.record_model_wait)
+            if last_segment:
+                self.handle_transcription_output(last_segment, duration)
+            return
+
         if ServeClientTensorRT.SINGLE_MODEL:
+            wait_start = time.perf_counter()
             ServeClientTensorRT.SINGLE_MODEL_LOCK.acquire()
+            self.record_model_wait(time.perf_counter() - wait_start)
         logging.info(f"[WhisperTensorRT:] Processing audio with duration: {input_bytes.shape[0] / self.RATE}")
         mel, duration = self.transcriber.log_mel_spectrogram(input_bytes)
-        last_segment = self.transcriber.transcribe(
-            mel,
-            text_prefix=f"<|startoftranscript|><|{self.language}|><|{self.task}|><|notimestamps|>"
-        )
+        last_segment = self.transcriber.transcribe(mel, text_prefix=text_prefix)
         if ServeClientTensorRT.SINGLE_MODEL:
             ServeClientTensorRT.SINGLE_MODEL_LOCK.release()
         if last_segment:
@@ -1616,45 +2544,26 @@ class ServeClientTensorRT(ServeClientBase):
             
             self.timestamp_offset += duration
 
-    def speech_to_text(self):
+    def process_next_chunk(self):
         """
-        Process an audio stream in an infinite loop, continuously transcribing the speech.
-
-        This method continuously receives audio frames, performs real-time transcription, and sends
-        transcribed segments to the client via a WebSocket connection.
-
-        If the client's language is not detected, it waits for 30 seconds of audio input to make a language prediction.
-        It utilizes the Whisper ASR model to transcribe the audio, continuously processing and streaming results. Segments
-        are sent to the client in real-time, and a history of segments is maintained to provide context.Pauses in speech
-        (no output from Whisper) are handled by showing the previous output for a set duration. A blank segment is added if
-        there is no speech for a specified duration to indicate a pause.
-
-        Raises:
-            Exception: If there is an issue with audio processing or WebSocket communication.
-
+        Runs one transcription pass over the unprocessed audio and sends the results to the client.
         """
-        while True:
-            if self.exit:
-                logging.info("Exiting speech to text thread")
-                break
-
-            if self.frames_np is None:
-                time.sleep(0.02)    # wait for any audio to arrive
-                continue
+        self.clip_audio_if_no_valid_segment()
 
-            self.clip_audio_if_no_valid_segment()
-
-            input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < 0.4:
-                continue
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        if duration < self.min_audio_s or self.skip_silence(duration):
+            return
 
-            try:
-                input_sample = input_bytes.copy()
-                logging.info(f"[WhisperTensorRT:] Processing audio with duration: {duration}")
-                self.transcribe_audio(input_sample)
+        started_at = time.monotonic()
+        try:
+            logging.info(f"[WhisperTensorRT:] Processing audio with duration: {duration}")
+            self.transcribe_audio(input_bytes)
 
-            except Exception as e:
-                logging.error(f"[ERROR]: {e}")
+        except Exception as e:
+            logging.error(f"[ERROR]: {e}")
+        finally:
+            self.record_busy_time(started_at, duration)
+            self.save_checkpoint()
 
     def format_segment(self, start, end, text, completed=False, language=None):
         """
@@ -1804,17 +2713,39 @@ class ServeClientTensorRT(ServeClientBase):
 
 class ServeClientFasterWhisper(ServeClientBase):
 
+    BACKEND = "faster_whisper"
     SINGLE_MODEL = None
     SINGLE_MODEL_LOCK = threading.Lock()
+    BATCH_SCHEDULER = None
+    MODEL_POOL = None
+    SINGLE_MODEL_NAME = None
+    MODEL_REGISTRY = None
+    MODEL_REGISTRY_LOCK = threading.Lock()
+    LANGUAGE_CACHE = None
+    LANGUAGE_CACHE_LOCK = threading.Lock()
+    # model name -> CPU compute type picked by TranscriptionServer.probe_compute_type
+    COMPUTE_TYPES = {}
+    # two-tier mode: decodes completed segments again with the `final_model` server option
+    FINAL_SCHEDULER = None
+    FINAL_SCHEDULER_LOCK = threading.Lock()
+    # audio kept on both sides of a completed segment when it is decoded again
+    FINAL_MARGIN_S = 0.1
+
+    # local_agreement mode: committed words are sent as a completed segment at a sentence end
+    # or once they span this many seconds
+    SENTENCE_END = ".?!…。？！"
+    MAX_COMMITTED_SEGMENT_S = 15
+    PROMPT_CONTEXT_CHARS = 200
 
     def __init__(self, websocket, task="transcribe", device=None, language=None, 
                  client_uid=None, model="small.en", initial_prompt=None, 
                  vad_parameters=None, use_vad=False, single_model=False,  # VAD DISABLED 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
-                 server_options: Optional[dict] = None):
+                 server_options: Optional[dict] = None, delta_updates=False, audio_encoding="float32"):
         super().__init__(websocket, language, task, client_uid, platform, meeting_url, token, meeting_id,
-                         collector_client_ref=collector_client_ref, server_options=server_options)
+                         collector_client_ref=collector_client_ref, server_options=server_options,
+                         delta_updates=delta_updates, audio_encoding=audio_encoding)
         self.model_sizes = [
             "tiny", "tiny.en", "base", "base.en", "small", "small.en",
             "medium", "medium.en", "large-v2", "large-v3", "distil-small.en",
@@ -1826,37 +2757,100 @@ class ServeClientFasterWhisper(ServeClientBase):
         logging.info(f"Initializing FasterWhisper client {client_uid} with platform={platform}, meeting_url={meeting_url}, token={token}")
 
         self.model_size_or_path = model
+        self.registry_model = None
         self.language = "en" if self.model_size_or_path.endswith("en") else language
+        if self.language is None and self.checkpoint is not None:
+            self.language = self.checkpoint["language"]
         self.task = task
         self.initial_prompt = initial_prompt
 
         server_options = server_options or {}
-        self.min_audio_s = server_options.get("min_audio_s", 1.0)
+        self.model_pool_size = server_options.get("model_pool_size", 1)
+        self.model_replicas = server_options.get("model_replicas", False)
+        self.cpu_threads = server_options.get("cpu_threads", 0)
+        self.device_index = server_options.get("device_index", [0])
         self.vad_parameters = vad_parameters or {"onset": server_options.get("vad_onset", 0.5)}
         self.no_speech_thresh = server_options.get("vad_no_speech_thresh", 0.45)
         self.same_output_threshold = server_options.get("same_output_threshold", 10)
         self.end_time_for_same_output = None
+        # the incomplete segment of the last pass, completed by on_idle once the client goes quiet
+        self.finalize_after_s = server_options.get("finalize_after_s", 2.0)
+        self.last_partial = None
+        # log-mel frames of the overlap between consecutive windows are reused, see compute_features
+        self.use_feature_cache = server_options.get("feature_cache", True)
+        self.feature_cache = None
+
+        # languages detected before for this session or meeting skip detection, see decode_language
+        self.language_cache = self.get_language_cache(server_options)
+        self.meeting_key = LanguageCache.meeting_key(platform, meeting_id)
+        self.cached_language = None
+        if self.language is None and self.language_cache is not None:
+            self.cached_language = self.language_cache.get(self.client_uid, self.meeting_key)
+            if self.cached_language is not None:
+                self.language = self.cached_language.language
+                logger.info(f"LANGUAGE_CACHE: client={self.client_uid}, language={self.language}, "
+                            f"confidence={self.cached_language.probability:.4f}")
+
+        # "update_segments" re-decodes the whole window until the output repeats, "local_agreement"
+        # commits words that consecutive decodes agree on and moves the window past them
+        self.streaming_mode = server_options.get("streaming_mode", "update_segments")
+        self.local_agreement = None
+        if self.streaming_mode == "local_agreement":
+            self.local_agreement = LocalAgreement(server_options.get("local_agreement_n", 2))
+            self.local_agreement.reset(self.timestamp_offset)
+        elif self.streaming_mode != "update_segments":
+            logging.warning(f"Unknown streaming_mode {self.streaming_mode!r}, using update_segments")
+            self.streaming_mode = "update_segments"
+        self.committed_words = []   # committed words not yet sent as a completed segment
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        if device == "cuda":
-            major, _ = torch.cuda.get_device_capability(device)
-            self.compute_type = "float16" if major >= 7 else "float32"
-        else:
-            self.compute_type = "default" #"int8" #NOTE: maybe we use default here...
+        self.compute_type = self.get_compute_type(device, self.model_size_or_path, server_options)
 
         if self.model_size_or_path is None:
             return
         logging.info(f"Using Device={device} with precision {self.compute_type}")
     
         try:
+            shared = False
             if single_model:
-                if ServeClientFasterWhisper.SINGLE_MODEL is None:
-                    self.create_model(device)
-                    ServeClientFasterWhisper.SINGLE_MODEL = self.transcriber
-                else:
-                    self.transcriber = ServeClientFasterWhisper.SINGLE_MODEL
-            else:
-                self.create_model(device)
+                with ServeClientFasterWhisper.SINGLE_MODEL_LOCK:
+                    # checked under the lock, so two first connections asking for different models
+                    # cannot both take the single model slot
+                    shared = ServeClientFasterWhisper.SINGLE_MODEL_NAME in (None, self.model_size_or_path)
+                    if shared:
+                        if ServeClientFasterWhisper.SINGLE_MODEL is None:
+                            if self.model_pool_size > 1:
+                                ServeClientFasterWhisper.MODEL_POOL = ModelPool.create(
+                                    functools.partial(self.load_model, device),
+                                    size=self.model_pool_size,
+                                    replicas=self.model_replicas,
+                                    device_index=self.device_index,
+                                )
+                                self.transcriber = ServeClientFasterWhisper.MODEL_POOL.models[0]
+                            else:
+                                self.create_model(device)
+                            ServeClientFasterWhisper.SINGLE_MODEL = self.transcriber
+                            ServeClientFasterWhisper.SINGLE_MODEL_NAME = self.model_size_or_path
+                        else:
+                            self.transcriber = ServeClientFasterWhisper.SINGLE_MODEL
+                        if server_options.get("batch_inference") and ServeClientFasterWhisper.BATCH_SCHEDULER is None:
+                            ServeClientFasterWhisper.BATCH_SCHEDULER = FasterWhisperBatchScheduler(
+                                self.transcriber,
+                                max_batch_size=server_options.get("max_batch_size", 8),
+                                max_wait_s=server_options.get("max_batch_wait_ms", 50) / 1000,
+                            )
+                            logging.info(
+                                f"Batched inference enabled: max_batch_size={server_options.get('max_batch_size', 8)}, "
+                                f"max_batch_wait_ms={server_options.get('max_batch_wait_ms', 50)}"
+                            )
+            if not shared:
+                # other models are shared between connections through the registry
+                registry = self.get_model_registry(server_options)
+                self.registry_model = registry.acquire(
+                    (self.model_size_or_path, device, self.compute_type),
+                    functools.partial(self.load_model, device),
+                )
+                self.transcriber = self.registry_model
         except Exception as e:
             logging.error(f"Failed to load model: {e}")
             self.websocket.send(json.dumps({
@@ -1869,9 +2863,18 @@ class ServeClientFasterWhisper(ServeClientBase):
 
         self.use_vad = False  # FORCE VAD DISABLED AT SERVER LEVEL - ignore client parameter
 
+        # two-tier mode: this model gives the partials and segment boundaries, the final model
+        # decodes the audio of every completed segment again, see request_final_decode
+        self.final_scheduler = None
+        final_model = server_options.get("final_model")
+        if final_model and final_model != self.model_size_or_path:
+            if self.local_agreement is not None:
+                logging.warning("final_model is only used with streaming_mode update_segments")
+            else:
+                self.final_scheduler = self.get_final_scheduler(final_model, device, server_options)
+
         # threading
-        self.trans_thread = threading.Thread(target=self.speech_to_text)
-        self.trans_thread.start()
+        self.start_transcription_thread()
         self.websocket.send(
             json.dumps(
                 {
@@ -1881,15 +2884,219 @@ class ServeClientFasterWhisper(ServeClientBase):
                 }
             )
         )
+        if self.cached_language is not None:
+            self.websocket.send(json.dumps({
+                "uid": self.client_uid,
+                "language": self.language,
+                "language_prob": self.cached_language.probability
+            }))
 
     def create_model(self, device):
         """
         Instantiates a new model, sets it as the transcriber.
         """
-        self.transcriber = WhisperModel(
+        self.transcriber = self.load_model(device)
+
+    @staticmethod
+    def get_compute_type(device, model, server_options):
+        """
+        Compute type `model` is loaded with: float16 on GPUs that support it, on CPU the one the
+        startup probe picked for this model unless the `cpu_compute_type` server option sets one.
+        """
+        if device == "cuda":
+            major, _ = torch.cuda.get_device_capability(device)
+            return "float16" if major >= 7 else "float32"
+        cpu_compute_type = server_options.get("cpu_compute_type", "auto")
+        if cpu_compute_type == "auto":
+            return ServeClientFasterWhisper.COMPUTE_TYPES.get(model, "default")
+        return cpu_compute_type
+
+    def get_final_scheduler(self, final_model, device, server_options):
+        """
+        Returns the process-wide scheduler decoding completed segments with `final_model`, creating
+        it on first use. The model is taken from the model registry and kept for the process
+        lifetime; segments of all clients are decoded in shared batches. Returns None if the model
+        cannot be loaded, which leaves the fast model's segments final.
+        """
+        cls = ServeClientFasterWhisper
+        with cls.FINAL_SCHEDULER_LOCK:
+            if cls.FINAL_SCHEDULER is None:
+                compute_type = self.get_compute_type(device, final_model, server_options)
+                try:
+                    model = self.get_model_registry(server_options).acquire(
+                        (final_model, device, compute_type),
+                        lambda: WhisperModel(final_model, device=device, device_index=self.device_index,
+                                             compute_type=compute_type, cpu_threads=self.cpu_threads,
+                                             local_files_only=False))
+                except Exception as e:
+                    logging.error(f"Failed to load final model {final_model}, segments are not decoded again: {e}")
+                    return None
+                cls.FINAL_SCHEDULER = FasterWhisperBatchScheduler(
+                    model,
+                    max_batch_size=server_options.get("max_batch_size", 8),
+                    max_wait_s=server_options.get("max_batch_wait_ms", 50) / 1000,
+                )
+                logging.info(f"Two-tier transcription enabled: final model {final_model} ({compute_type})")
+            return cls.FINAL_SCHEDULER
+
+    def request_final_decode(self, start, end):
+        """
+        Queues the audio of the completed segment just appended to the transcript, from `start` to
+        `end` seconds, to be decoded again by the final model. The result replaces the segment's
+        text once it is ready, see `apply_final_decodes`.
+        """
+        if self.final_scheduler is None:
+            return
+        margin = self.FINAL_MARGIN_S
+        with self.lock:
+            audio = np.array(self.audio_buffer.view(int((start - margin) * self.RATE),
+                                                    int((end + margin) * self.RATE)))
+        if not len(audio):
+            return
+        request = TranscriptionRequest(audio, language=self.language, task=self.task,
+                                       initial_prompt=self.initial_prompt)
+        try:
+            self.final_decodes[len(self.transcript) - 1] = self.final_scheduler.submit(request, key=(self.task, False))
+        except RuntimeError as e:
+            logging.error(f"Failed to queue final decode: {e}")
+
+    def apply_final_decodes(self):
+        """
+        Replaces the text of completed segments whose final decode finished; a segment keeps the fast
+        model's text if the final model found no speech or failed.
+
+        Returns:
+            bool: True if a segment already sent to the client changed.
+        """
+        revised = False
+        for segment_id, future in list(self.final_decodes.items()):
+            if not future.done():
+                continue
+            del self.final_decodes[segment_id]
+            try:
+                segments, _ = future.result()
+                text = "".join(s.text for s in segments if s.no_speech_prob <= self.no_speech_thresh)
+            except Exception as e:
+                logging.error(f"[ERROR]: Final decode of segment {segment_id} failed: {e}")
+                text = ""
+            segment = self.transcript[segment_id]
+            if segment is None or not text.strip() or text.strip() == segment["text"].strip():
+                self.segment_revisions.pop(segment_id, None)
+                continue
+            self.transcript[segment_id] = dict(segment, text=text)
+            if segment_id < self.segments_sent:
+                revised = True
+                if self.delta_updates:
+                    self.revised_segments.append(segment_id)
+        return revised
+
+    def finalize_partial(self):
+        """
+        Appends the incomplete segment of the last pass to the transcript as a completed segment once
+        the client sent no audio for `finalize_after_s`. Passes only run when new audio arrives, so
+        without this the last words of a client that goes quiet without disconnecting would never be
+        completed.
+
+        Returns:
+            bool: True if a segment was completed.
+        """
+        partial = self.last_partial
+        if partial is None or not self.finalize_after_s:
+            return False
+        with self.lock:
+            if time.monotonic() - self.last_audio_at < self.finalize_after_s:
+                return False
+            start, end = float(partial["start"]), float(partial["end"])
+            self.timestamp_offset = max(self.timestamp_offset, end)
+        self.last_partial = None
+        self.text.append(partial["text"])
+        self.transcript.append(dict(partial, completed=True))
+        self.request_final_decode(start, end)
+        self.committed_words = []
+        if self.local_agreement is not None:
+            self.local_agreement.reset(self.timestamp_offset)
+        self.prev_out = ''
+        self.same_output_count = 0
+        self.end_time_for_same_output = None
+        return True
+
+    def on_idle(self):
+        # segments decoded again while no new audio arrives are sent without waiting for a pass
+        revised = bool(self.final_decodes) and self.apply_final_decodes()
+        if self.finalize_partial() or revised:
+            self.send_transcription_to_client(self.prepare_segments(self.last_partial))
+
+    @classmethod
+    def get_model_registry(cls, server_options):
+        """
+        Returns the process-wide registry of models that are not the single shared model, creating it
+        with the `model_memory_budget_mb` server option on first use.
+        """
+        with cls.MODEL_REGISTRY_LOCK:
+            if cls.MODEL_REGISTRY is None:
+                budget_mb = server_options.get("model_memory_budget_mb", 0)
+                cls.MODEL_REGISTRY = ModelRegistry(memory_budget_bytes=int(budget_mb * 2**20))
+            return cls.MODEL_REGISTRY
+
+    @classmethod
+    def get_language_cache(cls, server_options):
+        """
+        Returns the process-wide cache of detected languages, or None if it is disabled with the
+        `language_cache` server option.
+        """
+        if not server_options.get("language_cache", True):
+            return None
+        with cls.LANGUAGE_CACHE_LOCK:
+            if cls.LANGUAGE_CACHE is None:
+                cls.LANGUAGE_CACHE = LanguageCache(
+                    min_probability=server_options.get("language_cache_min_prob", 0.8),
+                    recheck_s=server_options.get("language_recheck_s", 300))
+            return cls.LANGUAGE_CACHE
+
+    def decode_language(self):
+        """
+        Language to decode the next window in, or None to detect it on this pass.
+
+        A language taken from or stored in the language cache is detected again once it is older
+        than `language_recheck_s`, so a session or meeting that changed language is followed.
+        """
+        if self.cached_language is not None and self.language_cache.needs_recheck(self.cached_language):
+            self.cached_language = None
+            logging.info(f"Re-checking language {self.language} of client {self.client_uid}")
+            return None
+        return self.language
+
+    def cleanup(self):
+        """
+        Stops the transcription thread and releases this client's reference to a registry model.
+        """
+        super().cleanup()
+        for future in self.final_decodes.values():
+            future.cancel()
+        if self.registry_model is not None:
+            ServeClientFasterWhisper.MODEL_REGISTRY.release(self.registry_model)
+            self.registry_model = None
+
+    def load_model(self, device, device_index=None, num_workers=1):
+        """
+        Loads a model with the configured compute type and CPU threads.
+
+        Args:
+            device (str): "cuda" or "cpu".
+            device_index (int or list of int, optional): Device(s) to place the model on. Defaults to
+                the `device_index` server option.
+            num_workers (int): Number of concurrent transcribe() calls the model runs in parallel.
+
+        Returns:
+            WhisperModel: The loaded model.
+        """
+        return WhisperModel(
             self.model_size_or_path,
             device=device,
+            device_index=self.device_index if device_index is None else device_index,
             compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=num_workers,
             local_files_only=False,
         )
 
@@ -1929,6 +3136,9 @@ class ServeClientFasterWhisper(ServeClientBase):
         if info.language_probability > 0.5:
             self.language = info.language
             logging.info(f"Detected language {self.language} with probability {info.language_probability}")
+            if self.language_cache is not None:
+                self.cached_language = self.language_cache.put(
+                    self.client_uid, self.meeting_key, info.language, info.language_probability)
             
             language_data = {
                 "uid": self.client_uid, 
@@ -1944,8 +3154,13 @@ class ServeClientFasterWhisper(ServeClientBase):
         """
         Transcribes the provided audio sample using the configured transcriber instance.
 
-        If the language has not been set, it updates the session's language based on the transcription
-        information.
+        With batched inference enabled the window is handed to the shared `BATCH_SCHEDULER`, which
+        decodes it together with the pending windows of other clients and blocks until its result
+        is ready. With a model pool, the window is decoded on the next free model slot instead of
+        behind the single model lock.
+
+        If the language has not been set, or a cached language is due for a re-check, it updates the
+        session's language based on the transcription information.
 
         Args:
             input_sample (np.array): The audio chunk to be transcribed. This should be a NumPy
@@ -1956,21 +3171,69 @@ class ServeClientFasterWhisper(ServeClientBase):
             depends on the implementation of the `transcriber.transcribe` method but typically
             includes the transcribed text.
         """
-        if ServeClientFasterWhisper.SINGLE_MODEL:
-            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
-        result, info = self.transcriber.transcribe(
+        language = self.decode_language()
+        if ServeClientFasterWhisper.BATCH_SCHEDULER is not None and self.transcriber is ServeClientFasterWhisper.SINGLE_MODEL:
+            # the scheduler owns the shared model and serializes access to it
+            result, info = ServeClientFasterWhisper.BATCH_SCHEDULER.transcribe(
+                input_sample,
+                language=language,
+                task=self.task,
+                initial_prompt=self.get_decoder_prompt(),
+                word_timestamps=self.local_agreement is not None,
+                on_wait=self.record_model_wait)
+            if language is None and info is not None:
+                self.set_language(info)
+            return result
+
+        if ServeClientFasterWhisper.MODEL_POOL is not None and self.transcriber is ServeClientFasterWhisper.SINGLE_MODEL:
+            # up to model_pool_size decodes run concurrently, each on a free model slot
+            wait_start = time.perf_counter()
+            with ServeClientFasterWhisper.MODEL_POOL.acquire() as model:
+                self.record_model_wait(time.perf_counter() - wait_start)
+                result, info = self._transcribe_with(model, input_sample, language)
+        else:
+            # registry models are thread-safe, ctranslate2 queues concurrent calls internally
+            shared = self.transcriber is ServeClientFasterWhisper.SINGLE_MODEL
+            if shared:
+                wait_start = time.perf_counter()
+                ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
+                self.record_model_wait(time.perf_counter() - wait_start)
+            try:
+                result, info = self._transcribe_with(self.transcriber, input_sample, language)
+            finally:
+                if shared:
+                    ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
+
+        if language is None and info is not None:
+            self.set_language(info)
+        return result
+
+    def _transcribe_with(self, model, input_sample, language):
+        return model.transcribe(
             input_sample,
-            initial_prompt=self.initial_prompt,
-            language=self.language,
+            initial_prompt=self.get_decoder_prompt(),
+            language=language,
             task=self.task,
+            word_timestamps=self.local_agreement is not None,
             vad_filter=False,  # FORCE VAD DISABLED AT SERVER LEVEL
-            vad_parameters=None)  # No VAD parameters since VAD is disabled
-        if ServeClientFasterWhisper.SINGLE_MODEL:
-            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
+            vad_parameters=None,  # No VAD parameters since VAD is disabled
+            features=self.compute_features(model, input_sample))
 
-        if self.language is None and info is not None:
-            self.set_language(info)
-        return result
+    def compute_features(self, model, input_sample):
+        """
+        Log-mel features of the window, computed incrementally by the client's `FeatureCache`.
+
+        Only the frames of audio that arrived since the last pass are computed; the frames of the
+        overlap with the previous window are reused and those behind `timestamp_offset` dropped.
+
+        Returns:
+            np.ndarray: The features, or None to let the model compute them itself.
+        """
+        if not self.use_feature_cache:
+            return None
+        if self.feature_cache is None:
+            self.feature_cache = FeatureCache(model.feature_extractor)
+        return self.feature_cache.features(input_sample, self.chunk_start_index)
 
     def get_previous_output(self):
         """
@@ -2008,61 +3271,133 @@ class ServeClientFasterWhisper(ServeClientBase):
             duration (float): Duration of the transcribed audio chunk.
         """
         segments = []
+        if self.final_decodes:
+            self.apply_final_decodes()
         if len(result):
             self.t_start = None
-            last_segment = self.update_segments(result, duration)
+            if self.local_agreement is not None:
+                last_segment = self.update_local_agreement(result, duration)
+            else:
+                last_segment = self.update_segments(result, duration)
+            self.last_partial = last_segment
             segments = self.prepare_segments(last_segment)
         else:
+            self.last_partial = None
+            if self.local_agreement is not None:
+                self.flush_committed_words()
             # show previous output if there is pause i.e. no output from whisper
             segments = self.get_previous_output()
 
         if len(segments):
             self.send_transcription_to_client(segments)
 
-    def speech_to_text(self):
+    def get_decoder_prompt(self):
         """
-        Process an audio stream in an infinite loop, continuously transcribing the speech.
+        Returns the prompt for the next decode.
 
-        This method continuously receives audio frames, performs real-time transcription, and sends
-        transcribed segments to the client via a WebSocket connection.
+        In local_agreement mode the decode window starts right after the committed words, so the
+        tail of the committed text is appended to the client's initial prompt to keep the context.
+        """
+        if self.local_agreement is None:
+            return self.initial_prompt
+        context = self.local_agreement.committed_text(max_chars=self.PROMPT_CONTEXT_CHARS)
+        return " ".join(p for p in (self.initial_prompt, context) if p) or None
 
-        If the client's language is not detected, it waits for 30 seconds of audio input to make a language prediction.
-        It utilizes the Whisper ASR model to transcribe the audio, continuously processing and streaming results. Segments
-        are sent to the client in real-time, and a history of segments is maintained to provide context.Pauses in speech
-        (no output from Whisper) are handled by showing the previous output for a set duration. A blank segment is added if
-        there is no speech for a specified duration to indicate a pause.
+    def update_local_agreement(self, segments, duration):
+        """
+        Processes the segments of one decode with the LocalAgreement commit policy.
 
-        Raises:
-            Exception: If there is an issue with audio processing or WebSocket communication.
+        Words that the last `local_agreement_n` decodes agree on are committed and the timestamp
+        offset is moved to the end of the last committed word, which keeps the decode window short.
+        Committed words are grouped into a completed segment once they end a sentence or span
+        `MAX_COMMITTED_SEGMENT_S`; everything after that is sent as the incomplete last segment.
+
+        Args:
+            segments (list): Segments with word timestamps as returned by whisper.
+            duration (float): Duration of the current chunk.
 
+        Returns:
+            dict or None: The incomplete segment made of pending committed and tentative words.
         """
-        while True:
-            if self.exit:
-                logging.info("Exiting speech to text thread")
-                break
+        with self.lock:
+            offset = self.timestamp_offset
+        if offset - self.local_agreement.last_committed_time > 0.5:
+            # the window was clipped past uncommitted audio, earlier hypotheses no longer apply
+            self.flush_committed_words()
+            self.local_agreement.reset(offset)
+
+        words = [
+            TimedWord(offset + w.start, offset + min(duration, w.end), w.word)
+            for s in segments if s.no_speech_prob <= self.no_speech_thresh
+            for w in (s.words or [])
+        ]
+        if not words:
+            self.flush_committed_words()
+            return None
 
-            if self.frames_np is None:
-                continue
+        committed = self.local_agreement.insert(words)
+        if committed:
+            self.committed_words.extend(committed)
+            with self.lock:
+                self.timestamp_offset = max(self.timestamp_offset, self.local_agreement.last_committed_time)
+            last_word = self.committed_words[-1].word.strip()
+            if (last_word[-1:] in self.SENTENCE_END
+                    or self.committed_words[-1].end - self.committed_words[0].start > self.MAX_COMMITTED_SEGMENT_S):
+                self.flush_committed_words()
+
+        pending = self.committed_words + self.local_agreement.tentative
+        if not pending:
+            return None
+        self.current_out = "".join(w.word for w in pending)
+        return self.format_segment(
+            pending[0].start, pending[-1].end, self.current_out, completed=False, language=self.language)
+
+    def checkpoint_offset(self):
+        # committed words not sent as a segment yet are transcribed again after a resume
+        if self.committed_words:
+            return min(self.timestamp_offset, self.committed_words[0].start)
+        return self.timestamp_offset
+
+    def flush_committed_words(self):
+        """Appends the committed words not sent yet to the transcript as one completed segment."""
+        if not self.committed_words:
+            return
+        text = "".join(w.word for w in self.committed_words)
+        self.text.append(text)
+        self.transcript.append(self.format_segment(
+            self.committed_words[0].start, self.committed_words[-1].end, text,
+            completed=True, language=self.language))
+        self.committed_words = []
 
-            self.clip_audio_if_no_valid_segment()
+    def process_next_chunk(self):
+        """
+        Runs one transcription pass over the unprocessed audio and sends the results to the client.
+        """
+        self.clip_audio_if_no_valid_segment()
 
-            input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < self.min_audio_s:
-                time.sleep(0.1)     # wait for audio chunks to arrive
-                continue
-            try:
-                input_sample = input_bytes.copy()
-                result = self.transcribe_audio(input_sample)
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        if duration < self.min_audio_s:
+            return
+        if self.skip_silence(duration):
+            # same as a pass in which whisper found no speech
+            self.handle_transcription_output([], duration)
+            return
 
-                if result is None or self.language is None:
-                    self.timestamp_offset += duration
-                    time.sleep(0.25)    # wait for voice activity, result is None when no voice activity
-                    continue
-                self.handle_transcription_output(result, duration)
+        started_at = time.monotonic()
+        try:
+            result = self.transcribe_audio(input_bytes)
 
-            except Exception as e:
-                logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
-                time.sleep(0.01)
+            if result is None or self.language is None:
+                # result is None when no voice activity
+                self.timestamp_offset += duration
+                return
+            self.handle_transcription_output(result, duration)
+
+        except Exception as e:
+            logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
+        finally:
+            self.record_busy_time(started_at, duration)
+            self.save_checkpoint()
 
     def format_segment(self, start, end, text, completed=False, language=None):
         """
@@ -2132,6 +3467,7 @@ class ServeClientFasterWhisper(ServeClientBase):
                     continue
 
                 self.transcript.append(self.format_segment(start, end, text_, completed=True, language=self.language))
+                self.request_final_decode(start, end)
                 offset = min(duration, s.end)
 
         # only process the last segment if it satisfies the no_speech_thresh
@@ -2164,13 +3500,16 @@ class ServeClientFasterWhisper(ServeClientBase):
             if not len(self.text) or self.text[-1].strip().lower() != self.current_out.strip().lower():
                 self.text.append(self.current_out)
                 with self.lock:
+                    start = self.timestamp_offset
+                    end = self.timestamp_offset + min(duration, self.end_time_for_same_output)
                     self.transcript.append(self.format_segment(
-                        self.timestamp_offset,
-                        self.timestamp_offset + min(duration, self.end_time_for_same_output),
+                        start,
+                        end,
                         self.current_out,
                         completed=True,
                         language=self.language
                     ))
+                self.request_final_decode(start, end)
             self.current_out = ''
             offset = min(duration, self.end_time_for_same_output)
             self.same_output_count = 0
@@ -12,13 +12,16 @@ allows for fine-tuning the server's performance and transcription latency.
 # temporarily stores incoming audio chunks in a buffer before sending them for
 # transcription.
 
-# Maximum size of the audio buffer in seconds. If the buffer grows beyond this
-# duration, the oldest audio data is discarded to manage memory usage. This
-# can prevent run-away memory consumption if a client sends audio indefinitely.
+# Maximum size of the audio buffer in seconds. The buffer is a preallocated
+# ring buffer of this duration per client; once it is full, the oldest audio is
+# overwritten by new audio. This bounds memory usage if a client sends audio
+# indefinitely.
 MAX_BUFFER_S = 120
 
-# The duration of audio in seconds to discard from the beginning of the buffer
-# when MAX_BUFFER_S is reached. This is done to make space for new audio data.
+# Previously the duration of audio in seconds discarded from the beginning of
+# the buffer when MAX_BUFFER_S was reached. The ring buffer drops old audio
+# continuously, so this value is no longer used and only kept so existing
+# command lines keep working.
 DISCARD_BUFFER_S = 30
 
 
@@ -53,7 +56,8 @@ MIN_AUDIO_S = 1.0
 # Voice Activity Detection (VAD) Settings
 # ---------------------------------------
 # IMPORTANT: VAD has been DISABLED at the server level to prevent audio cutting issues.
-# These settings are preserved for reference but VAD will not be used regardless of values.
+# These settings are preserved for reference but VAD will not be used regardless of values,
+# except VAD_MODE = "streaming", which only decides when to transcribe and never cuts audio.
 
 # The VAD onset threshold. This value (between 0 and 1) determines how sensitive
 # the VAD is. A higher value requires a more confident prediction of speech to
@@ -65,6 +69,32 @@ VAD_ONSET = 0.5
 # chunk. This is used by the Whisper model's internal VAD.
 VAD_NO_SPEECH_THRESH = 0.9
 
+# "off" runs every transcription pass regardless of speech. "streaming" runs a
+# stateful Silero VAD over each client's audio as it arrives and skips a pass
+# only when its whole window is non-speech; audio is never cut, the window just
+# starts closer to the next speech. Uses VAD_ONSET as the speech threshold.
+VAD_MODE = "off"
+
+# Padding (in seconds) added after every detected speech region, so trailing
+# syllables and short pauses inside a sentence still count as speech.
+VAD_HANGOVER_S = 0.5
+
+# Padding (in seconds) added before every detected speech region, so word
+# onsets are never outside the transcribed window.
+VAD_PREROLL_S = 0.3
+
+# With VAD_MODE = "streaming", runs the VAD of all clients together: the new
+# 512-sample chunks of every client are classified in one batched inference
+# instead of one tiny inference per client and chunk.
+VAD_BATCHING = True
+
+# Maximum number of clients whose chunks are classified in one VAD batch.
+VAD_MAX_BATCH_SIZE = 128
+
+# Maximum time (in milliseconds) a client's VAD request waits for other
+# clients' requests to join its batch.
+VAD_MAX_WAIT_MS = 5
+
 
 # Transcription Output Management
 # -------------------------------
@@ -83,4 +113,287 @@ SHOW_PREV_OUT_THRESH_S = 5
 # If there has been no speech for this duration (in seconds), an empty string is
 # added to the transcript. This helps to visually represent a pause in the
 # conversation.
-ADD_PAUSE_THRESH_S = 3 
\ No newline at end of file
+ADD_PAUSE_THRESH_S = 3 
+
+# A client that stops sending audio without disconnecting gets no further passes,
+# so its last partial would never be completed. Once no audio arrived for this
+# many seconds, the faster_whisper backend sends that partial as a completed
+# segment. 0 to disable.
+FINALIZE_AFTER_S = 2.0
+
+
+# Streaming Mode Settings
+# -----------------------
+# These settings select how partial transcriptions are turned into completed
+# segments by the faster_whisper backend.
+
+# "update_segments" re-transcribes everything after the last completed segment
+# and completes text once Whisper emits more than one segment or repeats the
+# same output SAME_OUTPUT_THRESHOLD times. "local_agreement" decodes with word
+# timestamps, commits the words that consecutive decodes agree on, and moves the
+# decode window past them, which keeps the window short during long monologues.
+STREAMING_MODE = "update_segments"
+
+# Number of consecutive decodes that must agree on a word before it is committed
+# in "local_agreement" mode. Higher values give more stable output at the cost of
+# latency.
+LOCAL_AGREEMENT_N = 2
+
+# Two-tier transcription in "update_segments" mode: the client's model (e.g.
+# "tiny" or "base") runs every pass and produces the partials, and this model
+# decodes the audio of each segment again once it is completed. Its text then
+# replaces the fast model's under the same segment id (a new revision with delta
+# updates). The heavy model thus only runs on finished audio, once per segment.
+# Empty to disable.
+FINAL_MODEL = ""
+
+# Keeps the log-mel features of each client's audio between passes, so a pass
+# only computes the features of the audio that arrived since the previous one
+# instead of the whole window. Mostly saves CPU time on CPU-only nodes.
+FEATURE_CACHE = True
+
+
+# Language Detection Settings
+# ---------------------------
+# These settings apply to faster_whisper clients that do not set a language.
+
+# Caches the detected language per session and per (platform, meeting_id), so
+# reconnecting sessions and other sessions of the same meeting skip detection.
+LANGUAGE_CACHE = True
+
+# Minimum detection probability for a language to be cached. Detections above
+# 0.5 are still used by the session itself, just not shared.
+LANGUAGE_CACHE_MIN_PROB = 0.8
+
+# Age (in seconds) after which a cached language is detected again on the next
+# pass, so a change of language is picked up. 0 never re-checks.
+LANGUAGE_RECHECK_S = 300
+
+
+# Model Pool Settings
+# -------------------
+# These settings only apply to the faster_whisper backend in single model mode.
+# They control how many transcriptions run concurrently on the shared model.
+
+# Number of concurrent decodes. Above 1, a model pool replaces the single model
+# lock: by default one model is loaded with this many ctranslate2 workers per
+# device (weights shared), or, with MODEL_REPLICAS, this many independent copies.
+# Ignored when BATCH_INFERENCE is enabled, which serializes decoding into batches.
+MODEL_POOL_SIZE = 1
+
+# Load MODEL_POOL_SIZE independent replicas instead of one model with
+# MODEL_POOL_SIZE workers. Uses more memory, avoids any shared state.
+MODEL_REPLICAS = False
+
+# Number of CPU threads used by each decode. 0 keeps the ctranslate2 default
+# (OMP_NUM_THREADS or 4). On a CPU node, MODEL_POOL_SIZE * CPU_THREADS should
+# not exceed the number of physical cores, e.g. 8 x 4 on 32 cores.
+CPU_THREADS = 0
+
+# Devices to place the model(s) on. With several GPUs, a shared model runs
+# MODEL_POOL_SIZE workers on each of them, and replicas are spread round-robin.
+DEVICE_INDEX = [0]
+
+
+# Model Registry Settings
+# -----------------------
+# Connections asking for a model other than the single shared one (or all
+# connections when single model mode is off) get it from a process-wide
+# registry. Each model is loaded once per (model, device, compute type) and
+# shared by all connections using it.
+
+# Maximum total size in MB of the models kept in the registry. Once exceeded,
+# models no connection is using are unloaded, least recently used first.
+# 0 keeps every model loaded once used.
+MODEL_MEMORY_BUDGET_MB = 0
+
+
+# Startup Warmup Settings
+# -----------------------
+# At startup the server loads the configured models (the custom faster_whisper
+# model, PRELOAD_MODELS, or the TensorRT engine in single model mode) and runs
+# a few transcriptions on a bundled clip before accepting connections. /health
+# reports the server as not ready until this has finished, so no client pays
+# for a model download, load or cold kernels.
+
+# Enables the startup warmup.
+WARMUP = True
+
+# Additional faster_whisper models (names or paths) clients are expected to ask
+# for, loaded and warmed up at startup like the custom model.
+PRELOAD_MODELS = []
+
+# Audio transcribed during warmup.
+WARMUP_AUDIO = "assets/jfk.flac"
+
+# Number of warmup transcriptions per model. The first one is logged as the
+# first-inference latency.
+WARMUP_STEPS = 3
+
+
+# CPU Compute Type Settings
+# -------------------------
+# These settings only apply to the faster_whisper backend on a host without a
+# GPU. With CPU_COMPUTE_TYPE = "auto", every model loaded at startup is first
+# benchmarked in the int8, int8_float32 and float32 compute types ctranslate2
+# supports on this CPU, and clients load it in the fastest one whose word error
+# rate on the probe clip stays within COMPUTE_TYPE_WER_TOLERANCE of the best.
+# Models not loaded at startup use ctranslate2's "default".
+
+# "auto" to probe, or a ctranslate2 compute type used for every model.
+CPU_COMPUTE_TYPE = "auto"
+
+# Clip transcribed by the probe and its reference transcript.
+COMPUTE_TYPE_PROBE_AUDIO = "assets/jfk.flac"
+COMPUTE_TYPE_PROBE_REFERENCE = "assets/jfk.txt"
+
+# Maximum word error rate a faster compute type may add over the most accurate
+# one, as a fraction (0.02 = 2 points).
+COMPUTE_TYPE_WER_TOLERANCE = 0.02
+
+# File the probe results are kept in, per model, CPU and ctranslate2 version, so
+# later restarts skip the benchmark. Empty to probe on every start.
+COMPUTE_TYPE_CACHE = "~/.cache/whisper-live/compute_types.json"
+
+
+# Batched Inference Settings
+# --------------------------
+# These settings apply to both backends in single model mode. When enabled, the
+# audio windows of all connected clients are queued to a shared scheduler that
+# decodes them together in one encoder/decoder batch instead of one client at a
+# time behind a lock.
+
+# Enables the cross-client batch scheduler.
+BATCH_INFERENCE = False
+
+# Maximum number of client windows decoded in one batch. Larger batches raise
+# throughput on a GPU at the cost of more memory per inference call. With the
+# tensorrt backend, this must not exceed the batch size the engines were built
+# with.
+MAX_BATCH_SIZE = 8
+
+# Maximum time (in milliseconds) a window waits for other clients' windows to
+# fill up its batch. This is added to the transcription latency in the worst
+# case, so keep it small compared to MIN_AUDIO_S.
+MAX_BATCH_WAIT_MS = 50
+
+
+# Server Front-end Settings
+# -------------------------
+# These settings select how WebSocket connections are served.
+
+# By default every connection gets a receiving thread plus its own transcription
+# thread. In async mode all connections are served by one asyncio event loop and
+# only transcription passes run on a bounded pool of INFERENCE_WORKERS threads,
+# so idle or slow connections do not cost a thread each.
+ASYNC_MODE = False
+
+# Number of threads running transcription passes in async mode. With a single
+# shared model, more workers than MAX_BATCH_SIZE (batched inference) or 1-2
+# (lock-serialized inference) mostly adds waiting threads.
+INFERENCE_WORKERS = 4
+
+# Without async mode, the transcription passes of all connections can run on a
+# fixed number of shared threads instead of one transcription thread per
+# connection; 0 keeps the per-connection threads. A free worker takes the client
+# that has waited longest for a pass or has the most untranscribed audio, so
+# one busy meeting cannot starve the others.
+TRANSCRIPTION_WORKERS = 0
+
+# Seconds of waiting that one second of untranscribed audio is worth when the
+# shared workers pick the next client. Higher values favour clients that fell
+# behind over clients that waited long.
+WORKER_BACKLOG_WEIGHT = 1.0
+
+
+# Admission Control Settings
+# --------------------------
+# These settings decide when a new connection is refused. Refused clients get a
+# WAIT message, or a REDIRECT to REDIRECT_URL when it is set.
+
+# "static" refuses connections above MAX_CLIENTS only. "capacity" also measures
+# the real-time factor of the transcription passes (inference seconds per second
+# of audio) and refuses a connection when one more client would load the
+# inference capacity beyond ADMISSION_MAX_LOAD, or when clients already lag
+# ADMISSION_MAX_BACKLOG_S behind on average.
+ADMISSION_MODE = "static"
+
+# Maximum number of simultaneous connections. 0 takes the value from the first
+# client's handshake (4 if absent) in "static" mode and sets no static limit in
+# "capacity" mode.
+MAX_CLIENTS = 0
+
+# Maximum projected share of the inference capacity in use with the new client,
+# 1.0 meaning the node would just keep up with real time.
+ADMISSION_MAX_LOAD = 0.8
+
+# Maximum average audio (in seconds) per client waiting to be transcribed.
+ADMISSION_MAX_BACKLOG_S = 2.0
+
+# Period (in seconds) the real-time factor is averaged over.
+ADMISSION_WINDOW_S = 60
+
+# WebSocket URL of another node refused clients are redirected to. Empty to
+# tell them to wait instead.
+REDIRECT_URL = ""
+
+
+# Session Checkpoint Settings
+# ---------------------------
+# With REDIS_STREAM_URL set, every session's state (transcript tail, timestamp
+# offset, language and untranscribed audio) is periodically written to Redis
+# under its uid. A client reconnecting with the same uid, to this or any other
+# instance, resumes from there instead of starting from zero. Sessions are also
+# checkpointed on SIGTERM and before the self-monitor exits the process.
+
+# Enables session checkpoints.
+SESSION_CHECKPOINT = True
+
+# Minimum time (in seconds) between two checkpoints of a session. Transcripts
+# completed after the last checkpoint are re-transcribed from its audio.
+CHECKPOINT_INTERVAL_S = 5.0
+
+# Time (in seconds) a checkpoint is kept in Redis for its session to reconnect.
+CHECKPOINT_TTL_S = 300
+
+# Maximum untranscribed audio (in seconds) stored in a checkpoint, as 16-bit
+# PCM (32 KB per second).
+CHECKPOINT_MAX_AUDIO_S = 10.0
+
+# Maximum number of transcript segments stored in a checkpoint, besides those
+# not sent to the client as completed yet.
+CHECKPOINT_MAX_SEGMENTS = 50
+
+
+# Transcription Log Settings
+# --------------------------
+# Server events and transcribed segments are written to TRANSCRIPTION_LOG_DIR as
+# JSON lines by a background thread, so a slow disk never delays a
+# transcription pass. Once TRANSCRIPTION_LOG_QUEUE_SIZE records are waiting,
+# new ones are dropped instead.
+
+# Enables the transcription log.
+TRANSCRIPTION_LOG = True
+
+# Directory of the log files.
+TRANSCRIPTION_LOG_DIR = "transcription_logs"
+
+# "size" starts a new file once the current one reaches TRANSCRIPTION_LOG_MAX_MB,
+# "time" at every TRANSCRIPTION_LOG_WHEN ("midnight", "h", ...).
+TRANSCRIPTION_LOG_ROTATION = "size"
+TRANSCRIPTION_LOG_MAX_MB = 50
+TRANSCRIPTION_LOG_WHEN = "midnight"
+
+# Number of rotated files kept; older ones are deleted, which bounds the disk
+# usage to about (TRANSCRIPTION_LOG_BACKUPS + 1) * TRANSCRIPTION_LOG_MAX_MB.
+TRANSCRIPTION_LOG_BACKUPS = 5
+
+# Every completed segment is logged once. Of the incomplete segments sent to a
+# client, every TRANSCRIPTION_LOG_PARTIAL_EVERY-th is logged; 0 logs none.
+TRANSCRIPTION_LOG_PARTIAL_EVERY = 10
+
+# Logs completed segments only, regardless of TRANSCRIPTION_LOG_PARTIAL_EVERY.
+TRANSCRIPTION_LOG_COMPLETED_ONLY = False
+
+# Maximum number of log records waiting to be written.
+TRANSCRIPTION_LOG_QUEUE_SIZE = 10000
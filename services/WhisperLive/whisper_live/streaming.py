@@ -0,0 +1,136 @@
+import re
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+
+class TimedWord(NamedTuple):
+    """A word with absolute start/end times in seconds from the start of the stream."""
+    start: float
+    end: float
+    word: str
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class LocalAgreement:
+    """
+    LocalAgreement-n commit policy for streaming Whisper decoding.
+
+    Every decode of the current audio window produces a hypothesis, a list of timed words. Words are
+    committed once they form the longest common prefix of the last `n` hypotheses, i.e. once `n`
+    consecutive decodes agree on them. Committed words are final; the rest of the newest hypothesis
+    is tentative and may still change.
+
+    The caller is expected to move the start of the decode window to `last_committed_time` after a
+    commit, so the window only covers audio that is not final yet. Only the last
+    `max_committed_words` committed words are kept, for the overlap check and the prompt context;
+    the caller keeps the transcript itself.
+    """
+
+    # words starting this long before the last committed word end are treated as overlap
+    OVERLAP_TOLERANCE_S = 0.1
+    # longest n-gram checked when removing words repeated from the committed tail
+    MAX_OVERLAP_NGRAM = 5
+
+    def __init__(self, n: int = 2, max_committed_words: int = 128):
+        """
+        Args:
+            n (int): Number of consecutive hypotheses that must agree before a word is committed.
+            max_committed_words (int): Number of most recent committed words kept in `committed`.
+        """
+        if n < 2:
+            raise ValueError(f"LocalAgreement needs n >= 2, got {n}")
+        self.n = n
+        self.max_committed_words = max_committed_words
+        self.committed: List[TimedWord] = []     # tail of the committed words, oldest first
+        self.last_committed_time = 0.0
+        self._history = deque(maxlen=n - 1)
+        self._tentative: List[TimedWord] = []
+
+    def insert(self, words: List[TimedWord]) -> List[TimedWord]:
+        """
+        Adds the hypothesis of a new decode and returns the words committed by it.
+
+        Args:
+            words (List[TimedWord]): Words of the decode with absolute timestamps.
+
+        Returns:
+            List[TimedWord]: Newly committed words, in order. Empty if the decodes do not agree yet.
+        """
+        hypothesis = [w for w in words if w.start > self.last_committed_time - self.OVERLAP_TOLERANCE_S]
+        hypothesis = self._drop_committed_overlap(hypothesis)
+
+        agreed = len(hypothesis)
+        if len(self._history) < self.n - 1:
+            agreed = 0
+        for previous in self._history:
+            agreed = min(agreed, self._common_prefix_length(previous, hypothesis))
+
+        newly_committed = hypothesis[:agreed]
+        if newly_committed:
+            self.committed.extend(newly_committed)
+            if len(self.committed) > self.max_committed_words:
+                del self.committed[:-self.max_committed_words]
+            self.last_committed_time = newly_committed[-1].end
+            # previous hypotheses are re-based on the new commit point
+            self._history = deque(
+                (h[agreed:] for h in self._history), maxlen=self.n - 1)
+        self._tentative = hypothesis[agreed:]
+        self._history.append(self._tentative)
+        return newly_committed
+
+    @property
+    def tentative(self) -> List[TimedWord]:
+        """Uncommitted words of the most recent hypothesis."""
+        return self._tentative
+
+    def committed_text(self, max_chars: Optional[int] = None) -> str:
+        """
+        Text of the kept committed words, optionally limited to the last `max_chars` characters.
+
+        Only as many words as can make up `max_chars` are joined, so the cost does not grow with
+        the number of kept words.
+        """
+        words = self.committed
+        if max_chars is not None:
+            # every word has at least one character
+            words = words[-max_chars:]
+        text = "".join(w.word for w in words)
+        if max_chars is not None and len(text) > max_chars:
+            text = text[-max_chars:]
+            # do not start the prompt in the middle of a word
+            space = text.find(" ")
+            if space > 0:
+                text = text[space:]
+        return text.strip()
+
+    def reset(self, committed_time: float = 0.0):
+        """Forgets all hypotheses, e.g. after the audio window was clipped past uncommitted audio."""
+        self._history.clear()
+        self._tentative = []
+        self.last_committed_time = committed_time
+
+    def _drop_committed_overlap(self, hypothesis):
+        # a re-decode right after the commit point often repeats the last committed words
+        if not self.committed or not hypothesis:
+            return hypothesis
+        if abs(hypothesis[0].start - self.last_committed_time) >= 1.0:
+            return hypothesis
+        limit = min(len(self.committed), len(hypothesis), self.MAX_OVERLAP_NGRAM)
+        for size in range(limit, 0, -1):
+            tail = [_normalize(w.word) for w in self.committed[-size:]]
+            head = [_normalize(w.word) for w in hypothesis[:size]]
+            if tail == head:
+                return hypothesis[size:]
+        return hypothesis
+
+    @staticmethod
+    def _common_prefix_length(a, b):
+        length = 0
+        for x, y in zip(a, b):
+            if _normalize(x.word) != _normalize(y.word):
+                break
+            length += 1
+        return length
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import math
 import os
 from collections import defaultdict
 from functools import lru_cache
@@ -127,6 +128,95 @@ def mel_filters(device,
         return torch.from_numpy(f[f"mel_{n_mels}"]).to(device)
 
 
+class LogMelFrontend:
+    """
+    Log-Mel front-end of the TensorRT backend.
+
+    Produces the same features as `log_mel_spectrogram`, which pads every window to 30 seconds
+    before its STFT, without computing the spectrum of the padding: the STFT only covers the
+    audio, and the frames after it, whose STFT windows hold nothing but zeros, are filled with
+    their known value. A 2 second window thus costs a 2 second STFT instead of a 30 second one.
+
+    The Hann window and the mel filterbank are cached per device, and a list of windows is
+    transformed in one stacked STFT.
+    """
+
+    def __init__(self, n_mels: int = 80, n_frames: int = N_SAMPLES // HOP_LENGTH,
+                 device: Optional[Union[str, torch.device]] = None, mel_filters_dir: str = None,
+                 filters: Optional[torch.Tensor] = None):
+        """
+        Args:
+            n_mels (int): Number of Mel-frequency filters.
+            n_frames (int): Number of frames the encoder expects, windows are padded or trimmed to it.
+            device: Device the features are computed on, the device of the audio if None.
+            mel_filters_dir (str): Directory of `mel_filters.npz`, see `mel_filters`.
+            filters (torch.Tensor, optional): Filterbank of shape (n_mels, N_FFT // 2 + 1) to use
+                instead of the one in `mel_filters_dir`.
+        """
+        self.n_mels = n_mels
+        self.n_frames = n_frames
+        self.n_samples = n_frames * HOP_LENGTH
+        self.device = device
+        self.mel_filters_dir = mel_filters_dir
+        self._filters = {} if filters is None else {None: filters}
+        self._windows = {}
+
+    def window(self, device) -> torch.Tensor:
+        """The Hann window of the STFT on `device`."""
+        window = self._windows.get(device)
+        if window is None:
+            window = self._windows[device] = torch.hann_window(N_FFT, device=device)
+        return window
+
+    def filters(self, device) -> torch.Tensor:
+        """The mel filterbank on `device`."""
+        filters = self._filters.get(device)
+        if filters is None:
+            if None in self._filters:
+                filters = self._filters[None].to(device=device, dtype=torch.float32)
+            else:
+                filters = mel_filters(device, self.n_mels, self.mel_filters_dir)
+            self._filters[device] = filters
+        return filters
+
+    def __call__(self, audios: List[Union[np.ndarray, torch.Tensor]]) -> Tuple[torch.Tensor, List[float]]:
+        """
+        Computes the features of a list of 16 kHz windows.
+
+        Returns:
+            Tuple[torch.Tensor, List[float]]: The features, shape (len(audios), n_mels, n_frames),
+                and the duration of every window in seconds before padding.
+        """
+        durations = [audio.shape[-1] / SAMPLE_RATE for audio in audios]
+        lengths = [min(audio.shape[-1], self.n_samples) for audio in audios]
+        device = self.device
+        if device is None:
+            device = audios[0].device if torch.is_tensor(audios[0]) else torch.device("cpu")
+        device = torch.device(device)
+
+        # zeros after the audio up to a whole STFT window past the last hop, so the frames after
+        # the computed ones would only see zeros; the reflection at the end then reflects zeros too
+        padded = max(lengths) + (-max(lengths)) % HOP_LENGTH + N_FFT
+        if padded >= self.n_samples:
+            padded = self.n_samples
+        batch = torch.zeros((len(audios), padded), dtype=torch.float32, device=device)
+        for row, audio, length in zip(batch, audios, lengths):
+            row[:length] = torch.as_tensor(audio[:length]).to(device=device, dtype=torch.float32)
+
+        stft = torch.stft(batch, N_FFT, HOP_LENGTH, window=self.window(device), return_complex=True)
+        n_computed = min(stft.shape[-1], self.n_frames)
+        magnitudes = stft[..., :n_computed].abs().square_()
+        log_spec = torch.clamp(self.filters(device) @ magnitudes, min=1e-10).log10()
+
+        features = torch.full((len(audios), self.n_mels, self.n_frames), math.log10(1e-10),
+                              dtype=torch.float32, device=device)
+        features[..., :n_computed] = log_spec
+        log_max = log_spec.amax(dim=(1, 2), keepdim=True)
+        torch.maximum(features, log_max - 8.0, out=features)
+        features.add_(4.0).div_(4.0)
+        return features, durations
+
+
 def log_mel_spectrogram(
     audio: Union[str, np.ndarray, torch.Tensor],
     n_mels: int,
@@ -592,6 +592,244 @@ class BatchedInferencePipeline:
         pbar.close()
         self.last_speech_timestamp = 0.0
 
+    def transcribe_batch(
+        self,
+        audios: List[np.ndarray],
+        languages: List[Optional[str]],
+        task: str = "transcribe",
+        initial_prompts: Optional[List[Optional[str]]] = None,
+        beam_size: int = 5,
+        patience: float = 1,
+        length_penalty: float = 1,
+        repetition_penalty: float = 1,
+        no_repeat_ngram_size: int = 0,
+        temperature: float = 0.0,
+        log_prob_threshold: Optional[float] = -1.0,
+        no_speech_threshold: Optional[float] = 0.6,
+        suppress_blank: bool = True,
+        suppress_tokens: Optional[List[int]] = [-1],
+        without_timestamps: bool = False,
+        max_initial_timestamp: float = 1.0,
+        word_timestamps: bool = False,
+        prepend_punctuations: str = "\"'“¿([{-",
+        append_punctuations: str = "\"'.。,，!！?？:：”)]}、",
+        max_new_tokens: Optional[int] = None,
+    ) -> List[Tuple[List[Segment], Optional[TranscriptionInfo]]]:
+        """Transcribes several independent audio windows with one encoder and one decoder call.
+
+        Unlike `transcribe`, every entry is a separate stream (e.g. a different client) with its own
+        language and prompt. Each window must be at most 30 seconds long; it is padded to the
+        encoder input size and all windows are stacked into a single batch. Windows without a
+        language get it detected from the shared encoder output. Temperature fallback is not
+        applied, only `temperature` is used.
+
+        Arguments:
+          audios: List of 1D float32 waveforms sampled at 16kHz.
+          languages: Language code for every window, or None to detect it.
+          task: Task to execute (transcribe or translate), shared by the batch.
+          initial_prompts: Optional text prompt for every window.
+          The remaining arguments have the same meaning as in `WhisperModel.transcribe`.
+
+        Returns:
+          A list with one (segments, info) tuple per input window, in input order. Windows without
+          audio or without speech yield an empty segment list.
+        """
+        model = self.model
+        batch_size = len(audios)
+        if batch_size == 0:
+            return []
+        initial_prompts = initial_prompts or [None] * batch_size
+        n_samples = model.feature_extractor.n_samples
+        for audio in audios:
+            if audio.shape[0] > n_samples:
+                raise ValueError(
+                    f"transcribe_batch expects windows of at most {n_samples} samples, "
+                    f"got {audio.shape[0]}"
+                )
+
+        features = []
+        content_frames = []
+        for audio in audios:
+            feature = model.feature_extractor(audio)
+            content_frames.append(min(feature.shape[-1] - 1, model.feature_extractor.nb_max_frames))
+            features.append(pad_or_trim(feature))
+        features = np.stack(features)
+        encoder_output = model.encode(features)
+
+        language_probabilities = [1.0] * batch_size
+        all_language_probs = [None] * batch_size
+        languages = list(languages)
+        if any(language is None for language in languages):
+            if not model.model.is_multilingual:
+                languages = [language or "en" for language in languages]
+            else:
+                detected = model.model.detect_language(encoder_output)
+                for i, results in enumerate(detected):
+                    if languages[i] is None:
+                        probs = [(token[2:-2], prob) for token, prob in results]
+                        languages[i], language_probabilities[i] = probs[0]
+                        all_language_probs[i] = probs
+
+        tokenizers = [
+            Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task=task, language=language)
+            for language in languages
+        ]
+
+        # ctranslate2 requires the start-of-transcript token at the same position in every prompt,
+        # so the previous-text context is trimmed to the shortest one in the batch.
+        previous_tokens = [
+            tokenizer.encode(" " + prompt.strip()) if prompt else []
+            for tokenizer, prompt in zip(tokenizers, initial_prompts)
+        ]
+        context_length = min(len(tokens) for tokens in previous_tokens)
+        context_length = min(context_length, model.max_length // 2 - 1)
+        prompts = [
+            model.get_prompt(
+                tokenizer,
+                tokens[len(tokens) - context_length:] if context_length else [],
+                without_timestamps=without_timestamps,
+            )
+            for tokenizer, tokens in zip(tokenizers, previous_tokens)
+        ]
+
+        max_length = model.max_length
+        if max_new_tokens is not None:
+            max_length = min(max_length, max(len(prompt) for prompt in prompts) + max_new_tokens)
+
+        results = model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=beam_size,
+            patience=patience,
+            length_penalty=length_penalty,
+            repetition_penalty=repetition_penalty,
+            no_repeat_ngram_size=no_repeat_ngram_size,
+            max_length=max_length,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=suppress_blank,
+            suppress_tokens=(
+                get_suppressed_tokens(tokenizers[0], suppress_tokens)
+                if suppress_tokens
+                else suppress_tokens
+            ),
+            max_initial_timestamp_index=int(round(max_initial_timestamp / model.time_precision)),
+            sampling_temperature=temperature,
+        )
+
+        options = TranscriptionOptions(
+            beam_size=beam_size,
+            best_of=1,
+            patience=patience,
+            length_penalty=length_penalty,
+            repetition_penalty=repetition_penalty,
+            no_repeat_ngram_size=no_repeat_ngram_size,
+            log_prob_threshold=log_prob_threshold,
+            no_speech_threshold=no_speech_threshold,
+            compression_ratio_threshold=None,
+            condition_on_previous_text=False,
+            prompt_reset_on_temperature=0.5,
+            temperatures=[temperature],
+            initial_prompt=None,
+            prefix=None,
+            suppress_blank=suppress_blank,
+            suppress_tokens=suppress_tokens,
+            without_timestamps=without_timestamps,
+            max_initial_timestamp=max_initial_timestamp,
+            word_timestamps=word_timestamps,
+            prepend_punctuations=prepend_punctuations,
+            append_punctuations=append_punctuations,
+            multilingual=False,
+            max_new_tokens=max_new_tokens,
+            clip_timestamps="0",
+            hallucination_silence_threshold=None,
+            hotwords=None,
+        )
+
+        split_outputs = []
+        for i, result in enumerate(results):
+            tokens = result.sequences_ids[0]
+            seq_len = len(tokens)
+            avg_logprob = result.scores[0] * (seq_len**length_penalty) / (seq_len + 1)
+            is_silence = (
+                no_speech_threshold is not None
+                and result.no_speech_prob > no_speech_threshold
+                and (log_prob_threshold is None or avg_logprob <= log_prob_threshold)
+            )
+            if is_silence or content_frames[i] <= 0:
+                split_outputs.append([])
+                continue
+            subsegments, _, _ = model._split_segments_by_timestamps(
+                tokenizer=tokenizers[i],
+                tokens=tokens,
+                time_offset=0.0,
+                segment_size=content_frames[i],
+                segment_duration=content_frames[i] * model.feature_extractor.time_per_frame,
+                seek=0,
+            )
+            for subsegment in subsegments:
+                subsegment["avg_logprob"] = avg_logprob
+                subsegment["no_speech_prob"] = result.no_speech_prob
+            split_outputs.append(
+                [subsegment for subsegment in subsegments if tokenizers[i].decode(subsegment["tokens"]).strip()]
+            )
+
+        if word_timestamps:
+            # word alignment needs one tokenizer per call, so align each language separately
+            for language in set(languages):
+                indices = [i for i in range(batch_size) if languages[i] == language and split_outputs[i]]
+                if not indices:
+                    continue
+                group_output = encoder_output
+                if len(indices) != batch_size:
+                    group_output = model.encode(features[indices])
+                model.add_word_timestamps(
+                    [split_outputs[i] for i in indices],
+                    tokenizers[indices[0]],
+                    group_output,
+                    [content_frames[i] for i in indices],
+                    prepend_punctuations,
+                    append_punctuations,
+                    last_speech_timestamp=0.0,
+                )
+
+        outputs = []
+        for i in range(batch_size):
+            segments = []
+            for subsegment in split_outputs[i]:
+                text = tokenizers[i].decode(subsegment["tokens"])
+                segments.append(
+                    Segment(
+                        id=len(segments),
+                        seek=subsegment["seek"],
+                        start=round(subsegment["start"], 3),
+                        end=round(subsegment["end"], 3),
+                        text=text,
+                        tokens=subsegment["tokens"],
+                        avg_logprob=subsegment["avg_logprob"],
+                        compression_ratio=get_compression_ratio(text),
+                        no_speech_prob=subsegment["no_speech_prob"],
+                        words=(
+                            [Word(**word) for word in subsegment.get("words", [])]
+                            if word_timestamps
+                            else None
+                        ),
+                        temperature=temperature,
+                    )
+                )
+            duration = audios[i].shape[0] / model.feature_extractor.sampling_rate
+            info = TranscriptionInfo(
+                language=languages[i],
+                language_probability=language_probabilities[i],
+                duration=duration,
+                duration_after_vad=duration,
+                all_language_probs=all_language_probs[i],
+                transcription_options=options,
+                vad_options=None,
+            )
+            outputs.append((segments, info))
+        return outputs
+
 
 class WhisperModel:
     def __init__(
@@ -653,6 +891,7 @@ class WhisperModel:
                 cache_dir=download_root,
             )
 
+        self.model_path = model_path
         self.model = ctranslate2.models.Whisper(
             model_path,
             device=device,
@@ -755,6 +994,7 @@ class WhisperModel:
         hotwords: Optional[str] = None,
         language_detection_threshold: Optional[float] = 0.5,
         language_detection_segments: int = int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10')), 
+        features: Optional[np.ndarray] = None,
     ) -> Tuple[Iterable[Segment], TranscriptionInfo]:
         """Transcribes an input file.
 
@@ -824,6 +1064,8 @@ class WhisperModel:
           language_detection_threshold: If the maximum probability of the language tokens is higher
            than this value, the language is detected.
           language_detection_segments: Number of segments to consider for the language detection.
+          features: Precomputed log-mel features of `audio`, e.g. from a `FeatureCache`, used
+            instead of running the feature extractor. Ignored when `vad_filter` removes audio.
         Returns:
           A tuple with:
 
@@ -881,7 +1123,8 @@ class WhisperModel:
             speech_chunks = None
         if audio.shape[0] == 0:
             return None, None
-        features = self.feature_extractor(audio, chunk_length=chunk_length)
+        if features is None or speech_chunks is not None:
+            features = self.feature_extractor(audio, chunk_length=chunk_length)
 
         encoder_output = None
         all_language_probs = None
@@ -903,15 +1146,20 @@ class WhisperModel:
                     if start_timestamp * self.frames_per_second < content_frames
                     else 0
                 )
+                # detect on the frames generate_segments decodes, so that the encoder output of
+                # the first detection window is the one of the first decoding window and is reused
                 (
                     language,
                     language_probability,
                     all_language_probs,
-                ) = self.detect_language(
-                    features=features[..., seek:],
-                    language_detection_segments=language_detection_segments,
-                    language_detection_threshold=language_detection_threshold,
+                    encoder_output,
+                ) = self._detect_language_features(
+                    features[..., seek : content_frames or None],
+                    language_detection_segments,
+                    language_detection_threshold,
                 )
+                if seek > 0:
+                    encoder_output = None
 
                 self.logger.info(
                     "Detected language '%s' with probability %.2f",
@@ -1780,15 +2028,33 @@ class WhisperModel:
             ]
             features = self.feature_extractor(audio)
 
+        language, language_probability, all_language_probs, _ = self._detect_language_features(
+            features, language_detection_segments, language_detection_threshold
+        )
+        return language, language_probability, all_language_probs
+
+    def _detect_language_features(
+        self,
+        features: np.ndarray,
+        language_detection_segments: int,
+        language_detection_threshold: float,
+    ) -> Tuple[str, float, List[Tuple[str, float]], ctranslate2.StorageView]:
+        """
+        Detects the language of `features` like `detect_language`, also returning the encoder
+        output of the first window so that a decode of the same window does not encode it again.
+        """
         features = features[
             ..., : language_detection_segments * self.feature_extractor.nb_max_frames
         ]
 
         detected_language_info = {}
+        first_encoder_output = None
         for i in range(0, features.shape[-1], self.feature_extractor.nb_max_frames):
             encoder_output = self.encode(
                 pad_or_trim(features[..., i : i + self.feature_extractor.nb_max_frames])
             )
+            if first_encoder_output is None:
+                first_encoder_output = encoder_output
             # results is a list of tuple[str, float] with language names and probabilities.
             results = self.model.detect_language(encoder_output)[0]
 
@@ -1808,7 +2074,7 @@ class WhisperModel:
             )
             language_probability = max(detected_language_info[language])
 
-        return language, language_probability, all_language_probs
+        return language, language_probability, all_language_probs, first_encoder_output
 
 
 def restore_speech_timestamps(
@@ -7,9 +7,8 @@ from typing import Union
 
 import torch
 import numpy as np
-import torch.nn.functional as F
 from whisper.tokenizer import get_tokenizer
-from whisper_live.tensorrt_utils import (mel_filters, load_audio_wav_format, pad_or_trim, load_audio)
+from whisper_live.tensorrt_utils import (LogMelFrontend, load_audio_wav_format, load_audio, log_mel_spectrogram)
 
 import tensorrt_llm
 import tensorrt_llm.logger as logger
@@ -277,7 +276,8 @@ class WhisperTRTLLM(object):
             language=language,
             task=task,
         )
-        self.filters = mel_filters(self.device, self.encoder.n_mels, assets_dir)
+        self.assets_dir = assets_dir
+        self.frontend = LogMelFrontend(self.encoder.n_mels, device=self.device, mel_filters_dir=assets_dir)
 
     def log_mel_spectrogram(
         self,
@@ -307,35 +307,34 @@ class WhisperTRTLLM(object):
         torch.Tensor, shape = (80 or 128, n_frames)
             A Tensor that contains the Mel spectrogram
         """
-        if not torch.is_tensor(audio):
-            if isinstance(audio, str):
-                if audio.endswith('.wav'):
-                    audio, _ = load_audio_wav_format(audio)
-                else:
-                    audio = load_audio(audio)
-            assert isinstance(audio, np.ndarray), f"Unsupported audio type: {type(audio)}"
-            duration = audio.shape[-1] / SAMPLE_RATE
-            audio = pad_or_trim(audio, N_SAMPLES)
-            audio = audio.astype(np.float32)
-            audio = torch.from_numpy(audio)
-
-        if self.device is not None:
-            audio = audio.to(self.device)
         if padding > 0:
-            audio = F.pad(audio, (0, padding))
-        window = torch.hann_window(N_FFT).to(audio.device)
-        stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=window, return_complex=True)
-        magnitudes = stft[..., :-1].abs()**2
-
-        mel_spec = self.filters @ magnitudes
-
-        log_spec = torch.clamp(mel_spec, min=1e-10).log10()
-        log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
-        log_spec = (log_spec + 4.0) / 4.0
+            return log_mel_spectrogram(audio, self.n_mels, padding, self.device, return_duration,
+                                       mel_filters_dir=self.assets_dir)
+        if isinstance(audio, str):
+            if audio.endswith('.wav'):
+                audio, _ = load_audio_wav_format(audio)
+            else:
+                audio = load_audio(audio)
+        assert isinstance(audio, (np.ndarray, torch.Tensor)), f"Unsupported audio type: {type(audio)}"
+        features, durations = self.frontend([audio])
         if return_duration:
-            return log_spec, duration
+            return features[0], durations[0]
         else:
-            return log_spec
+            return features[0]
+
+    def log_mel_spectrograms(self, audios):
+        """
+        Computes the log-Mel spectrograms of a list of waveforms in one stacked STFT.
+
+        Returns:
+            Tuple[torch.Tensor, List[float]]: The spectrograms, shape (len(audios), n_mels, 3000),
+                and the duration of every waveform in seconds.
+        """
+        return self.frontend(audios)
+
+    def encode_prompt(self, text_prefix):
+        """Token ids of a decoder prompt made of special tokens such as `<|startoftranscript|>`."""
+        return self.tokenizer.encode(text_prefix, allowed_special=set(self.tokenizer.special_tokens.keys()))
 
     def process_batch(
             self,
@@ -344,12 +343,17 @@ class WhisperTRTLLM(object):
             text_prefix="<|startoftranscript|><|en|><|transcribe|><|notimestamps|>",
             num_beams=1,
             max_new_tokens=96):
-        prompt_id = self.tokenizer.encode(
-            text_prefix, allowed_special=set(self.tokenizer.special_tokens.keys()))
+        """
+        Decodes a batch of mel spectrograms.
 
-        prompt_id = torch.tensor(prompt_id)
+        `text_prefix` is either one prompt shared by the whole batch or one prompt per spectrogram;
+        the prompts of a batch must encode to the same number of tokens.
+        """
         batch_size = mel.shape[0]
-        decoder_input_ids = prompt_id.repeat(batch_size, 1)
+        if isinstance(text_prefix, str):
+            decoder_input_ids = torch.tensor(self.encode_prompt(text_prefix)).repeat(batch_size, 1)
+        else:
+            decoder_input_ids = torch.tensor([self.encode_prompt(prefix) for prefix in text_prefix])
 
         encoder_output, encoder_output_lengths = self.encoder.get_audio_features(mel, mel_input_lengths)
         encoder_max_input_length = torch.max(encoder_output_lengths).item()
@@ -0,0 +1,122 @@
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Iterable, Optional
+
+from whisper_live import metrics
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats a record as one line of JSON.
+
+    Records logged with ``extra={"event": {...}}`` are written as that dict plus a timestamp, other
+    records as their level, logger and message.
+    """
+
+    def format(self, record):
+        entry = {"ts": datetime.datetime.utcfromtimestamp(record.created).isoformat() + "Z"}
+        event = getattr(record, "event", None)
+        if event is not None:
+            entry.update(event)
+        else:
+            entry.update(level=record.levelname, logger=record.name, message=record.getMessage())
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks nor formats on the logging thread.
+
+    Records are formatted by the listener thread, so a slow disk never holds up the thread that
+    logs, and are dropped once `maxsize` records are waiting instead of growing memory without
+    bound.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.listener = None
+        self.dropped = 0
+
+    def prepare(self, record):
+        # messages with arguments and tracebacks are resolved now, their objects may change later
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.TRANSCRIPTION_LOG_DROPPED.inc()
+
+    def close(self):
+        # called by logging.shutdown at exit: writes the queued records and stops the listener
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+        super().close()
+
+    def stats(self) -> dict:
+        """Queue statistics for the health endpoint."""
+        return {"queued": self.queue.qsize(), "dropped": self.dropped}
+
+
+def create_file_handler(path: str, rotation: str = "size", max_bytes: int = 50 * 2 ** 20,
+                        when: str = "midnight", backup_count: int = 5) -> logging.Handler:
+    """
+    Creates a rotating file handler writing JSON lines to `path`.
+
+    Args:
+        rotation (str): "size" rotates once the file reaches `max_bytes`, "time" at the interval
+            given by `when` (see logging.handlers.TimedRotatingFileHandler).
+        backup_count (int): Number of rotated files kept.
+    """
+    if rotation == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(path, when=when, backupCount=backup_count,
+                                                            encoding="utf-8", delay=True)
+    else:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                       encoding="utf-8", delay=True)
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+def configure_transcription_log(logger_names: Iterable[str], log_dir: str, rotation: str = "size",
+                                max_bytes: int = 50 * 2 ** 20, when: str = "midnight", backup_count: int = 5,
+                                queue_size: int = 10000,
+                                filename: str = "transcription.jsonl") -> Optional[NonBlockingQueueHandler]:
+    """
+    Sends the records of `logger_names` to a rotating JSON lines file written by a background thread.
+
+    The queued records are written and the listener thread is stopped when the handler is closed,
+    which logging does when the process exits.
+
+    Returns:
+        NonBlockingQueueHandler: The handler added to the loggers, None if the file cannot be created.
+    """
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = create_file_handler(os.path.join(log_dir, filename), rotation=rotation,
+                                           max_bytes=max_bytes, when=when, backup_count=backup_count)
+    except OSError as e:
+        logging.error(f"Transcription log disabled, cannot write to {log_dir}: {e}")
+        return None
+
+    handler = NonBlockingQueueHandler(queue_size)
+    listener = logging.handlers.QueueListener(handler.queue, file_handler)
+    listener.start()
+    handler.listener = listener
+    for name in logger_names:
+        logging.getLogger(name).addHandler(handler)
+    return handler
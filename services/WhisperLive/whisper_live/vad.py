@@ -1,10 +1,14 @@
 import os
 import subprocess
+import threading
+from collections import deque
 import torch
 import numpy as np
 import onnxruntime
 import warnings
 
+from whisper_live.batching import BatchScheduler
+
 
 class VoiceActivityDetection():
 
@@ -90,6 +94,27 @@ class VoiceActivityDetection():
         out = torch.from_numpy(out)
         return out
 
+    def run_chunks(self, chunks: np.ndarray, state: np.ndarray, context: np.ndarray, sr: int = 16000):
+        """
+        Runs the model on one 512-sample chunk (256 at 8 kHz) of each of a batch of streams.
+
+        Unlike `__call__`, the recurrent state and the context are passed in and returned instead of
+        kept on the instance, and no torch tensors are involved, so one session can serve any number
+        of streams, one at a time or batched.
+
+        Args:
+            chunks (np.ndarray): float32 array of shape (batch, 512).
+            state (np.ndarray): float32 array of shape (2, batch, 128), zeros for new streams.
+            context (np.ndarray): float32 array of shape (batch, 64), the last samples of the previous
+                chunks, zeros for new streams.
+
+        Returns:
+            tuple: Speech probabilities of shape (batch,), the new state and the new context.
+        """
+        x = np.concatenate([context, chunks], axis=1)
+        out, state = self.session.run(None, {"input": x, "state": state, "sr": np.array(sr, dtype=np.int64)})
+        return out[:, 0], state, x[:, -context.shape[1]:]
+
     def audio_forward(self, x, sr: int):
         outs = []
         x, sr = self._validate_input(x, sr)
@@ -155,3 +180,201 @@ class VoiceActivityDetector:
         """
         speech_probs = self.model.audio_forward(torch.from_numpy(audio_frame.copy()), self.frame_rate)[0]
         return torch.any(speech_probs > self.threshold).item()
+
+
+class StreamingVoiceActivityDetector:
+    """
+    Voice activity detection over the continuous audio of one client.
+
+    Audio is classified in 512-sample chunks as it arrives, keeping the Silero state between calls,
+    so every sample is looked at once instead of re-running the model over whole frames. Speech is
+    tracked as regions on the absolute sample timeline of the client's audio buffer. A region starts
+    when the speech probability reaches `threshold` and ends once it has stayed below `neg_threshold`
+    for `min_silence_s`. When a region is queried it is padded by `preroll_s` before and `hangover_s`
+    after, so word onsets and trailing syllables are always counted as speech.
+
+    The ONNX session is shared by all detectors; each detector only holds its own state.
+    """
+
+    MODEL = None
+    MODEL_LOCK = threading.Lock()
+
+    def __init__(self, threshold=0.5, neg_threshold=None, min_silence_s=0.1, preroll_s=0.3,
+                 hangover_s=0.5, frame_rate=16000, model=None, service=None):
+        """
+        Args:
+            threshold (float): Speech probability at which speech starts.
+            neg_threshold (float, optional): Probability below which speech may end. Defaults to
+                `threshold - 0.15`, as in Silero's own `get_speech_timestamps`.
+            min_silence_s (float): Silence needed to end a speech region.
+            preroll_s (float): Padding added before every speech region.
+            hangover_s (float): Padding added after every speech region.
+            frame_rate (int): Sample rate of the audio, 16000 or 8000.
+            model (VoiceActivityDetection, optional): The model, defaults to the shared one.
+            service (BatchedVADService, optional): Runs the model batched with other streams' chunks.
+        """
+        self.service = service
+        self.model = model or (service.model if service is not None else self.shared_model())
+        self.threshold = threshold
+        self.neg_threshold = threshold - 0.15 if neg_threshold is None else neg_threshold
+        self.frame_rate = frame_rate
+        self.chunk_size = 512 if frame_rate == 16000 else 256
+        self.context_size = 64 if frame_rate == 16000 else 32
+        self.min_silence = int(min_silence_s * frame_rate)
+        self.preroll = int(preroll_s * frame_rate)
+        self.hangover = int(hangover_s * frame_rate)
+        self.reset(0)
+
+    @classmethod
+    def shared_model(cls):
+        with cls.MODEL_LOCK:
+            if cls.MODEL is None:
+                cls.MODEL = VoiceActivityDetection()
+            return cls.MODEL
+
+    def reset(self, position):
+        """Forgets all state and continues classifying from sample `position`."""
+        self.position = position            # next sample to classify
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros((1, self.context_size), dtype=np.float32)
+        self.regions = deque()              # closed (start, end) speech regions, unpadded
+        self.speech_start = None            # start of the ongoing speech region
+        self.silence_start = None           # start of the silence that may end it
+
+    def accept(self, audio: np.ndarray, start_index: int):
+        """
+        Classifies the whole chunks of `audio`, which starts at sample `start_index`.
+
+        Samples before `position` are skipped and a trailing partial chunk is left for the next call,
+        so callers can pass everything from `position` to the end of their buffer each time. If
+        `start_index` is past `position` (audio was dropped), the state is reset there.
+
+        Returns:
+            int: The new `position`.
+        """
+        if start_index > self.position:
+            self.close_region(self.position)
+            self.state[:] = 0
+            self.context[:] = 0
+            self.position = start_index
+        offset = self.position - start_index
+        n_chunks = (len(audio) - offset) // self.chunk_size
+        if n_chunks <= 0:
+            return self.position
+        chunks = audio[offset:offset + n_chunks * self.chunk_size].reshape(n_chunks, self.chunk_size)
+        for prob in self.classify(chunks.astype(np.float32, copy=False)):
+            self.update(float(prob), self.position)
+            self.position += self.chunk_size
+        return self.position
+
+    def classify(self, chunks: np.ndarray) -> np.ndarray:
+        """Speech probability of each of the consecutive `chunks`, carrying the state across them."""
+        if self.service is not None:
+            probs, self.state, self.context = self.service.process(chunks, self.state, self.context)
+            return probs
+        probs = np.empty(len(chunks), dtype=np.float32)
+        for i, chunk in enumerate(chunks):
+            prob, self.state, self.context = self.model.run_chunks(
+                chunk[None], self.state, self.context, self.frame_rate)
+            probs[i] = prob[0]
+        return probs
+
+    def update(self, prob, chunk_start):
+        """Advances the speech region state machine with the probability of one chunk."""
+        if prob >= self.threshold:
+            self.silence_start = None
+            if self.speech_start is None:
+                self.speech_start = chunk_start
+        elif self.speech_start is not None and prob < self.neg_threshold:
+            if self.silence_start is None:
+                self.silence_start = chunk_start
+            elif chunk_start + self.chunk_size - self.silence_start >= self.min_silence:
+                self.close_region(self.silence_start)
+
+    def close_region(self, end):
+        if self.speech_start is not None:
+            self.regions.append((self.speech_start, end))
+        self.speech_start = None
+        self.silence_start = None
+
+    def has_speech(self, start: int, end: int) -> bool:
+        """
+        Whether any padded speech region overlaps samples [start, end).
+
+        Regions that end, with their padding, before `start` are discarded, so `start` should not
+        move backwards between calls.
+        """
+        while self.regions and self.regions[0][1] + self.hangover <= start:
+            self.regions.popleft()
+        if self.speech_start is not None and self.speech_start - self.preroll < end:
+            return True
+        return any(s - self.preroll < end and e + self.hangover > start for s, e in self.regions)
+
+
+class VADRequest:
+    """Payload of a `BatchedVADService` request: consecutive chunks of one stream and its state."""
+
+    def __init__(self, chunks, state, context):
+        self.chunks = chunks
+        self.state = state
+        self.context = context
+
+
+class BatchedVADService(BatchScheduler):
+    """
+    Runs the Silero VAD of all streams together, one batched ONNX call per chunk position.
+
+    Each stream submits all of its new 512-sample chunks with its state. A batch of requests is
+    then run column by column: the i-th chunk of every stream that has one is stacked into a single
+    (batch, 512) input, the per-stream states and contexts are stacked along the batch dimension,
+    and the outputs are scattered back to the streams. With many streams this replaces thousands of
+    tiny single-row inferences per second with a few larger ones.
+    """
+
+    def __init__(self, model=None, max_batch_size=128, max_wait_s=0.005, frame_rate=16000):
+        """
+        Args:
+            model (VoiceActivityDetection, optional): The model, defaults to the one shared by
+                `StreamingVoiceActivityDetector`.
+            max_batch_size (int): Maximum number of streams in one inference.
+            max_wait_s (float): Maximum time a request waits for other streams' requests.
+            frame_rate (int): Sample rate of the audio.
+        """
+        self.model = model or StreamingVoiceActivityDetector.shared_model()
+        self.frame_rate = frame_rate
+        self.inferences_run = 0
+        super().__init__(max_batch_size=max_batch_size, max_wait_s=max_wait_s, name="vad-batch")
+
+    def process(self, chunks, state, context):
+        """
+        Classifies the consecutive `chunks` of one stream; blocks until its batch has run.
+
+        Returns:
+            tuple: Speech probabilities of shape (len(chunks),), the new state and the new context.
+        """
+        return self.run(VADRequest(chunks, state, context))
+
+    def process_batch(self, payloads):
+        # longest first, so the streams that still have a chunk at step t are always a prefix
+        order = sorted(range(len(payloads)), key=lambda i: -len(payloads[i].chunks))
+        requests = [payloads[i] for i in order]
+        lengths = [len(r.chunks) for r in requests]
+        states = np.concatenate([r.state for r in requests], axis=1)
+        contexts = np.concatenate([r.context for r in requests], axis=0)
+        probs = [np.empty(n, dtype=np.float32) for n in lengths]
+
+        active = len(requests)
+        for step in range(lengths[0] if lengths else 0):
+            while lengths[active - 1] <= step:
+                active -= 1
+            x = np.stack([requests[i].chunks[step] for i in range(active)])
+            out, states[:, :active], contexts[:active] = self.model.run_chunks(
+                x, states[:, :active], contexts[:active], self.frame_rate)
+            for i in range(active):
+                probs[i][step] = out[i]
+            self.inferences_run += 1
+
+        results = [None] * len(payloads)
+        for rank, i in enumerate(order):
+            results[i] = (probs[rank], states[:, rank:rank + 1].copy(), contexts[rank:rank + 1].copy())
+        return results
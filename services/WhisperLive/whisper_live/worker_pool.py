@@ -0,0 +1,234 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+
+class _ClientState:
+    """Scheduling state of one client in a `TranscriptionWorkerPool`."""
+
+    def __init__(self, client, now):
+        self.client = client
+        self.running = False        # a worker is running a pass, on_idle or the exit of this client
+        self.version = 0            # bumped whenever the client is taken, so older queue entries are skipped
+        self.ready_since = None     # when the client last became ready for a pass
+        self.last_active = now      # end of the last pass or on_idle call
+        self.exiting = False
+        self.finished = threading.Event()
+
+
+class TranscriptionWorkerPool:
+    """
+    Fixed set of inference threads shared by all clients, instead of one transcription thread per connection.
+
+    Clients are registered with `add` and report new audio with `notify`. A client that has at least
+    `min_audio_s` seconds of unprocessed audio is a work item on a priority queue. A free worker always
+    takes the client with the highest priority
+
+        waited_s + backlog_weight * backlog_s
+
+    where `waited_s` is the time since the client became ready and `backlog_s` is its buffered audio
+    not yet taken by a pass. Clients that waited longest or fell furthest behind go first. At most
+    one pass per client runs at a time. Audio that arrives during a pass queues the client again once
+    the pass ends.
+
+    When a client gets no pass for `idle_timeout_s`, a worker calls its `on_idle`. Once the client
+    exits, a worker writes its last checkpoint after any pass in progress and drops it.
+    """
+
+    def __init__(self, num_workers: int = 4, backlog_weight: float = 1.0, idle_timeout_s: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            num_workers (int): Number of inference threads, independent of the number of clients.
+            backlog_weight (float): Seconds of waiting one second of backlog is worth in the priority.
+            idle_timeout_s (float): Time without a pass after which a client's `on_idle` is called.
+            clock (callable): Time source in seconds, replaceable in tests.
+        """
+        self.num_workers = num_workers
+        self.backlog_weight = backlog_weight
+        self.idle_timeout_s = idle_timeout_s
+        self.clock = clock
+        self.cond = threading.Condition()
+        self.states = {}
+        self.queue = []     # (ready_since - backlog_weight * backlog_s, seq, version, state)
+        self.seq = itertools.count()
+        self.workers = []
+        self.stopped = False
+
+        self.passes = 0
+        self.idle_calls = 0
+        self.queue_wait_s = 0.0
+        self.max_queue_wait_s = 0.0
+
+    def start(self):
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._work, name=f"transcription-worker-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        logging.info(f"Started {self.num_workers} shared transcription workers")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops the workers after the passes in progress."""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        for worker in self.workers:
+            worker.join(timeout)
+        self.workers = []
+
+    def add(self, client):
+        """Registers a client. Its passes are scheduled from now on."""
+        with self.cond:
+            self.states[client] = _ClientState(client, self.clock())
+        self.notify(client)
+
+    def notify(self, client):
+        """Re-evaluates `client` after new audio arrived or it exited. Safe to call from any thread."""
+        with self.cond:
+            state = self.states.get(client)
+            if state is not None and not state.running:
+                self._schedule(state)
+
+    def wait(self, client, timeout: Optional[float] = None) -> bool:
+        """Waits until an exited `client` was checkpointed and dropped. Returns False on timeout."""
+        with self.cond:
+            state = self.states.get(client)
+        return state is None or state.finished.wait(timeout)
+
+    def priority(self, client) -> Optional[float]:
+        """The current priority of a queued client, None if it is not waiting for a pass."""
+        with self.cond:
+            state = self.states.get(client)
+            if state is None or state.running or state.ready_since is None:
+                return None
+            return self.clock() - state.ready_since + self.backlog_weight * self._backlog_s(client)
+
+    def next_item(self, block: bool = True):
+        """
+        Takes the next piece of work: the queued client with the highest priority, else a client
+        that has been idle for `idle_timeout_s`.
+
+        Returns:
+            tuple: `(kind, client)` with kind "exit", "pass" or "idle", or None once the pool is
+                stopped (or when nothing is due and `block` is False). The caller must hand the
+                client back with `done`.
+        """
+        with self.cond:
+            while not self.stopped:
+                item = self._pop_queued() or self._take_idle()
+                if item is not None or not block:
+                    return item
+                self.cond.wait(min(self.idle_timeout_s, 0.1))
+            return None
+
+    def done(self, client):
+        """Hands a client taken with `next_item` back to the pool."""
+        with self.cond:
+            state = self.states.get(client)
+            if state is None:
+                return
+            state.running = False
+            state.last_active = self.clock()
+            if state.exiting:
+                del self.states[client]
+                state.finished.set()
+                return
+            self._schedule(state)
+
+    def run_item(self, kind, client):
+        try:
+            if kind == "exit":
+                client.save_checkpoint(force=True)
+            elif kind == "idle":
+                client.on_idle()
+            elif client.poll_audio():
+                client.process_next_chunk()
+        except Exception as e:
+            logging.error(f"[ERROR]: Transcription {kind} failed for client {client.client_uid}: {e}")
+        finally:
+            self.done(client)
+
+    def stats(self) -> dict:
+        with self.cond:
+            queued = sum(1 for s in self.states.values() if s.ready_since is not None and not s.running)
+            running = sum(1 for s in self.states.values() if s.running)
+            return {
+                "workers": self.num_workers,
+                "clients": len(self.states),
+                "queued": queued,
+                "running": running,
+                "passes": self.passes,
+                "idle_calls": self.idle_calls,
+                "mean_queue_wait_s": round(self.queue_wait_s / self.passes, 4) if self.passes else 0.0,
+                "max_queue_wait_s": round(self.max_queue_wait_s, 4),
+            }
+
+    def _work(self):
+        while True:
+            item = self.next_item()
+            if item is None:
+                return
+            self.run_item(*item)
+
+    def _backlog_s(self, client):
+        return max(0, client.audio_buffer.end_index - client.processed_end_index) / client.RATE
+
+    def _schedule(self, state):
+        # called with self.cond held and the client not running
+        client = state.client
+        with client.lock:
+            exiting = client.exit
+            ready = not exiting and client._has_pending_audio(client.min_audio_s)
+        if exiting:
+            state.exiting = True
+            state.ready_since = self.clock()
+            key = float("-inf")     # writing the last checkpoint goes first
+        elif ready:
+            if state.ready_since is None:
+                state.ready_since = self.clock()
+            key = state.ready_since - self.backlog_weight * self._backlog_s(client)
+        else:
+            return
+        heapq.heappush(self.queue, (key, next(self.seq), state.version, state))
+        if len(self.queue) > 2 * len(self.states) + 64:
+            # every notify pushes a fresh entry, drop the outdated ones
+            self.queue = [entry for entry in self.queue if self._is_current(entry)]
+            heapq.heapify(self.queue)
+        self.cond.notify()
+
+    def _is_current(self, entry):
+        _, _, version, state = entry
+        return version == state.version and not state.running and self.states.get(state.client) is state
+
+    def _take(self, state):
+        state.running = True
+        state.version += 1
+
+    def _pop_queued(self):
+        while self.queue:
+            entry = heapq.heappop(self.queue)
+            if not self._is_current(entry):
+                continue
+            state = entry[3]
+            self._take(state)
+            waited = self.clock() - state.ready_since
+            state.ready_since = None
+            if state.exiting:
+                return "exit", state.client
+            self.passes += 1
+            self.queue_wait_s += waited
+            self.max_queue_wait_s = max(self.max_queue_wait_s, waited)
+            return "pass", state.client
+        return None
+
+    def _take_idle(self):
+        now = self.clock()
+        for state in self.states.values():
+            if not state.running and now - state.last_active >= self.idle_timeout_s:
+                self._take(state)
+                self.idle_calls += 1
+                return "idle", state.client
+        return None